@@ -1,9 +1,17 @@
 import streamlit as st
 from dotenv import load_dotenv
 from streamlit_option_menu import option_menu
+from src.common.logger import get_logger, set_request_id
 from src.generator.question_generator import ArtisanAssistant
-from src.common.logger import get_logger
-from src.generator.question_generator import ArtisanAssistant, fetch_google_trends_graph
+from src.generator.feed_pipeline import ANALYSIS, SmartFeedPipeline
+from src.generator.trends_store import get_trend_store
+from src.models.question_schemas import ListingInputSchema
+from src.utils.helpers import read_listing_rows, slugify
+from src.utils.photo import check_photo_size, submit_photo
+from src.jobs.queue import DONE, FAILED, get_job_queue, listing_params
+from src.utils.shopify_export import iter_csv, iter_jsonl
+from src.config.setting import settings
+from src.common.metrics import RenderProfiler, start_configured_exporters
 # import warnings
 
 # warnings.simplefilter(action='ignore', category=FutureWarning)
@@ -11,23 +19,38 @@ from src.generator.question_generator import ArtisanAssistant, fetch_google_tren
 
 
 # --- Setup ---
+render = RenderProfiler(enabled=settings.RENDER_PROFILE)
+render.phase("setup")
 load_dotenv()
 logger = get_logger("main")
+set_request_id()  # one ID per script run, attached to every log record of this rerun
 st.set_page_config(
     page_title="🪡 Artisan Marketplace Assistant",
     layout="wide"
 )
-assistant = ArtisanAssistant()
+
+
+@st.cache_resource
+def get_assistant() -> ArtisanAssistant:
+    # One assistant (and LLM connection pool) per process, not per rerun.
+    start_configured_exporters()
+    return ArtisanAssistant()
+
+
+render.phase("assistant")
+assistant = get_assistant()
+jobs = get_job_queue()
 
 
 # --- Sidebar Navigation ---
+render.phase("sidebar")
 with st.sidebar:
     st.image("image/logo.png", width=80)  # sample icon
     st.markdown("## Artisan Marketplace")
     menu_options = ["Home", "Profile Story Generator", "Craft Listing", "Smart Marketplace Feed"]
     menu_icons = ["house", "person", "shop", "graph-up"]
 
-    page_param = st.query_params.get("page", ["Home"])[0]
+    page_param = st.query_params.get("page", "Home")
     if page_param not in menu_options:
         page_param = "Home"
 
@@ -40,7 +63,7 @@ with st.sidebar:
     )
 
     # Update query param if menu selection changed
-    if st.query_params.get("page", [None])[0] != selection:
+    if st.query_params.get("page") != selection:
         st.query_params["page"] = selection
 
 
@@ -55,7 +78,42 @@ def parse_number(value):
         return None
 
 
+@st.fragment(run_every=settings.JOB_POLL_SECONDS)
+def wait_for_jobs(job_ids, label):
+    """Poll background jobs without blocking the page; rerun it once they have all finished."""
+    states = [jobs.get(job_id) for job_id in job_ids]
+    done = sum(1 for job in states if job is None or job.finished)
+    if done == len(job_ids):
+        st.rerun()
+    st.progress(done / len(job_ids), text=f"{label}… {done} / {len(job_ids)} done. "
+                                          "You can leave this page; results are kept.")
+
+
+def submit_listing(params: dict):
+    # Generation runs on the job workers; the page only keeps the job ID.
+    job_id = jobs.submit("listing", listing_params(**params), dedupe=not params["fresh"])
+    st.session_state["listing_job"] = job_id
+    st.query_params["job"] = job_id
+
+
+@st.fragment(run_every=settings.JOB_POLL_SECONDS)
+def wait_for_photo():
+    """Submit the pending listing once its photo is analysed on the photo pool, without blocking the page."""
+    future, params = st.session_state["listing_photo"]
+    if not future.done():
+        st.info("Analysing your photo…")
+        return
+    del st.session_state["listing_photo"]
+    try:
+        submit_listing(dict(params, photo=future.result()))
+    except Exception as e:
+        st.session_state["listing_error"] = str(e)
+        logger.error("Listing error: %s", e)
+    st.rerun()
+
+
 # --- Main Content ---
+render.phase(f"page:{selection}")
 if selection == "Home":
     st.title("Welcome to Artisan Marketplace Assistant")
     st.write("Empowering local artisans with AI tools to market their craft and reach new audiences. 🚀")
@@ -74,6 +132,7 @@ if selection == "Home":
             st.query_params["page"] = "Smart Marketplace Feed"
         st.info("Provides AI-driven market insights on trends and buyer interests so artisans can adapt their craft to demand and grow their reach.")
 
+    render.phase("page:Home/featured artisans")
     st.markdown("---")
     st.subheader("Featured Artisans")
 
@@ -121,108 +180,242 @@ elif selection == "Profile Story Generator":
         name = st.text_input("Artisan Name")
         location = st.text_input("Location")
         craft_type = st.text_input("Craft Type")
+        fresh = st.checkbox("Generate a fresh variant", help="Skip previously generated results.")
         submitted = st.form_submit_button("Generate Digital Story")
 
         if submitted:
             if name and location and craft_type:
                 try:
-                    story = assistant.generate_profile_story(name, location, craft_type)
                     st.success("Here’s your artisan story:")
-                    st.markdown(story)
+                    st.write_stream(assistant.stream_profile_story(name, location, craft_type, fresh=fresh))
                 except Exception as e:
                     st.error(str(e))
-                    logger.error(f"Artisan profile error: {e}")
+                    logger.error("Artisan profile error: %s", e)
             else:
                 st.warning("Please fill all fields to generate the story.")
 
 elif selection == "Craft Listing":
     st.header("🛍️ Craft Listing Generator")
-    with st.form("listing_form"):
-        uploaded_photo = st.file_uploader("Product photo", type=['jpg', 'jpeg', 'png'])
-        title = st.text_input("Product Title")
-        description = st.text_area("Description (optional)")
-        price = st.text_input("Your Price")
-        cost = st.text_input("Cost per Item")
-        generate_full = st.form_submit_button("Generate Complete Listing")
-
-        if generate_full:
-            if not title or not price or not cost:
-                st.warning("Please fill in Title, Price, and Cost.")
-            else:
-                try:
-                    photo_value = uploaded_photo.name if uploaded_photo else None
-                    result = assistant.generate_full_listing(
-                        title=title,
-                        description=description,
-                        photo=photo_value,
-                        price=price,
-                        cost=cost,
-                    )
-                    tab1, tab2, tab3 = st.tabs(["Overview", "Business Info", "Technical"])
-
-                    with tab1:
-                        st.subheader("SEO Title")
-                        st.write(result.get("seo_title", "-") or "-")
-                        st.subheader("Description")
-                        st.markdown(result.get("description", "-") or "-")
-                        st.subheader("Category")
-                        st.info(result.get("category", "-") or "-")
-
-                    with tab2:
-                        profit = result.get("profit", {})
-                        profit_margin = parse_number(profit.get("profit_margin", ""))
-                        profit_amount = parse_number(profit.get("profit_amount", ""))
-
-                        st.subheader("Profit & Margin")
-                        st.metric("Profit Margin (%)", f"{profit_margin:.2f}" if profit_margin is not None else "-")
-                        st.metric("Profit Amount", f"{profit_amount:.2f}" if profit_amount is not None else "-")
-
-                    with tab3:
-                        st.subheader("Metafields (Shopify)")
-                        st.code(result.get("metafields", "{}") or "{}", language="json")
-                        st.subheader("Product Type")
-                        st.info(result.get("product_type", "-") or "-")
-                        st.subheader("Tags")
-                        tags = result.get("tags", [])
-                        st.write(", ".join(tags) if tags else "-")
-
-                except Exception as e:
-                    st.error(str(e))
-                    logger.error(f"Listing error: {e}")
+    listing_mode = st.radio("Mode", ["Single product", "Bulk upload"], horizontal=True)
+
+    if listing_mode == "Single product":
+        with st.form("listing_form"):
+            uploaded_photo = st.file_uploader("Product photo", type=['jpg', 'jpeg', 'png'])
+            title = st.text_input("Product Title")
+            description = st.text_area("Description (optional)")
+            price = st.text_input("Your Price")
+            cost = st.text_input("Cost per Item")
+            fresh = st.checkbox("Generate a fresh variant", help="Skip previously generated results.")
+            fast_mode = st.checkbox(
+                "Fast mode", value=settings.LISTING_MODE == "fanout",
+                help="Generate title, description, category and metafields in parallel.",
+            )
+            generate_full = st.form_submit_button("Generate Complete Listing")
+
+            if generate_full:
+                if not title or not price or not cost:
+                    st.warning("Please fill in Title, Price, and Cost.")
+                else:
+                    try:
+                        params = dict(
+                            title=title,
+                            description=description,
+                            price=price,
+                            cost=cost,
+                            fresh=fresh,
+                            mode="fanout" if fast_mode else "single",
+                        )
+                        if uploaded_photo:
+                            check_photo_size(uploaded_photo.size)
+                            st.session_state.pop("listing_job", None)
+                            st.query_params.pop("job", None)
+                            # Decoding runs on the photo pool and only the thumbnail's hash and features are
+                            # kept; wait_for_photo submits the job once they are ready.
+                            st.session_state["listing_photo"] = (
+                                submit_photo(uploaded_photo.getvalue(), uploaded_photo.name), params
+                            )
+                        else:
+                            submit_listing(dict(params, photo=None))
+                    except Exception as e:
+                        st.error(str(e))
+                        logger.error("Listing error: %s", e)
+
+        render.phase("page:Craft Listing/result")
+        if "listing_photo" in st.session_state:
+            wait_for_photo()
+        if "listing_error" in st.session_state:
+            st.error(st.session_state.pop("listing_error"))
+        job_id = st.session_state.get("listing_job") or st.query_params.get("job")
+        job = jobs.get(job_id) if job_id else None
+        if job is not None and not job.finished:
+            wait_for_jobs([job_id], "Generating your listing")
+        elif job is not None and job.status == FAILED:
+            st.error(job.error)
+        elif job is not None:
+            result = job.result
+            tab1, tab2, tab3 = st.tabs(["Overview", "Business Info", "Technical"])
+
+            with tab1:
+                st.subheader("SEO Title")
+                st.write(result.get("seo_title", "-") or "-")
+                st.subheader("Description")
+                st.markdown(result.get("description", "-") or "-")
+                st.subheader("Category")
+                st.info(result.get("category", "-") or "-")
+
+            with tab2:
+                profit = result.get("profit", {})
+                profit_margin = parse_number(profit.get("profit_margin", ""))
+                profit_amount = parse_number(profit.get("profit_amount", ""))
+
+                st.subheader("Profit & Margin")
+                st.metric("Profit Margin (%)", f"{profit_margin:.2f}" if profit_margin is not None else "-")
+                st.metric("Profit Amount", f"{profit_amount:.2f}" if profit_amount is not None else "-")
+
+            with tab3:
+                st.subheader("Metafields (Shopify)")
+                st.code(result.get("metafields", "{}") or "{}", language="json")
+                st.subheader("Product Type")
+                st.info(result.get("product_type", "-") or "-")
+                st.subheader("Tags")
+                tags = result.get("tags", [])
+                st.write(", ".join(tags) if tags else "-")
+                st.download_button("Download Shopify CSV", data="".join(iter_csv([(job.params, result)])),
+                                   file_name=f"{slugify(result.get('seo_title') or '') or 'listing'}.csv", mime="text/csv")
+
+    else:
+        with st.form("bulk_listing_form"):
+            bulk_file = st.file_uploader(
+                "Products file (CSV or JSONL with title, description, photo, price, cost)",
+                type=["csv", "jsonl"],
+            )
+            fresh = st.checkbox("Generate a fresh variant", help="Skip previously generated results.")
+            generate_bulk = st.form_submit_button("Generate Listings")
+
+            if generate_bulk:
+                if not bulk_file:
+                    st.warning("Please upload a CSV or JSONL file.")
+                else:
+                    try:
+                        items = [ListingInputSchema(**row) for row in read_listing_rows(bulk_file.getvalue(), bulk_file.name)]
+                    except Exception as e:
+                        items = []
+                        st.error(f"Could not read the uploaded file: {e}")
+                        logger.error("Bulk listing upload error: %s", e)
+
+                    if items:
+                        # One job per row: rows are generated by the shared workers and deduplicated across uploads.
+                        st.session_state["bulk_jobs"] = [
+                            (item.title, jobs.submit("listing", dict(item.model_dump(), fresh=fresh), dedupe=not fresh))
+                            for item in items
+                        ]
+
+        render.phase("page:Craft Listing/bulk results")
+        bulk_jobs = st.session_state.get("bulk_jobs") or []
+        bulk_states = [(title, jobs.get(job_id)) for title, job_id in bulk_jobs]
+        if any(job is not None and not job.finished for _, job in bulk_states):
+            wait_for_jobs([job_id for _, job_id in bulk_jobs], "Generating listings")
+        elif bulk_states:
+            failures = [(row, title, job) for row, (title, job) in enumerate(bulk_states, start=1)
+                        if job is None or job.status == FAILED]
+            st.success(f"Generated {len(bulk_states) - len(failures)} of {len(bulk_states)} listings.")
+            st.dataframe([
+                {
+                    "row": row,
+                    "title": title,
+                    "seo_title": job.result.get("seo_title", "") if job and job.result else "",
+                    "category": job.result.get("category", "") if job and job.result else "",
+                    "tags": ", ".join(job.result.get("tags", [])) if job and job.result else "",
+                    "error": (job.error if job else "job expired") or "",
+                }
+                for row, (title, job) in enumerate(bulk_states, start=1)
+            ])
+            exported = [(job.params, job.result) for _, job in bulk_states if job is not None and job.status == DONE]
+            if exported:
+                csv_col, jsonl_col = st.columns(2)
+                # Files are generated on click, off the script thread.
+                csv_col.download_button("Download Shopify CSV", data=lambda: "".join(iter_csv(exported)),
+                                        file_name="shopify_products.csv", mime="text/csv")
+                jsonl_col.download_button("Download Shopify JSONL", data=lambda: "".join(iter_jsonl(exported)),
+                                          file_name="shopify_products.jsonl", mime="application/jsonl")
+            for row, title, job in failures:
+                error = job.error if job else "job expired"
+                st.warning(f"Row {row} ({title or 'untitled'}): {error}")
+                logger.error("Bulk listing error (row %d): %s", row, error)
 
 elif selection == "Smart Marketplace Feed":
     st.header("📈 Smart Marketplace Feed")
     with st.form("smart_feed_form"):
         prod_name_feed = st.text_input("Product Name for Trend Analysis")
+        fresh = st.checkbox("Generate a fresh variant", help="Skip previously generated results.")
         submitted = st.form_submit_button("Check Product Trends")
 
         if submitted:
             if prod_name_feed:
                 try:
-                    category, tags, trend_report = assistant.generate_smart_feed(prod_name_feed)
-
-                    category_clean = category.replace("Category:", "").strip()
-                    tags_clean = [t.replace("Tags:", "").strip() for t in tags if t.strip()]
-
-                    st.success(f"Category: {category_clean}")
-                    st.write(f"Tags: {', '.join(tags_clean) if tags_clean else '-'}")
-                    st.subheader("Trend Insights")
-                    st.markdown(trend_report or "No trend insights available.")
-
-                    # Fetch and show Google Trends graph
-                    img_base64 = fetch_google_trends_graph(prod_name_feed)
-                    if img_base64:
-                        st.image(f"data:image/png;base64,{img_base64}", caption="Google Trends Data (Last 3 Months)")
-                    else:
-                        st.info("No Google Trends data available for this product.")
+                    # Analysis and Google Trends run concurrently; each part renders as soon as it lands.
+                    analysis_box = st.empty()
+                    trends_box = st.empty()
+                    trends_box.info("Fetching Google Trends data...")
+                    feed_text = ""
+                    for event in SmartFeedPipeline(assistant).events(prod_name_feed, fresh=fresh):
+                        if event.part == ANALYSIS:
+                            if event.kind == "chunk":
+                                feed_text += event.value
+                                analysis_box.markdown(feed_text)
+                            elif event.kind == "done":
+                                category, tags, trend_report = event.value
+                                category_clean = category.replace("Category:", "").strip()
+                                tags_clean = [t.replace("Tags:", "").strip() for t in tags if t.strip()]
+                                with analysis_box.container():
+                                    st.success(f"Category: {category_clean}")
+                                    st.write(f"Tags: {', '.join(tags_clean) if tags_clean else '-'}")
+                                    st.subheader("Trend Insights")
+                                    st.markdown(trend_report or "No trend insights available.")
+                            elif event.kind == "timeout":
+                                analysis_box.warning("Trend analysis is taking too long; please try again shortly.")
+                            else:
+                                analysis_box.error(f"Error generating smart feed: {event.error}")
+                                logger.error("Smart feed error: %s", event.error)
+                        elif event.kind == "done" and event.value is not None:
+                            with trends_box.container():
+                                st.line_chart(event.value)
+                                st.caption("Google Trends Data (Last 3 Months)")
+                        elif event.kind == "done":
+                            trends_box.info("No Google Trends data available for this product.")
+                        else:
+                            trends_box.info("Google Trends data is unavailable right now.")
+                            if event.error is not None:
+                                logger.error("Google Trends error: %s", event.error)
 
                 except Exception as e:
                     st.error(f"Error generating smart feed or trends graph: {e}")
-                    logger.error(f"Smart feed error: {e}")
+                    logger.error("Smart feed error: %s", e)
             else:
                 st.warning("Please enter a product name for trend analysis.")
 
-
+    render.phase("page:Smart Marketplace Feed/catalog trends")
+    # Rising vs declining across every product checked so far, computed from the local trend store.
+    trend_store = get_trend_store()
+    catalog = trend_store.keywords() if trend_store is not None else []
+    if catalog:
+        with st.expander(f"Catalog trends ({len(catalog)} products)"):
+            if st.button("Refresh catalog trends", help="Download the days missing for every product."):
+                jobs.submit("trends_refresh", {"keywords": catalog}, dedupe=False)
+                st.info("Refreshing in the background; reopen this page in a moment.")
+            catalog_metrics = trend_store.analyze(catalog)
+            rising_col, declining_col = st.columns(2)
+            with rising_col:
+                st.subheader("Rising")
+                st.dataframe(catalog_metrics[catalog_metrics.direction == "rising"]
+                             .sort_values("momentum", ascending=False)[["momentum", "slope", "peaks"]])
+            with declining_col:
+                st.subheader("Declining")
+                st.dataframe(catalog_metrics[catalog_metrics.direction == "declining"]
+                             .sort_values("momentum")[["momentum", "slope", "peaks"]])
+
+
+render.phase("footer")
 st.markdown("---")
 st.subheader("How It Works")
 
@@ -232,3 +425,10 @@ st.markdown("""
 3. Let AI generate content: profiles, listings, or trend reports instantly.
 4. Copy, use, and share your AI-generated content to expand your craft’s reach on social media.
 """)
+
+render_phases = render.finish()
+if render_phases:
+    # RENDER_PROFILE=1: where this rerun spent its time.
+    with st.sidebar.expander("Render profile"):
+        st.dataframe([{"phase": name, "ms": round(seconds * 1000, 1)} for name, seconds in render_phases],
+                     hide_index=True)
@@ -0,0 +1,262 @@
+"""Simulated multi-session load test of the Streamlit app.
+
+Keeps `--sessions` `AppTest` sessions of `application.py` alive in one
+process, as they would share one server pod, against the mock LLM endpoint
+(`GROQ_API_URL` is pointed at it) and the stubbed Google Trends source. Each
+session opens one of `--pages`, reruns it `--reruns` times and, with
+`--submit`, fills in and submits the page's form. Caches, the job store and
+the trend store live in a temporary directory.
+
+Home is included: it references sample images that are not all checked in,
+and a run stops at the first missing one. Those runs are reported as
+"missing image" (naming the file) instead of as errors, and the Home timings
+then cover only the part of the page rendered before it.
+
+`AppTest` swaps Streamlit's process-wide runtime for every run, so script
+runs cannot overlap: the sessions take turns, round by round, while the work
+they hand off (job workers, LLM calls, the shared caches) keeps running in the
+background. The latencies are therefore those of one script run with
+`--sessions` sessions resident, not of N scripts competing for the GIL.
+
+Reports rerun latency percentiles per page, the render profile of the app
+(`RENDER_PROFILE` is switched on, so every section of every rerun is timed),
+process RSS growth and the Python memory retained per live session (traced
+separately, since tracemalloc slows the concurrent run down). Divide the pod's
+memory budget by the per-session figure, and check the latency percentiles at
+that session count, to set a session capacity per pod.
+
+Usage:
+    python -m benchmarks.load_test --sessions 50 --reruns 5
+    python -m benchmarks.load_test --sessions 20 --pages "Profile Story Generator" --submit --latency-ms 400
+    python -m benchmarks.load_test --sessions 100 --max-p95-ms 500   # exit 1 above the budget
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.mock_llm_server import MockLLMServer, add_config_arguments, config_from_args
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "application.py")
+
+PAGES = ["Home", "Profile Story Generator", "Craft Listing", "Smart Marketplace Feed"]
+# Form inputs per page, in widget order, used by --submit.
+FORM_INPUTS = {
+    "Profile Story Generator": ("Artisan {i}", "Jaipur", "block printing"),
+    "Smart Marketplace Feed": ("handwoven basket {i}",),
+}
+MISSING_IMAGE = "MediaFileStorageError"
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak, on platforms without /proc
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def configure_environment(url: str, workdir: str, trends_latency_ms: float):
+    """Point the app at the mock endpoint and a scratch directory; must run before `src` is imported."""
+    os.environ.update({
+        "GROQ_API_URL": url,
+        "GROQ_API_KEY": "benchmark",
+        "RENDER_PROFILE": "1",
+        "JOB_DB_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "PHOTO_DB_PATH": os.path.join(workdir, "photos.sqlite3"),
+        "TAXONOMY_DB_PATH": os.path.join(workdir, "taxonomy.sqlite3"),
+        "TRENDS_STORE_DIR": os.path.join(workdir, "trends"),
+        "METRICS_PORT": "0",
+        "METRICS_JSON_PATH": "",
+    })
+    from benchmarks.stub_trends import StubTrendReq
+    from src.generator import trends_service
+
+    # The app resolves the service through `get_trends_service()`; seed it with the offline stub.
+    trends_service.get_trends_service.set(trends_service.TrendsService(
+        session_factory=lambda: StubTrendReq(trends_latency_ms)
+    ))
+
+
+class Session:
+    """One simulated browser session: an `AppTest` pinned to a page."""
+
+    def __init__(self, index: int, page: str, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.page = page
+        self.app = AppTest.from_file(APP, default_timeout=timeout)
+        self.app.query_params["page"] = page
+        self.timings = []  # (action, seconds)
+        self.errors = []
+        self.missing_images = set()
+
+    def _timed(self, action: str, run):
+        start = time.perf_counter()
+        try:
+            run()
+        except Exception as e:
+            self.errors.append(f"{action}: {e}")
+        else:
+            for exc in self.app.exception:
+                if exc.proto.type.endswith(MISSING_IMAGE):
+                    self.missing_images.add(exc.message)
+                else:
+                    self.errors.append(f"{action}: {exc.message}")
+        self.timings.append((action, time.perf_counter() - start))
+
+    def submit(self):
+        for widget, value in zip(self.app.text_input, FORM_INPUTS[self.page]):
+            widget.input(value.format(i=self.index))
+        self.app.button[0].click()
+        self.app.run()
+
+    def step(self, round_: int, reruns: int, submit: bool):
+        if round_ == 0:
+            self._timed("first run", self.app.run)
+        elif round_ <= reruns:
+            self._timed("rerun", self.app.run)
+        elif submit and self.page in FORM_INPUTS:
+            self._timed("submit", self.submit)
+
+
+def run_sessions(count: int, args) -> list:
+    """Open `count` sessions and drive them round-robin: first runs, then reruns, then form submits."""
+    sessions = [Session(i, args.pages[i % len(args.pages)], args.timeout) for i in range(count)]
+    for round_ in range(args.reruns + 2):
+        for session in sessions:
+            session.step(round_, args.reruns, args.submit)
+    return sessions
+
+
+def warm_up(timeout: float):
+    """One run per page so module imports and `cache_resource` builds are not counted."""
+    for page in PAGES:
+        Session(-1, page, timeout).step(0, 0, False)
+
+
+def retained_per_session(args) -> float:
+    """Python memory (KB) still held by each live session after its runs."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    sessions = run_sessions(args.memory_sessions, args)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return retained / 1024 / max(1, len(sessions))
+
+
+def render_phases() -> list:
+    from src.common.metrics import registry
+
+    return [
+        (h["labels"]["phase"], h["count"], h["sum"] / h["count"], h["p95"])
+        for h in registry.snapshot()["histograms"]
+        if h["name"] == "talentbridge_render_phase_seconds" and h["count"]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--reruns", type=int, default=3, help="plain reruns per session after the first run")
+    parser.add_argument("--pages", nargs="+", default=PAGES, choices=PAGES,
+                        help="pages assigned to sessions round-robin")
+    parser.add_argument("--submit", action="store_true", help="also submit the form of the Profile and Feed pages")
+    parser.add_argument("--memory-sessions", type=int, default=10,
+                        help="sessions traced for retained memory (0 to skip)")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per script run")
+    parser.add_argument("--trends-latency-ms", type=float, default=300)
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="exit 1 when the rerun p95 exceeds this")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError:
+        print("streamlit is not installed")
+        return 1
+
+    os.chdir(ROOT)  # the app loads images relative to the repo root
+    server = MockLLMServer(config_from_args(args))
+    url = server.start()
+    workdir = tempfile.TemporaryDirectory(prefix="load-test-")
+    try:
+        configure_environment(url, workdir.name, args.trends_latency_ms)
+        from src.common.metrics import registry
+
+        warm_up(args.timeout)
+        registry.reset()
+        gc.collect()
+        rss_before = rss_mb()
+        started = time.perf_counter()
+        sessions = run_sessions(args.sessions, args)
+        wall = time.perf_counter() - started
+        rss_after = rss_mb()
+        phases = render_phases()
+        per_session_kb = retained_per_session(args) if args.memory_sessions else None
+    finally:
+        server.stop()
+        workdir.cleanup()
+
+    header = f"{'page':<26}{'action':<11}{'runs':>6}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'errors':>8}"
+    print(f"{args.sessions} sessions, {args.reruns} reruns each, {wall:.1f} s wall\n")
+    print(header)
+    print("-" * len(header))
+    all_reruns, errors, missing_images = [], [], {}
+    for page in args.pages:
+        page_sessions = [s for s in sessions if s.page == page]
+        for action in ("first run", "rerun", "submit"):
+            timings = [seconds * 1000 for s in page_sessions for name, seconds in s.timings if name == action]
+            if not timings:
+                continue
+            failed = sum(1 for s in page_sessions for error in s.errors if error.startswith(action))
+            print(f"{page[:25]:<26}{action:<11}{len(timings):>6}{statistics.median(timings):>9.0f}"
+                  f"{percentile(timings, 0.95):>9.0f}{max(timings):>9.0f}{failed:>8}")
+            if action == "rerun":
+                all_reruns.extend(timings)
+        errors.extend(error for s in page_sessions for error in s.errors)
+        for s in page_sessions:
+            missing_images.update(dict.fromkeys(s.missing_images, page))
+
+    if phases:
+        print(f"\n{'render phase':<48}{'count':>7}{'mean ms':>9}{'p95 <= ms':>11}")
+        for name, count, mean, p95 in sorted(phases, key=lambda row: -row[2]):
+            print(f"{name[:47]:<48}{count:>7}{mean * 1000:>9.1f}{(p95 or 0) * 1000:>11.0f}")
+
+    print(f"\nRSS: {rss_before:.0f} MB -> {rss_after:.0f} MB "
+          f"({(rss_after - rss_before) / args.sessions:.2f} MB per session)")
+    if per_session_kb is not None:
+        print(f"retained Python memory: {per_session_kb:.0f} KB per live session "
+              f"(traced over {args.memory_sessions} sessions)")
+    for message, page in sorted(missing_images.items()):
+        print(f"missing image on {page} ({message}); its timings cover the page up to that image only")
+    for error in dict.fromkeys(errors):
+        print(f"error: {error}")
+
+    rerun_p95 = percentile(all_reruns, 0.95)
+    if args.max_p95_ms is not None and rerun_p95 > args.max_p95_ms:
+        print(f"rerun p95 {rerun_p95:.0f} ms > {args.max_p95_ms:.0f} ms")
+        return 1
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Local stand-in for the Groq OpenAI-compatible chat-completions endpoint.
+
+Latency, token rate, error rate, malformed-JSON rate and the share of entries
+dropped from packed completions are configurable so benchmarks can reproduce
+slow, flaky or sloppy upstreams without spending API quota. Supports both
+plain and `stream: true` (SSE) requests.
+
+Usage:
+    python -m benchmarks.mock_llm_server --port 8900 --latency-ms 300 --tokens-per-second 400 --error-rate 0.02
+    GROQ_API_URL=http://127.0.0.1:8900/openai/v1/chat/completions streamlit run application.py
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STORY = (
+    "Rooted in generations of craft, this artisan shapes every piece by hand, carrying the "
+    "stories of their village into homes around the world. Each creation blends tradition "
+    "with a fresh eye, inviting you to own a little piece of living culture."
+)
+
+LISTING = {
+    "seo_title": "Handmade Terracotta Vase – Artisan Crafted Home Decor",
+    "description": "A hand-thrown terracotta vase shaped and fired by a village potter. " * 6,
+    "category": "Home Decor",
+    "profit": {"profit_margin": "40", "profit_amount": "400"},
+    "market_price": "900-1400",
+    "metafields": {"material": "terracotta", "care_instructions": "wipe clean", "origin": "India"},
+    "product_type": "Vase",
+    "tags": ["handmade", "terracotta", "vase", "home decor", "artisan"],
+}
+
+FEED = (
+    "Home Decor\n"
+    "handmade, artisan, terracotta, eco-friendly, rustic, gift\n"
+    "Handmade decor is trending on Instagram and Etsy, especially in urban India and the US."
+)
+
+
+PACKED_ITEM = re.compile(r"^(\d+)\. Name: ([^|]+)\|", re.MULTILINE)
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 200.0        # median time before the first token
+    latency_sigma: float = 0.5       # log-normal spread of that latency
+    tokens_per_second: float = 500.0  # generation speed after the first token
+    error_rate: float = 0.0          # share of requests answered with HTTP 503
+    malformed_rate: float = 0.0      # share of listing completions with broken JSON
+    retry_after: float = 0.0         # Retry-After sent with errors (0 omits the header)
+    pack_drop_rate: float = 0.0      # share of artisans left out of packed profile completions
+
+
+def completion_for(prompt: str, config: MockConfig) -> str:
+    if "JSON array" in prompt:
+        artisans = PACKED_ITEM.findall(prompt)
+        return json.dumps([
+            {"id": int(index), "name": name.strip(), "story": STORY}
+            for index, name in artisans if random.random() >= config.pack_drop_rate
+        ], ensure_ascii=False)
+    if "Output the title only" in prompt:
+        return LISTING["seo_title"]
+    if "Output the description only" in prompt:
+        return LISTING["description"]
+    if "JSON" in prompt:
+        text = json.dumps(LISTING, ensure_ascii=False)
+        if random.random() < config.malformed_rate:
+            # Mimic the usual failure modes: prose around the JSON or truncation.
+            text = random.choice([f"Here is your listing:\n```json\n{text}\n```", text[: len(text) * 2 // 3]])
+        return text
+    if "Trend Insights only" in prompt:
+        return FEED.split("\n")[-1]
+    if "Trend Insights" in prompt:
+        return FEED
+    return STORY
+
+
+def make_handler(config: MockConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            time.sleep(random.lognormvariate(0, config.latency_sigma) * config.latency_ms / 1000)
+
+            if random.random() < config.error_rate:
+                self.send_response(503)
+                if config.retry_after:
+                    self.send_header("Retry-After", str(config.retry_after))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            prompt = body.get("messages", [{}])[-1].get("content", "")
+            text = completion_for(prompt, config)
+            words = text.split(" ")
+            delay_per_word = 1.0 / config.tokens_per_second if config.tokens_per_second else 0.0
+            usage = {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(words),
+                "total_tokens": len(prompt) // 4 + len(words),
+            }
+
+            if body.get("stream"):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i, word in enumerate(words):
+                    time.sleep(delay_per_word)
+                    delta = word if i == len(words) - 1 else word + " "
+                    self._chunk("data: " + json.dumps({"choices": [{"delta": {"content": delta}}]}) + "\n\n")
+                self._chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+                return
+
+            time.sleep(delay_per_word * len(words))
+            payload = json.dumps({
+                "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}}],
+                "usage": usage,
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _chunk(self, data: str):
+            raw = data.encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(raw), raw))
+            self.wfile.flush()
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class MockLLMServer:
+    """Run the mock server in a background thread: `with MockLLMServer(config) as url: ...`."""
+
+    def __init__(self, config: MockConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig()
+        self.server = ThreadingHTTPServer((host, port), make_handler(self.config))
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/openai/v1/chat/completions"
+
+    def start(self) -> str:
+        threading.Thread(target=self.server.serve_forever, name="mock-llm", daemon=True).start()
+        return self.url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> str:
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    defaults = MockConfig()
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma)
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--malformed-rate", type=float, default=defaults.malformed_rate)
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after)
+    parser.add_argument("--pack-drop-rate", type=float, default=defaults.pack_drop_rate)
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        retry_after=args.retry_after,
+        pack_drop_rate=args.pack_drop_rate,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockLLMServer(config_from_args(args), args.host, args.port)
+    print(f"mock chat-completions endpoint: {server.url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Packed vs per-item profile story generation for bulk onboarding.
+
+Generates stories for N artisans twice against the mock endpoint (or --url):
+once with one `generate_profile_story` call per artisan, once with
+`generate_profile_stories`, which packs `--pack-size` artisans into each
+request and falls back to single calls for entries the completion dropped.
+Reports wall time, throughput, LLM requests and prompt/completion tokens.
+
+Usage:
+    python -m benchmarks.packing --artisans 48 --pack-size 8 --concurrency 4
+    python -m benchmarks.packing --pack-drop-rate 0.1   # exercise the per-item fallback
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.mock_llm_server import MockLLMServer, add_config_arguments, config_from_args
+from src.common.metrics import registry
+from src.generator.question_generator import ArtisanAssistant
+from src.generator.taxonomy_index import TaxonomyIndex
+from src.llm.groq_client import GroqClient
+from src.models.question_schemas import ProfileSchema
+from src.utils.photo import PhotoStore
+
+CRAFTS = ["block printing", "blue pottery", "bamboo weaving", "brass casting", "kantha embroidery"]
+
+
+class CountingLLM:
+    """Counts the requests an assistant sends through the wrapped client."""
+
+    def __init__(self, client: GroqClient):
+        self.client = client
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def generate_text(self, *args, **kwargs) -> str:
+        with self._lock:
+            self.requests += 1
+        return self.client.generate_text(*args, **kwargs)
+
+
+def token_totals() -> dict:
+    totals = {"prompt": 0.0, "completion": 0.0}
+    for counter in registry.snapshot()["counters"]:
+        if counter["name"] == "talentbridge_llm_tokens_total":
+            totals[counter["labels"]["type"]] += counter["value"]
+    return totals
+
+
+def run_mode(mode: str, assistant: ArtisanAssistant, llm: CountingLLM, artisans: list, args) -> dict:
+    registry.reset()
+    llm.requests = 0
+    started = time.perf_counter()
+    if mode == "single":
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            stories = list(executor.map(lambda a: assistant.generate_profile_story(**a.model_dump()), artisans))
+    else:
+        stories = assistant.generate_profile_stories(artisans, pack_size=args.pack_size)
+    wall = time.perf_counter() - started
+    fallbacks = registry.get_counter("talentbridge_profile_pack_items_total", result="fallback")
+    tokens = token_totals()
+    return {
+        "stories": sum(1 for story in stories if story),
+        "wall_seconds": wall,
+        "artisans_per_second": len(artisans) / wall if wall else 0.0,
+        "requests": llm.requests,
+        "fallbacks": int(fallbacks),
+        "prompt_tokens": int(tokens["prompt"]),
+        "completion_tokens": int(tokens["completion"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artisans", type=int, default=48)
+    parser.add_argument("--pack-size", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="parallel requests for both modes (packed mode uses BATCH_CONCURRENCY)")
+    parser.add_argument("--url", help="benchmark an already running endpoint instead of the built-in mock")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    from src.config.setting import settings
+    settings.BATCH_CONCURRENCY = args.concurrency
+
+    server = None
+    url = args.url
+    if not url:
+        server = MockLLMServer(config_from_args(args))
+        url = server.start()
+
+    client = GroqClient(api_key="benchmark", api_url=url, pool_size=args.concurrency)
+    llm = CountingLLM(client)
+    # In-memory indexes keep the run from touching the app's cache files.
+    assistant = ArtisanAssistant(llm=llm, taxonomy=TaxonomyIndex(), photos=PhotoStore())
+    artisans = [
+        ProfileSchema(name=f"Artisan {i}", location="Jaipur", craft_type=CRAFTS[i % len(CRAFTS)])
+        for i in range(args.artisans)
+    ]
+
+    results = {}
+    try:
+        for mode in ("single", "packed"):
+            results[mode] = run_mode(mode, assistant, llm, artisans, args)
+    finally:
+        client.close()
+        if server:
+            server.stop()
+
+    header = f"{'mode':<8}{'stories':>9}{'wall s':>9}{'art/s':>8}{'requests':>10}{'fallback':>10}{'prompt tok':>12}{'compl tok':>11}"
+    print(header)
+    print("-" * len(header))
+    for mode, r in results.items():
+        print(f"{mode:<8}{r['stories']:>9}{r['wall_seconds']:>9.2f}{r['artisans_per_second']:>8.1f}{r['requests']:>10}"
+              f"{r['fallbacks']:>10}{r['prompt_tokens']:>12}{r['completion_tokens']:>11}")
+    single, packed = results["single"], results["packed"]
+    if packed["wall_seconds"] and packed["requests"]:
+        print(f"\npacked: {single['wall_seconds'] / packed['wall_seconds']:.1f}x faster, "
+              f"{single['requests'] / packed['requests']:.1f}x fewer requests")
+    return 0 if all(r["stories"] == args.artisans for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
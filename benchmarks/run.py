@@ -0,0 +1,161 @@
+"""Offline benchmark harness for ArtisanAssistant and the trends path.
+
+Starts the mock chat-completions server (unless --url is given), points a
+fresh GroqClient at it, and drives each scenario at the requested
+concurrency, reporting p50/p95/p99 latency, throughput and errors. Save a run
+with --json and pass it back with --compare to see before/after deltas.
+
+Usage:
+    python -m benchmarks.run --scenarios profile listing feed trends --concurrency 8 --requests 200
+    python -m benchmarks.run --json before.json
+    python -m benchmarks.run --compare before.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.mock_llm_server import MockLLMServer, add_config_arguments, config_from_args
+from src.generator.question_generator import ArtisanAssistant
+from src.generator.taxonomy_index import TaxonomyIndex
+from src.generator.trends_service import TrendsService
+from src.llm.groq_client import GroqClient
+from src.utils.photo import PhotoStore
+
+SCENARIOS = ("profile", "listing", "feed", "trends")
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def build_operation(scenario: str, assistant: ArtisanAssistant, trends: TrendsService, distinct: int):
+    counter = iter(range(10 ** 9))
+    lock = threading.Lock()
+
+    def next_id() -> int:
+        with lock:
+            return next(counter) % distinct
+
+    if scenario == "profile":
+        return lambda: assistant.generate_profile_story(f"Artisan {next_id()}", "Jaipur", "block printing")
+    if scenario == "listing":
+        return lambda: assistant.generate_full_listing(
+            title=f"Terracotta vase {next_id()}", description="", price="1000", cost="600"
+        )
+    if scenario == "feed":
+        return lambda: assistant.generate_smart_feed(f"handmade product {next_id()}")
+    if scenario == "trends":
+        return lambda: trends.get_interest(f"handmade product {next_id()}")
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def run_scenario(operation, concurrency: int, requests: int) -> dict:
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def timed():
+        start = time.perf_counter()
+        try:
+            operation()
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(requests):
+            executor.submit(timed)
+    wall = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "wall_seconds": wall,
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else float("nan"),
+    }
+
+
+def print_report(results: dict, baseline: dict = None):
+    header = f"{'scenario':<10}{'ok/total':>12}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        ok = f"{r['requests'] - r['errors']}/{r['requests']}"
+        print(f"{name:<10}{ok:>12}{r['throughput_rps']:>9.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+        if baseline and name in baseline:
+            b = baseline[name]
+            deltas = [
+                f"{key} {(r[key] - b[key]) / b[key] * 100:+.1f}%"
+                for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms") if b.get(key)
+            ]
+            print(f"{'':<10}vs baseline: {', '.join(deltas)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--distinct", type=int, default=1000,
+                        help="number of distinct inputs cycled through (lower it to exercise caches)")
+    parser.add_argument("--url", help="benchmark an already running endpoint instead of the built-in mock")
+    parser.add_argument("--trends-latency-ms", type=float, default=300.0)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON from a previous --json run")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server = MockLLMServer(config_from_args(args))
+        url = server.start()
+
+    client = GroqClient(api_key="benchmark", api_url=url, pool_size=args.concurrency)
+    # In-memory stores: a run must neither read nor write the app's cache/ directory.
+    assistant = ArtisanAssistant(llm=client, taxonomy=TaxonomyIndex(), photos=PhotoStore())
+    trends = None
+    if "trends" in args.scenarios:
+        from benchmarks.stub_trends import StubTrendReq
+
+        trends = TrendsService(session_factory=lambda: StubTrendReq(args.trends_latency_ms))
+
+    results = {}
+    try:
+        for scenario in args.scenarios:
+            operation = build_operation(scenario, assistant, trends, args.distinct)
+            results[scenario] = run_scenario(operation, args.concurrency, args.requests)
+    finally:
+        client.close()
+        if server:
+            server.stop()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_report(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    return 0 if all(r["errors"] < r["requests"] for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Cold-start and rerun benchmark for the Streamlit app.
+
+Measures, in fresh interpreters, how long it takes to import the modules the
+app needs on every rerun, lists the heaviest imports, and (when Streamlit is
+installed) times full reruns of `application.py` through `AppTest`. Runs
+that raise are reported: a missing sample image (`MediaFileStorageError`,
+Home references images that are not all checked in) as a warning, since
+the run still stopped early and its timing covers part of the page only;
+any other exception fails the benchmark.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--reruns 5] [--max-import-ms 1500] [--max-rerun-ms 800]
+
+Exits with status 1 when a threshold is exceeded, so it can gate CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APP_IMPORTS = (
+    "import streamlit, streamlit_option_menu, dotenv; "
+    "import src.generator.question_generator, src.models.question_schemas, src.utils.helpers"
+)
+
+# Modules that must not be loaded just to render the app.
+HEAVY_MODULES = ("pytrends", "matplotlib", "pandas", "numpy", "httpx")
+
+
+def time_imports(runs: int) -> list:
+    code = f"import time; t = time.perf_counter(); {APP_IMPORTS}; print(time.perf_counter() - t)"
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        timings.append(float(out.stdout.strip()) * 1000)
+    return timings
+
+
+def heaviest_imports(limit: int = 15) -> list:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", APP_IMPORTS], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def loaded_heavy_modules() -> list:
+    code = f"import sys; {APP_IMPORTS}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def time_reruns(reruns: int) -> Tuple[list, dict]:
+    """Rerun timings in ms, plus `{exception type: message}` for what the runs raised."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, "application.py"), default_timeout=60)
+    timings, raised = [], {}
+    for _ in range(reruns + 1):
+        start = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - start) * 1000)
+        raised.update((exc.proto.type.rsplit(".", 1)[-1], exc.message) for exc in app.exception)
+    # The first run includes module imports and cache_resource construction.
+    return timings, raised
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-rerun-ms", type=float, default=None)
+    args = parser.parse_args()
+    failed = False
+
+    imports = time_imports(args.runs)
+    import_median = statistics.median(imports)
+    print(f"cold import: median {import_median:.0f} ms, min {min(imports):.0f} ms over {args.runs} runs")
+    print("heaviest imports (cumulative ms):")
+    for cumulative_us, name in heaviest_imports():
+        print(f"  {cumulative_us / 1000:8.1f}  {name}")
+
+    heavy = loaded_heavy_modules()
+    if heavy:
+        print(f"heavy modules loaded eagerly: {', '.join(heavy)}")
+        failed = True
+    if args.max_import_ms is not None and import_median > args.max_import_ms:
+        print(f"cold import regression: {import_median:.0f} ms > {args.max_import_ms:.0f} ms")
+        failed = True
+
+    try:
+        reruns, raised = time_reruns(args.reruns)
+    except ImportError:
+        print("streamlit not installed; skipping rerun timing")
+    else:
+        for exc_type, message in raised.items():
+            if exc_type == "MediaFileStorageError":
+                print(f"warning: missing image ({message}); the timed runs stop there")
+            else:
+                print(f"run raised {exc_type}: {message}")
+                failed = True
+        first, rest = reruns[0], reruns[1:]
+        rerun_median = statistics.median(rest) if rest else first
+        print(f"first run: {first:.0f} ms, rerun median: {rerun_median:.0f} ms over {len(rest)} reruns")
+        if args.max_rerun_ms is not None and rerun_median > args.max_rerun_ms:
+            print(f"rerun regression: {rerun_median:.0f} ms > {args.max_rerun_ms:.0f} ms")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Offline stand-in for `pytrends.request.TrendReq`.
+
+Returns deterministic synthetic `interest_over_time` frames (trend + weekly
+seasonality + noise seeded by the keyword) after a configurable delay, so the
+trends path can be benchmarked without touching Google.
+"""
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+TIMEFRAME_DAYS = {"today 1-m": 30, "today 3-m": 90, "today 12-m": 365, "today 5-y": 1825}
+
+
+class StubTrendReq:
+    def __init__(self, latency_ms: float = 300.0):
+        self.latency_ms = latency_ms
+        self._keywords = []
+        self._timeframe = "today 3-m"
+
+    def build_payload(self, kw_list, timeframe="today 3-m", **kwargs):
+        self._keywords = list(kw_list)
+        self._timeframe = timeframe
+
+    def _date_range(self) -> pd.DatetimeIndex:
+        if self._timeframe in TIMEFRAME_DAYS:
+            end = pd.Timestamp.today().normalize()
+            return pd.date_range(end=end, periods=TIMEFRAME_DAYS[self._timeframe], freq="D")
+        start, end = self._timeframe.split()
+        return pd.date_range(start=start, end=end, freq="D")
+
+    def interest_over_time(self) -> pd.DataFrame:
+        time.sleep(self.latency_ms / 1000)
+        index = self._date_range()
+        days = (index - pd.Timestamp("2020-01-01")).days.to_numpy()
+        data = {}
+        for keyword in self._keywords:
+            seed = int(hashlib.md5(keyword.encode("utf-8")).hexdigest()[:8], 16)
+            rng = np.random.default_rng(seed + int(days[0]))
+            level = 20 + seed % 60
+            slope = ((seed >> 8) % 21 - 10) / 100
+            values = level + slope * (days - days[0]) + 8 * np.sin(2 * np.pi * days / 7) + rng.normal(0, 3, len(days))
+            data[keyword] = np.clip(values, 0, None)
+        frame = pd.DataFrame(data, index=index)
+        if not frame.empty:
+            # Google scales each payload so its highest point is 100.
+            frame = (frame / frame.to_numpy().max() * 100).round().astype(int)
+        frame.index.name = "date"
+        frame["isPartial"] = False
+        return frame
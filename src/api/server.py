@@ -0,0 +1,183 @@
+"""Headless HTTP API over ArtisanAssistant for storefront integrations.
+
+Runs on asyncio (FastAPI + uvicorn) so one process can serve many concurrent
+callers over the shared LLM connection pool. A concurrency gate bounds the
+number of in-flight generations and rejects callers with 503 + Retry-After
+once the wait queue is full, instead of letting latency grow without bound.
+On shutdown uvicorn stops accepting connections, in-flight requests are given
+`API_GRACEFUL_TIMEOUT` seconds to finish, then the HTTP pools are closed.
+
+Run with:
+    python -m src.api.server
+    uvicorn src.api.server:app --host 0.0.0.0 --port 8000
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import conlist
+
+from src.common.custom_exception import CustomException
+from src.common.logger import get_logger, request_context
+from src.common.metrics import registry, start_configured_exporters
+from src.config.setting import settings
+from src.generator.question_generator import ArtisanAssistant, afetch_google_trends_series
+from src.models.question_schemas import (
+    FeedResultSchema,
+    FeedSchema,
+    FullListingSchema,
+    ListingInputSchema,
+    ProfileSchema,
+    ProfileStorySchema,
+    TrendPointSchema,
+    TrendSeriesSchema,
+)
+
+logger = get_logger(__name__)
+
+
+class OverloadedError(Exception):
+    pass
+
+
+class ConcurrencyGate:
+    """Allow `max_concurrency` requests to run and at most `max_queue` to wait for a slot."""
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_queue = max_queue
+        self.waiting = 0
+        self.active = 0
+
+    async def __aenter__(self):
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            registry.inc("talentbridge_api_rejected_total")
+            raise OverloadedError()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+
+    async def __aexit__(self, *exc):
+        self.active -= 1
+        self._semaphore.release()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_configured_exporters()
+    app.state.assistant = ArtisanAssistant()
+    app.state.gate = ConcurrencyGate(settings.API_MAX_CONCURRENCY, settings.API_MAX_QUEUE)
+    registry.register_collector(lambda: {
+        "talentbridge_api_active_requests": app.state.gate.active,
+        "talentbridge_api_waiting_requests": app.state.gate.waiting,
+    })
+    logger.info("API server started")
+    try:
+        yield
+    finally:
+        llm = app.state.assistant.llm
+        await llm.aclose()
+        llm.close()
+        logger.info("API server stopped")
+
+
+app = FastAPI(title="TalentBridgeAI API", version="0.1", lifespan=lifespan)
+
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    with request_context(request.headers.get("X-Request-ID")) as request_id:
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+@app.exception_handler(OverloadedError)
+async def overloaded_handler(request: Request, exc: OverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is at capacity, retry shortly."},
+        headers={"Retry-After": str(settings.API_RETRY_AFTER)},
+    )
+
+
+@app.exception_handler(CustomException)
+async def generation_error_handler(request: Request, exc: CustomException):
+    logger.error("API generation error on %s: %s", request.url.path, exc)
+    return JSONResponse(status_code=502, content={"detail": "Upstream generation failed."})
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return registry.render_prometheus()
+
+
+@app.post("/v1/profile", response_model=ProfileStorySchema)
+async def profile_story(body: ProfileSchema, request: Request, fresh: bool = False):
+    async with request.app.state.gate:
+        story = await request.app.state.assistant.agenerate_profile_story(
+            body.name, body.location, body.craft_type, fresh=fresh
+        )
+    return ProfileStorySchema(story=story)
+
+
+@app.post("/v1/profiles", response_model=List[ProfileStorySchema])
+async def profile_stories(body: conlist(ProfileSchema, max_length=settings.API_MAX_PROFILES), request: Request,
+                          fresh: bool = False):
+    """Bulk onboarding: stories for many artisans, packed several per LLM request.
+    One request takes a single gate slot, so its size is capped by `API_MAX_PROFILES`.
+    """
+    async with request.app.state.gate:
+        stories = await request.app.state.assistant.agenerate_profile_stories(body, fresh=fresh)
+    return [ProfileStorySchema(story=story) for story in stories]
+
+
+@app.post("/v1/listing", response_model=FullListingSchema)
+async def full_listing(body: ListingInputSchema, request: Request, fresh: bool = False):
+    async with request.app.state.gate:
+        return await request.app.state.assistant.agenerate_full_listing(fresh=fresh, **body.model_dump())
+
+
+@app.post("/v1/feed", response_model=FeedResultSchema)
+async def smart_feed(body: FeedSchema, request: Request, fresh: bool = False):
+    async with request.app.state.gate:
+        category, tags, trend_report = await request.app.state.assistant.agenerate_smart_feed(
+            body.product_name, fresh=fresh
+        )
+    return FeedResultSchema(category=category, tags=tags, trend_report=trend_report)
+
+
+@app.post("/v1/trends", response_model=TrendSeriesSchema)
+async def trends(body: FeedSchema, request: Request):
+    async with request.app.state.gate:
+        series = await afetch_google_trends_series(body.product_name)
+    points = [] if series is None else [
+        TrendPointSchema(date=date, value=float(value)) for date, value in series.items()
+    ]
+    return TrendSeriesSchema(product_name=body.product_name, points=points)
+
+
+def main():
+    import uvicorn
+
+    uvicorn.run(
+        "src.api.server:app",
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        timeout_graceful_shutdown=settings.API_GRACEFUL_TIMEOUT,
+        limit_concurrency=settings.API_MAX_CONCURRENCY + settings.API_MAX_QUEUE + 16,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,122 @@
+"""Non-blocking logging setup.
+
+Loggers hand records to a `QueueHandler`; a background `QueueListener` thread
+does the disk I/O, so request threads never block on the log file. The
+message itself is still merged with its arguments on the logging thread
+(`QueueHandler.prepare`), since the arguments may change once the call
+returns; only the handler's formatter and the write run on the listener. The file rotates by time (daily, default) or size, records can be
+written as JSON lines, and every record carries the request ID of the
+context it was logged from. Use %-style arguments (`logger.info("x %s", y)`)
+so messages are only formatted when they are actually emitted. Levels are set
+once on the root logger from `LOG_LEVEL`; module loggers inherit it.
+"""
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
 
 LOGS_DIR = "logs"
-os.makedirs(LOGS_DIR,exist_ok=True)
 
-LOG_FILE = os.path.join(LOGS_DIR, f"log_{datetime.now().strftime('%Y-%m-%d')}.log")
+_request_id = contextvars.ContextVar("request_id", default="-")
+
+_configured = False
+_configure_lock = threading.Lock()
+_listener = None
+
+
+def set_request_id(request_id: str = None) -> str:
+    """Tag subsequent records from this context (thread/task) with `request_id` (generated if omitted)."""
+    request_id = request_id or uuid.uuid4().hex[:12]
+    _request_id.set(request_id)
+    return request_id
+
+
+def get_request_id() -> str:
+    return _request_id.get()
+
+
+@contextmanager
+def request_context(request_id: str = None):
+    token = _request_id.set(request_id or uuid.uuid4().hex[:12])
+    try:
+        yield _request_id.get()
+    finally:
+        _request_id.reset(token)
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _file_handler(settings) -> logging.Handler:
+    log_file = os.path.join(LOGS_DIR, "app.log")
+    if settings.LOG_ROTATION == "size":
+        handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=settings.LOG_MAX_BYTES, backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    else:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            log_file, when="midnight", backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    if settings.LOG_JSON:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - [%(request_id)s] %(message)s'))
+    return handler
+
+
+def _configure():
+    # Deferred to the first get_logger() call so importing this module has no side effects.
+    global _configured, _listener
+    with _configure_lock:
+        if _configured:
+            return
+        from src.config.setting import settings
+
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(RequestIdFilter())
+
+        root = logging.getLogger()
+        root.addHandler(queue_handler)
+        root.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
+
+        _listener = logging.handlers.QueueListener(log_queue, _file_handler(settings), respect_handler_level=True)
+        _listener.start()
+        # Flush whatever is still queued when the process exits.
+        atexit.register(_listener.stop)
+        _configured = True
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
 
 def get_logger(name):
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    return logger
+    if not _configured:
+        _configure()
+    return logging.getLogger(name)
 
 
 
@@ -31,4 +131,4 @@ def get_logger(name):
 #         level=level,
 #         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 #     )
-#     return logging.getLogger(name)
\ No newline at end of file
+#     return logging.getLogger(name)
@@ -0,0 +1,367 @@
+"""In-process metrics: counters and latency histograms with Prometheus/JSON export.
+
+Every LLM call, trends fetch and `ArtisanAssistant` method is recorded through
+`track()`, which times the block, lets the caller attach details (tokens,
+queue wait, cache status) and runs the optional profiler hook around it.
+`RenderProfiler` times the sections of each Streamlit rerun.
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Optional
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> list:
+        total, out = 0, []
+        for count in self.counts:
+            total += count
+            out.append(total)
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (None if empty or beyond the last bucket)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, cumulative in zip(self.buckets, self.cumulative()):
+            if cumulative >= target:
+                return bound
+        return None
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def get_counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0.0)
+
+    def register_collector(self, collector: Callable[[], dict]):
+        """Add a callable returning `{gauge_name: value}`, read at export time. For a labelled
+        gauge the value is a list of `(labels, value)` pairs, e.g. `[({"backend": "main"}, 0.4)]`.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def _gauges(self) -> dict:
+        """`{(name, label_key): value}` from every collector."""
+        gauges = {}
+        for collector in list(self._collectors):
+            try:
+                for name, value in collector().items():
+                    if isinstance(value, list):
+                        gauges.update(((name, _label_key(labels)), v) for labels, v in value)
+                    else:
+                        gauges[(name, ())] = value
+            except Exception:
+                continue
+        return gauges
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": h.count,
+                    "sum": h.sum,
+                    "p50": h.quantile(0.5),
+                    "p95": h.quantile(0.95),
+                    "p99": h.quantile(0.99),
+                }
+                for (name, labels), h in sorted(self._histograms.items())
+            ]
+        gauges = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(self._gauges().items())
+        ]
+        return {"timestamp": time.time(), "counters": counters, "histograms": histograms, "gauges": gauges}
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            seen = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in seen:
+                    lines.append(f"# TYPE {name} counter")
+                    seen.add(name)
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+            for (name, labels), h in sorted(self._histograms.items()):
+                if name not in seen:
+                    lines.append(f"# TYPE {name} histogram")
+                    seen.add(name)
+                for bound, cumulative in zip(h.buckets, h.cumulative()):
+                    lines.append(f"{name}_bucket{_format_labels(labels, (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {h.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {h.sum}")
+                lines.append(f"{name}_count{_format_labels(labels)} {h.count}")
+        seen = set()
+        for (name, labels), value in sorted(self._gauges().items()):
+            if name not in seen:
+                lines.append(f"# TYPE {name} gauge")
+                seen.add(name)
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+registry = MetricsRegistry()
+
+# --- Profiler hook -------------------------------------------------------------
+
+_profiler_hook = None
+
+
+def set_profiler_hook(hook: Optional[Callable[[str], object]]):
+    """Install `hook(feature) -> context manager`, entered around every tracked block (None removes it)."""
+    global _profiler_hook
+    _profiler_hook = hook
+
+
+def cprofile_hook(output_dir: str = "profiles", features: tuple = ()):
+    """Profiler hook that dumps one cProfile `.prof` file per tracked call of the given features."""
+    import cProfile
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    @contextmanager
+    def hook(feature: str):
+        if features and feature not in features:
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(output_dir, f"{feature}-{time.time_ns()}.prof"))
+
+    return hook
+
+
+# --- Render phases ---------------------------------------------------------------
+
+class RenderProfiler:
+    """Wall time of each section of one Streamlit script run.
+
+    `phase(name)` ends the running phase and starts the next one, so the page
+    code is marked without re-indenting it; `finish()` closes the last phase,
+    records every phase as `talentbridge_render_phase_seconds{phase}` plus the
+    whole run as `talentbridge_render_seconds`, and returns the (name, seconds)
+    pairs. A disabled profiler does nothing.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.phases = []
+        self._started = time.perf_counter()
+        self._current = None
+        self._current_started = self._started
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._close(now)
+        self._current, self._current_started = name, now
+
+    def _close(self, now: float):
+        if self._current is not None:
+            elapsed = now - self._current_started
+            self.phases.append((self._current, elapsed))
+            registry.observe("talentbridge_render_phase_seconds", elapsed, phase=self._current)
+            self._current = None
+
+    def finish(self) -> list:
+        if not self.enabled:
+            return []
+        now = time.perf_counter()
+        self._close(now)
+        registry.observe("talentbridge_render_seconds", now - self._started)
+        return self.phases
+
+
+# --- Tracking --------------------------------------------------------------------
+
+@contextmanager
+def track(metric: str, feature: str, **labels):
+    """Time the block as `<metric>_seconds{feature, status, ...}`.
+
+    Yields a dict the caller can fill with `queue_wait`, `prompt_tokens`,
+    `completion_tokens`, `cache` and `model`; those are recorded on exit.
+    """
+    call = {"model": labels.pop("model", None)}
+    hook = _profiler_hook(feature) if _profiler_hook else nullcontext()
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        with hook:
+            yield call
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        model = call.get("model")
+        registry.observe(f"{metric}_seconds", elapsed, feature=feature, status=status, model=model, **labels)
+        if call.get("queue_wait") is not None:
+            registry.observe(f"{metric}_queue_wait_seconds", call["queue_wait"], feature=feature)
+        if call.get("cache"):
+            registry.inc(f"{metric}_cache_total", feature=feature, status=call["cache"])
+        for kind in ("prompt", "completion"):
+            tokens = call.get(f"{kind}_tokens")
+            if tokens:
+                registry.inc(f"{metric}_tokens_total", tokens, feature=feature, model=model, type=kind)
+        if call.get("cost"):
+            registry.inc(f"{metric}_cost_usd_total", call["cost"], feature=feature, model=model)
+
+
+def instrumented(feature: str):
+    """Decorator recording a function, coroutine or generator as `talentbridge_feature_seconds`."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with track("talentbridge_feature", feature):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def gen_wrapper(*args, **kwargs):
+                with track("talentbridge_feature", feature):
+                    yield from func(*args, **kwargs)
+            return gen_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track("talentbridge_feature", feature):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- Exporters -------------------------------------------------------------------
+
+def start_json_exporter(path: str, interval: float = 60.0) -> threading.Thread:
+    """Write a JSON snapshot to `path` every `interval` seconds from a daemon thread."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    def run():
+        while True:
+            time.sleep(interval)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(registry.snapshot(), f)
+            os.replace(tmp_path, path)
+
+    thread = threading.Thread(target=run, name="metrics-json-exporter", daemon=True)
+    thread.start()
+    return thread
+
+
+def start_http_exporter(port: int, host: str = "0.0.0.0"):
+    """Serve `/metrics` in Prometheus text format from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http-exporter", daemon=True).start()
+    return server
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_configured_exporters():
+    """Start the exporters enabled in `Settings` (once per process)."""
+    from src.config.setting import settings
+
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+        if settings.METRICS_JSON_PATH:
+            start_json_exporter(settings.METRICS_JSON_PATH, settings.METRICS_JSON_INTERVAL)
+        if settings.METRICS_PORT:
+            start_http_exporter(settings.METRICS_PORT)
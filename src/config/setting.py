@@ -7,7 +7,7 @@ class Settings():
 
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-    GROQ_API_URL= "https://api.groq.com/openai/v1/chat/completions"
+    GROQ_API_URL= os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
 
     MODEL_NAME = "llama-3.1-8b-instant"
     
@@ -15,6 +15,151 @@ class Settings():
 
     MAX_RETRIES = 3
 
+    # HTTP transport
+    LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+
+    REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "30"))
+
+    # Resilience: backoff between MAX_RETRIES attempts, circuit breaker and hedging
+    RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+
+    RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "8"))
+
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+    HEDGE_AFTER = float(os.getenv("HEDGE_AFTER", "0"))  # seconds; 0 disables hedged requests
+
+    # Multi-backend routing: JSON list of {name, url, key_env|key, model, rpm, tpm} (empty = single GroqClient),
+    # and JSON {feature: [backend names]} preferences, e.g. {"feed": ["small"]}
+    LLM_BACKENDS = os.getenv("LLM_BACKENDS", "")
+
+    LLM_ROUTES = os.getenv("LLM_ROUTES", "")
+
+    # Response cache (opt-in)
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+
+    CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "86400"))
+
+    CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", os.path.join("cache", "llm_cache.sqlite3"))
+
+    # Client-side quota limiter (0 disables a limit); set RATE_LIMIT_DB_PATH to share it across processes
+    RATE_LIMIT_RPM = float(os.getenv("RATE_LIMIT_RPM", "30"))
+
+    RATE_LIMIT_TPM = float(os.getenv("RATE_LIMIT_TPM", "0"))
+
+    RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "")
+
+    # Google Trends
+    TRENDS_TIMEFRAME = os.getenv("TRENDS_TIMEFRAME", "today 3-m")
+
+    TRENDS_ANCHOR = os.getenv("TRENDS_ANCHOR", "handmade")  # empty disables cross-payload normalization
+
+    TRENDS_CACHE_TTL = float(os.getenv("TRENDS_CACHE_TTL", "3600"))
+
+    TRENDS_CACHE_MAX_ENTRIES = int(os.getenv("TRENDS_CACHE_MAX_ENTRIES", "2048"))
+
+    TRENDS_WORKERS = int(os.getenv("TRENDS_WORKERS", "1"))  # pytrends sessions fetching in parallel
+
+    # Local trend time-series store (empty disables it), its window and the re-fetched overlap in days
+    TRENDS_STORE_DIR = os.getenv("TRENDS_STORE_DIR", os.path.join("cache", "trends"))
+
+    TRENDS_WINDOW_DAYS = int(os.getenv("TRENDS_WINDOW_DAYS", "90"))
+
+    TRENDS_OVERLAP_DAYS = int(os.getenv("TRENDS_OVERLAP_DAYS", "7"))
+
+    # Telemetry: USD per million tokens for cost accounting, and exporters (disabled when empty/0)
+    LLM_INPUT_COST_PER_MTOK = float(os.getenv("LLM_INPUT_COST_PER_MTOK", "0.05"))
+
+    LLM_OUTPUT_COST_PER_MTOK = float(os.getenv("LLM_OUTPUT_COST_PER_MTOK", "0.08"))
+
+    METRICS_JSON_PATH = os.getenv("METRICS_JSON_PATH", "")
+
+    METRICS_JSON_INTERVAL = float(os.getenv("METRICS_JSON_INTERVAL", "60"))
+
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+    # Time each section of every Streamlit rerun (shown in the sidebar, recorded as metrics)
+    RENDER_PROFILE = os.getenv("RENDER_PROFILE", "false").lower() in ("1", "true", "yes")
+
+    # Headless HTTP API
+    API_HOST = os.getenv("API_HOST", "0.0.0.0")
+
+    API_PORT = int(os.getenv("API_PORT", "8000"))
+
+    API_MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "64"))
+
+    API_MAX_QUEUE = int(os.getenv("API_MAX_QUEUE", "256"))
+
+    API_RETRY_AFTER = int(os.getenv("API_RETRY_AFTER", "2"))
+
+    API_GRACEFUL_TIMEOUT = int(os.getenv("API_GRACEFUL_TIMEOUT", "30"))
+
+    API_MAX_PROFILES = int(os.getenv("API_MAX_PROFILES", "64"))  # artisans per /v1/profiles request
+
+    # Local product taxonomy index (category/tags of known products)
+    TAXONOMY_ENABLED = os.getenv("TAXONOMY_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    TAXONOMY_DB_PATH = os.getenv("TAXONOMY_DB_PATH", os.path.join("cache", "taxonomy.sqlite3"))
+
+    TAXONOMY_MAX_ENTRIES = int(os.getenv("TAXONOMY_MAX_ENTRIES", "10000"))
+
+    TAXONOMY_MATCH_THRESHOLD = float(os.getenv("TAXONOMY_MATCH_THRESHOLD", "0.75"))
+
+    # Product photos: upload limits, thumbnail size, decode workers and the photo-hash listing store
+    PHOTO_MAX_BYTES = int(os.getenv("PHOTO_MAX_BYTES", str(10 * 1024 * 1024)))
+
+    PHOTO_MAX_PIXELS = int(os.getenv("PHOTO_MAX_PIXELS", "50000000"))
+
+    PHOTO_MAX_SIDE = int(os.getenv("PHOTO_MAX_SIDE", "512"))
+
+    PHOTO_WORKERS = int(os.getenv("PHOTO_WORKERS", "2"))
+
+    PHOTO_DB_PATH = os.getenv("PHOTO_DB_PATH", os.path.join("cache", "photos.sqlite3"))
+
+    PHOTO_MAX_ENTRIES = int(os.getenv("PHOTO_MAX_ENTRIES", "5000"))
+
+    PHOTO_MATCH_DISTANCE = int(os.getenv("PHOTO_MATCH_DISTANCE", "6"))
+
+    # Logging: rotation is "time" (daily) or "size"; LOG_JSON writes one JSON object per line
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+    LOG_ROTATION = os.getenv("LOG_ROTATION", "time")
+
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "14"))
+
+    LOG_JSON = os.getenv("LOG_JSON", "false").lower() in ("1", "true", "yes")
+
+    # Background jobs: SQLite queue, worker threads, crash-recovery lease, result retention and UI poll interval
+    JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join("cache", "jobs.sqlite3"))
+
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))  # also the concurrency limit of bulk listing uploads
+
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+
+    JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 86400)))
+
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+
+    # Bulk profile stories: packed requests in flight at once
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+    # Smart feed: overall deadline (seconds) for analysis + trends, and worker threads for the pipeline
+    FEED_DEADLINE = float(os.getenv("FEED_DEADLINE", "20"))
+
+    FEED_WORKERS = int(os.getenv("FEED_WORKERS", "16"))
+
+    # Bulk profile stories: artisans packed into one LLM request
+    PROFILE_PACK_SIZE = int(os.getenv("PROFILE_PACK_SIZE", "8"))
+
+    # Listing generation mode: "single" JSON completion or "fanout" parallel sub-prompts
+    LISTING_MODE = os.getenv("LISTING_MODE", "single")
+
 
 settings = Settings()  
 
@@ -0,0 +1,103 @@
+"""Smart-feed orchestrator: LLM analysis and Google Trends fetch run concurrently.
+
+Both parts start at once on worker threads and report back through a queue,
+so the caller can render each part the moment it is ready (including the
+analysis token stream) instead of waiting for the sum of both network calls.
+A shared deadline bounds the whole feed: it is passed down to the LLM stream
+and the trends fetch, so both give their worker back when it passes, and a
+part that has not finished by then is reported as timed out while the rest of
+the feed is still shown. Once the caller stops listening the analysis stream
+is closed as well, so abandoned feeds do not keep `FEED_WORKERS` busy.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from src.common.logger import get_logger
+from src.config.setting import settings
+from src.generator.question_generator import ArtisanAssistant, fetch_google_trends_series
+from src.llm.resilience import Deadline
+from src.utils.shared import shared_instance
+
+logger = get_logger(__name__)
+
+ANALYSIS = "analysis"
+TRENDS = "trends"
+
+@shared_instance
+def _get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=settings.FEED_WORKERS, thread_name_prefix="smart-feed")
+
+
+@dataclass
+class FeedEvent:
+    part: str                 # ANALYSIS or TRENDS
+    kind: str                 # "chunk", "done", "error" or "timeout"
+    value: Any = None         # text chunk, (category, tags, report) tuple, or trends series
+    error: Optional[Exception] = None
+
+
+class SmartFeedPipeline:
+    def __init__(self, assistant: ArtisanAssistant, deadline: float = None):
+        self.assistant = assistant
+        self.deadline = deadline or settings.FEED_DEADLINE
+
+    def events(self, product_name: str, fresh: bool = False, stream: bool = True) -> Iterator[FeedEvent]:
+        """Yield feed events in the order they happen until both parts are done or the deadline passes.
+        The trends series may be None when Google has no data for the product.
+        """
+        events = queue.Queue()
+        deadline = Deadline(self.deadline)
+        abandoned = threading.Event()
+
+        def analysis():
+            try:
+                if stream:
+                    parts = []
+                    chunks = self.assistant.stream_smart_feed(product_name, fresh=fresh, timeout=deadline.remaining())
+                    try:
+                        for chunk in chunks:
+                            if abandoned.is_set():
+                                return
+                            parts.append(chunk)
+                            events.put(FeedEvent(ANALYSIS, "chunk", chunk))
+                    finally:
+                        chunks.close()
+                    result = self.assistant.parse_smart_feed("".join(parts))
+                else:
+                    result = self.assistant.generate_smart_feed(product_name, fresh=fresh,
+                                                                timeout=deadline.remaining())
+                events.put(FeedEvent(ANALYSIS, "done", result))
+            except Exception as e:
+                events.put(FeedEvent(ANALYSIS, "error", error=e))
+
+        def trends():
+            try:
+                series = fetch_google_trends_series(product_name, timeout=deadline.remaining())
+                events.put(FeedEvent(TRENDS, "done", series))
+            except Exception as e:
+                events.put(FeedEvent(TRENDS, "error", error=e))
+
+        executor = _get_executor()
+        executor.submit(analysis)
+        executor.submit(trends)
+
+        pending = {ANALYSIS, TRENDS}
+        try:
+            while pending:
+                try:
+                    event = events.get(timeout=deadline.remaining())
+                except queue.Empty:
+                    for part in sorted(pending):
+                        logger.warning("Smart feed %s for %r missed the %.0fs deadline",
+                                       part, product_name, self.deadline)
+                        yield FeedEvent(part, "timeout")
+                    return
+                if event.kind != "chunk":
+                    pending.discard(event.part)
+                yield event
+        finally:
+            # Deadline passed or the caller stopped listening: stop streaming into the void.
+            abandoned.set()
@@ -0,0 +1,175 @@
+"""Tolerant parsing of listing completions.
+
+Models often wrap the JSON in a code fence, add prose around it or get cut off
+at `max_tokens`. Instead of discarding the whole completion, we extract the
+first JSON object, repair what can be repaired syntactically, coerce fields to
+the `FullListingSchema` types and report which fields are still missing or
+invalid so the caller can regenerate only those.
+"""
+import json
+import re
+from typing import Optional, Tuple
+
+from pydantic import ValidationError
+
+from src.common.metrics import registry
+from src.models.question_schemas import FullListingSchema
+
+EMPTY_LISTING = {
+    "seo_title": "",
+    "description": "",
+    "category": "",
+    "profit": {},
+    "market_price": "",
+    "metafields": "{}",
+    "product_type": "",
+    "tags": [],
+}
+
+LISTING_FIELDS = list(EMPTY_LISTING)
+
+_CLOSERS = {"{": "}", "[": "]"}
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_FENCE = re.compile(r"```(?:json)?", re.IGNORECASE)
+
+PARSE_EVENTS = ("parsed", "parse_failures", "repairs_attempted", "repairs_succeeded")
+
+
+def _count(event: str):
+    registry.inc("talentbridge_listing_parse_events_total", event=event)
+
+
+def get_parse_stats() -> dict:
+    """Counters plus the parse-failure rate and the follow-up repair success rate."""
+    stats = {
+        event: int(registry.get_counter("talentbridge_listing_parse_events_total", event=event))
+        for event in PARSE_EVENTS
+    }
+    stats["parse_failure_rate"] = stats["parse_failures"] / stats["parsed"] if stats["parsed"] else 0.0
+    stats["repair_rate"] = (
+        stats["repairs_succeeded"] / stats["repairs_attempted"] if stats["repairs_attempted"] else 0.0
+    )
+    return stats
+
+
+registry.register_collector(lambda: {
+    f"talentbridge_listing_{name}": value
+    for name, value in get_parse_stats().items() if name.endswith("_rate")
+})
+
+
+def _loads(candidate: str, kind: type = dict):
+    for text in (candidate, _TRAILING_COMMA.sub(r"\1", candidate)):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            continue
+        if isinstance(data, kind):
+            return data
+    return None
+
+
+def extract_json_object(text: str) -> Optional[dict]:
+    """Find the first JSON object in `text` and parse it, closing it if it was truncated."""
+    return _extract_json(text, "{", dict)
+
+
+def extract_json_array(text: str) -> Optional[list]:
+    """Find the first JSON array in `text`; a truncated array keeps its complete elements."""
+    return _extract_json(text, "[", list)
+
+
+def _extract_json(text: str, opener: str, kind: type):
+    if not text:
+        return None
+    text = _FENCE.sub("", text)
+    start = text.find(opener)
+    if start < 0:
+        return None
+
+    stack = []
+    in_string = escaped = False
+    cut_points = []  # (index, open brackets) where the text can be cut and closed
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(ch)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return _loads(text[start:i + 1], kind)
+            cut_points.append((i + 1, list(stack)))
+        elif ch == ",":
+            cut_points.append((i, list(stack)))
+
+    # Truncated: drop the incomplete tail after the last safe cut point and close the brackets.
+    for index, open_brackets in reversed(cut_points):
+        closing = "".join(_CLOSERS[b] for b in reversed(open_brackets))
+        data = _loads(text[start:index] + closing, kind)
+        if data is not None:
+            return data
+    return None
+
+
+def _coerce(field: str, value):
+    if field == "tags" and isinstance(value, str):
+        return [tag.strip() for tag in value.split(",") if tag.strip()]
+    if field == "profit" and isinstance(value, str):
+        parsed = _loads(value)
+        return parsed if parsed is not None else value
+    if field == "metafields" and isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if field in ("market_price", "seo_title", "description", "category", "product_type") and isinstance(value, (int, float)):
+        return str(value)
+    return value
+
+
+def validate_listing(data: dict) -> Tuple[dict, list]:
+    """Coerce `data` to `FullListingSchema` field types.
+    Returns the valid fields and the names of fields that are missing or invalid.
+    """
+    values = {field: _coerce(field, data[field]) for field in LISTING_FIELDS if data.get(field) is not None}
+    try:
+        return FullListingSchema(**values).model_dump(), []
+    except ValidationError as e:
+        invalid = sorted({str(error["loc"][0]) for error in e.errors() if error.get("loc")})
+
+    valid = {field: value for field, value in values.items() if field not in invalid}
+    return valid, invalid
+
+
+def parse_listing(output: str) -> Tuple[dict, list]:
+    """Parse a listing completion. Returns (valid fields, fields that need regenerating)."""
+    _count("parsed")
+    data = extract_json_object(output) or {}
+    valid, invalid = validate_listing(data)
+    if invalid:
+        _count("parse_failures")
+    return valid, invalid
+
+
+def merge_repair(valid: dict, invalid: list, repair_output: str) -> Tuple[dict, list]:
+    """Merge a follow-up completion for `invalid` fields into `valid`.
+    Fields that are still bad are filled with empty defaults and returned as the second item.
+    """
+    _count("repairs_attempted")
+    repaired = extract_json_object(repair_output) or {}
+    merged = dict(valid)
+    merged.update({field: repaired[field] for field in invalid if field in repaired})
+    merged, still_invalid = validate_listing(merged)
+    if not still_invalid:
+        _count("repairs_succeeded")
+    for field in still_invalid:
+        merged[field] = EMPTY_LISTING[field]
+    return merged, still_invalid
@@ -1,84 +1,498 @@
-import json
-from src.llm.groq_client import GroqClient
-from src.prompts.templates import PROFILE_TEMPLATE, LISTING_TEMPLATE, FEED_TEMPLATE
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from src.llm.groq_client import get_shared_client
+from src.prompts.templates import (
+    PROFILE_TEMPLATE, LISTING_TEMPLATE, FEED_TEMPLATE, FEED_INSIGHTS_TEMPLATE, LISTING_REPAIR_TEMPLATE,
+    LISTING_FIELD_GUIDE, LISTING_CLASSIFY_TEMPLATE, LISTING_METAFIELDS_TEMPLATE, SEO_TITLE_TEMPLATE,
+    DESCRIPTION_TEMPLATE, PACKED_PROFILE_TEMPLATE, PACKED_PROFILE_ITEM,
+)
 from src.common.custom_exception import CustomException
+from src.common.logger import get_logger
+from src.common.metrics import instrumented, registry
 from src.config.setting import settings
-from pytrends.request import TrendReq
-import matplotlib.pyplot as plt
-import io
+from src.models.question_schemas import ArtisanStorySchema, ProfileSchema
+from src.generator.trends_service import get_trends_service
+from src.generator.trends_store import get_trend_store
+from src.generator.trends_chart import render_trends_png
+from src.generator.listing_parser import (
+    EMPTY_LISTING, extract_json_array, extract_json_object, merge_repair, parse_listing, validate_listing
+)
+from src.utils.helpers import compute_profit
+from src.generator.taxonomy_index import get_taxonomy_index
+from src.utils.photo import PhotoInfo, get_photo_store
+from src.utils.singleflight import SingleFlight, flight_key
+import asyncio
 import base64
+import re
+
+logger = get_logger(__name__)
+
+# Many sellers check the same trending product at once; share one feed/trends call per product.
+_feed_flights = SingleFlight("feed")
+_trends_flights = SingleFlight("trends")
 
 
 class ArtisanAssistant:
-    def __init__(self):
-        self.llm = GroqClient(
-            api_key=settings.GROQ_API_KEY,
-            api_url=settings.GROQ_API_URL,
-            model_name=settings.MODEL_NAME
-        )
+    def __init__(self, llm=None, taxonomy=None, photos=None):
+        self.llm = llm or get_shared_client()
+        self.taxonomy = taxonomy if taxonomy is not None else get_taxonomy_index()
+        self.photos = photos if photos is not None else get_photo_store()
 
-    def generate_profile_story(self, name: str, location: str, craft_type: str) -> str:
+    @instrumented("profile")
+    def generate_profile_story(self, name: str, location: str, craft_type: str, fresh: bool = False) -> str:
         prompt = PROFILE_TEMPLATE.format(name=name, location=location, craft_type=craft_type)
         try:
-            story = self.llm.generate_text(prompt)
+            story = self.llm.generate_text(prompt, use_cache=not fresh, feature="profile")
             return story.strip()
         except Exception as e:
             raise CustomException("Profile story generation failed", e)
 
-    def generate_full_listing(self, title=None, description=None, photo=None, price=None, cost=None) -> dict:
-        prompt = LISTING_TEMPLATE.format(
+    @instrumented("profile")
+    async def agenerate_profile_story(self, name: str, location: str, craft_type: str, fresh: bool = False) -> str:
+        prompt = PROFILE_TEMPLATE.format(name=name, location=location, craft_type=craft_type)
+        try:
+            story = await self.llm.agenerate_text(prompt, use_cache=not fresh, feature="profile")
+            return story.strip()
+        except Exception as e:
+            raise CustomException("Profile story generation failed", e)
+
+    @instrumented("profile_stream")
+    def stream_profile_story(self, name: str, location: str, craft_type: str, fresh: bool = False) -> Iterator[str]:
+        """Yield the profile story as it is generated."""
+        prompt = PROFILE_TEMPLATE.format(name=name, location=location, craft_type=craft_type)
+        try:
+            yield from self.llm.stream_text(prompt, use_cache=not fresh, feature="profile")
+        except Exception as e:
+            raise CustomException("Profile story generation failed", e)
+
+    @instrumented("profile_packed")
+    def generate_profile_stories(self, artisans: Iterable[ProfileSchema], fresh: bool = False,
+                                 pack_size: int = None) -> List[str]:
+        """Profile stories for many artisans (bulk onboarding), in input order.
+        Up to `pack_size` (default `Settings.PROFILE_PACK_SIZE`) artisans share one request;
+        entries missing or invalid in a packed completion are regenerated individually.
+        """
+        packs = self._profile_packs(artisans, pack_size)
+        if not packs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(packs), max(1, settings.BATCH_CONCURRENCY))) as executor:
+            results = list(executor.map(lambda pack: self._generate_profile_pack(pack, fresh), packs))
+        return [story for stories in results for story in stories]
+
+    @instrumented("profile_packed")
+    async def agenerate_profile_stories(self, artisans: Iterable[ProfileSchema], fresh: bool = False,
+                                        pack_size: int = None) -> List[str]:
+        """Async counterpart of `generate_profile_stories`; packed and fallback requests together
+        stay within `Settings.BATCH_CONCURRENCY` in flight, like the threaded version.
+        """
+        packs = self._profile_packs(artisans, pack_size)
+        limit = asyncio.Semaphore(max(1, settings.BATCH_CONCURRENCY))
+        results = await asyncio.gather(*(self._agenerate_profile_pack(pack, fresh, limit) for pack in packs))
+        return [story for stories in results for story in stories]
+
+    @staticmethod
+    def _profile_packs(artisans: Iterable[ProfileSchema], pack_size: int = None) -> List[List[ProfileSchema]]:
+        artisans = list(artisans)
+        pack_size = max(1, pack_size or settings.PROFILE_PACK_SIZE)
+        return [artisans[i:i + pack_size] for i in range(0, len(artisans), pack_size)]
+
+    @staticmethod
+    def _profile_pack_prompt(pack: List[ProfileSchema]):
+        """(prompt, max_tokens) for one packed request; ~150 words per story plus JSON overhead."""
+        artisans = "\n".join(
+            PACKED_PROFILE_ITEM.format(id=i, **artisan.model_dump()) for i, artisan in enumerate(pack, start=1)
+        )
+        return PACKED_PROFILE_TEMPLATE.format(artisans=artisans), 260 * len(pack)
+
+    @staticmethod
+    def _parse_profile_pack(output: str, pack: List[ProfileSchema]) -> List[Optional[str]]:
+        """Story per artisan of the pack, or None where the completion has no valid story for it."""
+        items = {}
+        for position, item in enumerate(extract_json_array(output) or [], start=1):
+            if isinstance(item, dict):
+                items.setdefault(str(item.get("id", position)), item)
+
+        stories = []
+        for index, artisan in enumerate(pack, start=1):
+            item = items.get(str(index), {})
+            # A name mismatch means the model skipped or reordered entries; do not misattribute stories.
+            if str(item.get("name") or artisan.name).strip().lower() != artisan.name.strip().lower():
+                stories.append(None)
+                continue
+            try:
+                stories.append(ArtisanStorySchema(**artisan.model_dump(), story=str(item.get("story") or "").strip()).story)
+            except ValidationError:
+                stories.append(None)
+
+        packed = sum(story is not None for story in stories)
+        registry.inc("talentbridge_profile_pack_items_total", packed, result="packed")
+        registry.inc("talentbridge_profile_pack_items_total", len(pack) - packed, result="fallback")
+        return stories
+
+    def _generate_profile_pack(self, pack: List[ProfileSchema], fresh: bool) -> List[str]:
+        if len(pack) == 1:
+            return [self.generate_profile_story(fresh=fresh, **pack[0].model_dump())]
+        prompt, max_tokens = self._profile_pack_prompt(pack)
+        try:
+            output = self.llm.generate_text(prompt, max_tokens=max_tokens, use_cache=not fresh, feature="profile_packed")
+        except Exception as e:
+            logger.warning("Packed profile request failed, generating %d stories individually: %s", len(pack), e)
+            output = ""
+        stories = self._parse_profile_pack(output, pack)
+        return [
+            story if story is not None else self.generate_profile_story(fresh=fresh, **artisan.model_dump())
+            for story, artisan in zip(stories, pack)
+        ]
+
+    async def _agenerate_profile_pack(self, pack: List[ProfileSchema], fresh: bool,
+                                      limit: asyncio.Semaphore) -> List[str]:
+        async def single(artisan: ProfileSchema) -> str:
+            async with limit:
+                return await self.agenerate_profile_story(fresh=fresh, **artisan.model_dump())
+
+        if len(pack) == 1:
+            return [await single(pack[0])]
+        prompt, max_tokens = self._profile_pack_prompt(pack)
+        try:
+            async with limit:
+                output = await self.llm.agenerate_text(
+                    prompt, max_tokens=max_tokens, use_cache=not fresh, feature="profile_packed"
+                )
+        except Exception as e:
+            logger.warning("Packed profile request failed, generating %d stories individually: %s", len(pack), e)
+            output = ""
+        stories = self._parse_profile_pack(output, pack)
+        fallbacks = await asyncio.gather(*(
+            single(artisan) for story, artisan in zip(stories, pack) if story is None
+        ))
+        fallbacks = iter(fallbacks)
+        return [story if story is not None else next(fallbacks) for story in stories]
+
+    @instrumented("listing")
+    def generate_full_listing(self, title=None, description=None, photo=None, price=None, cost=None,
+                              fresh: bool = False, mode: str = None) -> dict:
+        """`mode` is "single" (one JSON completion) or "fanout" (parallel sub-prompts);
+        defaults to `Settings.LISTING_MODE`. `photo` may be a `PhotoInfo`, in which case
+        listings already generated for the same (or a near-duplicate) photo and title are reused.
+        """
+        stored = self._stored_listing(photo, title, price, cost, fresh)
+        if stored is not None:
+            return stored
+        try:
+            result = self._generate_listing(title, description, photo, price, cost, fresh, mode)
+        except Exception as e:
+            logger.warning("Listing generation failed, returning empty listing: %s", e)
+            return dict(EMPTY_LISTING)
+        self._remember_photo(photo, title, result)
+        return result
+
+    @instrumented("listing")
+    async def agenerate_full_listing(self, title=None, description=None, photo=None, price=None, cost=None,
+                                     fresh: bool = False, mode: str = None) -> dict:
+        """Async `generate_full_listing` for the HTTP API; raises instead of returning the empty
+        placeholder, so clients get an error status rather than a blank listing.
+        """
+        stored = self._stored_listing(photo, title, price, cost, fresh)
+        if stored is not None:
+            return stored
+        try:
+            result = await self._agenerate_listing(title, description, photo, price, cost, fresh, mode)
+        except Exception as e:
+            raise CustomException("Listing generation failed", e)
+        self._remember_photo(photo, title, result)
+        return result
+
+    def _stored_listing(self, photo, title, price, cost, fresh: bool):
+        if fresh or self.photos is None or not isinstance(photo, PhotoInfo):
+            return None
+        listing = self.photos.lookup(photo, title)
+        if listing is not None:
+            logger.info("Reusing stored listing for photo %s", photo.hash_hex)
+            # Price and cost may differ from the stored run.
+            listing["profit"] = compute_profit(price, cost)
+        return listing
+
+    def _remember_photo(self, photo, title, listing: dict):
+        if self.photos is not None and isinstance(photo, PhotoInfo) and listing.get("seo_title"):
+            self.photos.add(photo, title, listing)
+
+    @staticmethod
+    def _listing_details(title=None, description=None, photo=None, price=None, cost=None) -> dict:
+        return dict(
             title=title or "(let AI decide)",
             description=description or "(let AI decide)",
             price=price or "N/A",
             cost=cost or "N/A",
             photo=str(photo) if photo else "none",
         )
+
+    @staticmethod
+    def _listing_repair_prompt(details: dict, invalid: list) -> str:
+        logger.info("Listing completion missing/invalid fields %s; requesting repair", invalid)
+        fields = "\n".join(f"- {field}: {LISTING_FIELD_GUIDE[field]}" for field in invalid)
+        return LISTING_REPAIR_TEMPLATE.format(fields=fields, **details)
+
+    def _generate_listing(self, title=None, description=None, photo=None, price=None, cost=None,
+                          fresh: bool = False, mode: str = None) -> dict:
+        details = self._listing_details(title, description, photo, price, cost)
+        if (mode or settings.LISTING_MODE) == "fanout":
+            prompts = self._fanout_prompts(details)
+            with ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+                futures = {
+                    part: executor.submit(self._fanout_part, part, prompt, max_tokens, fresh)
+                    for part, (prompt, max_tokens) in prompts.items()
+                }
+                outputs = {part: future.result() for part, future in futures.items()}
+            listing, invalid = self._merge_fanout(outputs, price, cost)
+        else:
+            output = self.llm.generate_text(LISTING_TEMPLATE.format(**details), use_cache=not fresh,
+                                            feature="listing")
+            listing, invalid = parse_listing(output)
+
+        if invalid:
+            # Regenerate only the fields that are missing or invalid instead of the whole listing.
+            repair_output = self.llm.generate_text(
+                self._listing_repair_prompt(details, invalid), use_cache=False, feature="listing_repair"
+            )
+            listing, invalid = merge_repair(listing, invalid, repair_output)
+            if invalid:
+                logger.warning("Listing fields still invalid after repair: %s", invalid)
+        if "category" not in invalid and "tags" not in invalid:
+            # Fields reset to empty defaults by merge_repair must not be remembered.
+            self._remember_taxonomy(title, listing["category"], listing["tags"])
+        return listing
+
+    async def _agenerate_listing(self, title=None, description=None, photo=None, price=None, cost=None,
+                                 fresh: bool = False, mode: str = None) -> dict:
+        details = self._listing_details(title, description, photo, price, cost)
+        if (mode or settings.LISTING_MODE) == "fanout":
+            prompts = self._fanout_prompts(details)
+            results = await asyncio.gather(*(
+                self._afanout_part(part, prompt, max_tokens, fresh)
+                for part, (prompt, max_tokens) in prompts.items()
+            ))
+            listing, invalid = self._merge_fanout(dict(zip(prompts, results)), price, cost)
+        else:
+            output = await self.llm.agenerate_text(
+                LISTING_TEMPLATE.format(**details), use_cache=not fresh, feature="listing"
+            )
+            listing, invalid = parse_listing(output)
+
+        if invalid:
+            repair_output = await self.llm.agenerate_text(
+                self._listing_repair_prompt(details, invalid), use_cache=False, feature="listing_repair"
+            )
+            listing, invalid = merge_repair(listing, invalid, repair_output)
+            if invalid:
+                logger.warning("Listing fields still invalid after repair: %s", invalid)
+        if "category" not in invalid and "tags" not in invalid:
+            # Fields reset to empty defaults by merge_repair must not be remembered.
+            self._remember_taxonomy(title, listing["category"], listing["tags"])
+        return listing
+
+    # --- Parallel ("fanout") listing mode ---------------------------------------
+
+    @staticmethod
+    def _fanout_prompts(details: dict) -> dict:
+        """Independent sub-prompts and their token budgets; profit is computed locally."""
+        return {
+            "seo_title": (SEO_TITLE_TEMPLATE.format(
+                description=f"{details['title']} – {details['description']}", photo=details["photo"]
+            ), 64),
+            "description": (DESCRIPTION_TEMPLATE.format(**details), 320),
+            "classification": (LISTING_CLASSIFY_TEMPLATE.format(**details), 160),
+            "metafields": (LISTING_METAFIELDS_TEMPLATE.format(**details), 200),
+        }
+
+    def _fanout_part(self, part: str, prompt: str, max_tokens: int, fresh: bool) -> str:
+        try:
+            return self.llm.generate_text(prompt, max_tokens=max_tokens, use_cache=not fresh,
+                                          feature=f"listing_{part}")
+        except Exception as e:
+            logger.warning("Listing part %s failed: %s", part, e)
+            return ""
+
+    async def _afanout_part(self, part: str, prompt: str, max_tokens: int, fresh: bool) -> str:
+        try:
+            return await self.llm.agenerate_text(prompt, max_tokens=max_tokens, use_cache=not fresh,
+                                                 feature=f"listing_{part}")
+        except Exception as e:
+            logger.warning("Listing part %s failed: %s", part, e)
+            return ""
+
+    @staticmethod
+    def _merge_fanout(outputs: dict, price, cost) -> Tuple[dict, list]:
+        """Combine the sub-prompt outputs like `parse_listing`: (valid fields, fields to repair)."""
+        if not any(outputs.values()):
+            raise CustomException("Listing generation failed: every listing part failed")
+        data = {
+            "seo_title": outputs["seo_title"].strip().strip('"'),
+            "description": outputs["description"].strip(),
+            "profit": compute_profit(price, cost),
+        }
+        for part, fields in (("classification", ("category", "product_type", "tags")),
+                             ("metafields", ("metafields", "market_price"))):
+            parsed = extract_json_object(outputs[part]) or {}
+            data.update({field: parsed[field] for field in fields if field in parsed})
+
+        listing, invalid = validate_listing(data)
+        if invalid:
+            logger.warning("Listing fields missing from parallel generation: %s", invalid)
+        return listing, invalid
+
+    @instrumented("feed")
+    def generate_smart_feed(self, product_name: str, fresh: bool = False, timeout: float = None):
+        """(category, tags, trend report) for the product; `timeout` bounds the LLM call in seconds."""
+        if fresh:
+            return self._generate_smart_feed(product_name, fresh, timeout)
+        return _feed_flights.do(
+            flight_key("feed", product_name), lambda: self._generate_smart_feed(product_name, fresh, timeout),
+            timeout=timeout,
+        )
+
+    def _generate_smart_feed(self, product_name: str, fresh: bool, timeout: float = None):
+        known = None if fresh else self._known_taxonomy(product_name)
         try:
-            output = self.llm.generate_text(prompt)
-            result = json.loads(output)
-        except Exception:
-            result = {
-                "seo_title": "",
-                "description": "",
-                "category": "",
-                "profit": {},
-                "market_price": "",
-                "metafields": "{}",
-                "product_type": "",
-                "tags": [],
-            }
-        return result
+            if known:
+                # Category and tags come from the local index; only the insights need the model.
+                category, tags = known
+                insights = self.llm.generate_text(
+                    FEED_INSIGHTS_TEMPLATE.format(product_name=product_name, category=category),
+                    use_cache=not fresh, timeout=timeout, feature="feed_insights",
+                )
+                return category, tags, insights.strip()
+            output = self.llm.generate_text(FEED_TEMPLATE.format(product_name=product_name),
+                                            use_cache=not fresh, timeout=timeout, feature="feed")
+            return self._remember_feed(product_name, self.parse_smart_feed(output))
+        except Exception as e:
+            raise CustomException("Feed generation failed", e)
+
+    @instrumented("feed")
+    async def agenerate_smart_feed(self, product_name: str, fresh: bool = False):
+        if fresh:
+            return await self._agenerate_smart_feed(product_name, fresh)
+        return await _feed_flights.ado(
+            flight_key("feed", product_name), lambda: self._agenerate_smart_feed(product_name, fresh)
+        )
 
-    def generate_smart_feed(self, product_name: str):
-        prompt = FEED_TEMPLATE.format(product_name=product_name)
+    async def _agenerate_smart_feed(self, product_name: str, fresh: bool):
+        known = None if fresh else self._known_taxonomy(product_name)
         try:
-            output = self.llm.generate_text(prompt).strip()
-            lines = output.split("\n")
-            category = lines[0] if len(lines) > 0 else "Uncategorized"
-            tags = [tag.strip() for tag in lines[1].split(",")] if len(lines) > 1 else []
-            trend_report = "\n".join(lines[2:]) if len(lines) > 2 else ""
-            return category, tags, trend_report
+            if known:
+                category, tags = known
+                insights = await self.llm.agenerate_text(
+                    FEED_INSIGHTS_TEMPLATE.format(product_name=product_name, category=category),
+                    use_cache=not fresh, feature="feed_insights",
+                )
+                return category, tags, insights.strip()
+            output = await self.llm.agenerate_text(FEED_TEMPLATE.format(product_name=product_name),
+                                                   use_cache=not fresh, feature="feed")
+            return self._remember_feed(product_name, self.parse_smart_feed(output))
         except Exception as e:
             raise CustomException("Feed generation failed", e)
-        
+
+    @instrumented("feed_stream")
+    def stream_smart_feed(self, product_name: str, fresh: bool = False, timeout: float = None) -> Iterator[str]:
+        """Yield the raw feed text as it is generated; pass the joined text to `parse_smart_feed`.
+        Sessions opening the feed of the same product at once share one stream. `timeout`
+        bounds the whole stream in seconds; closing the iterator early stops the request.
+        """
+        if fresh:
+            yield from self._stream_smart_feed(product_name, fresh, timeout)
+            return
+        yield from _feed_flights.stream(
+            flight_key("feed_stream", product_name), lambda: self._stream_smart_feed(product_name, fresh, timeout)
+        )
+
+    def _stream_smart_feed(self, product_name: str, fresh: bool, timeout: float = None) -> Iterator[str]:
+        known = None if fresh else self._known_taxonomy(product_name)
+        try:
+            if known:
+                category, tags = known
+                yield f"{category}\n{', '.join(tags)}\n"
+                yield from self.llm.stream_text(
+                    FEED_INSIGHTS_TEMPLATE.format(product_name=product_name, category=category),
+                    use_cache=not fresh, timeout=timeout, feature="feed_insights",
+                )
+                return
+            parts = []
+            for chunk in self.llm.stream_text(FEED_TEMPLATE.format(product_name=product_name),
+                                              use_cache=not fresh, timeout=timeout, feature="feed"):
+                parts.append(chunk)
+                yield chunk
+            self._remember_feed(product_name, self.parse_smart_feed("".join(parts)))
+        except Exception as e:
+            raise CustomException("Feed generation failed", e)
+
+    # --- Taxonomy index ------------------------------------------------------
+
+    def _known_taxonomy(self, product_name: str):
+        if self.taxonomy is None:
+            return None
+        known = self.taxonomy.lookup(product_name)
+        # Entries without tags (stored by older versions) are not worth skipping the model for.
+        return known if known and known[1] else None
+
+    def _remember_taxonomy(self, product_name: str, category: str, tags: list):
+        """Store the taxonomy of a product, only when both the category and at least one tag are usable."""
+        category = _clean_term(category or "", "category")
+        tags = [tag for tag in (_clean_term(str(tag), "tags") for tag in tags or []) if tag]
+        if self.taxonomy is not None and product_name and category and tags:
+            self.taxonomy.add(product_name, category, tags)
+
+    def _remember_feed(self, product_name: str, result: tuple) -> tuple:
+        category, tags, _ = result
+        self._remember_taxonomy(product_name, category, tags)
+        return result
+
+    @staticmethod
+    def parse_smart_feed(output: str):
+        lines = output.strip().split("\n")
+        category = lines[0] if len(lines) > 0 else "Uncategorized"
+        tags = [tag.strip() for tag in lines[1].split(",")] if len(lines) > 1 else []
+        trend_report = "\n".join(lines[2:]) if len(lines) > 2 else ""
+        return category, tags, trend_report
+
+
+def _clean_term(text: str, label: str) -> str:
+    """Strip markdown, list markers and a "Label:" prefix from a category or tag."""
+    text = re.sub(r"[*`#]+", "", text)
+    text = re.sub(rf"^\s*(?:[-•>]\s*)?(?:\d+[.)]\s*)?(?:{label}\s*:)?", "", text, flags=re.IGNORECASE)
+    return text.strip(" \t_\"'.")
+
+
+def fetch_google_trends_series(product_name: str, timeout: float = None):
+    """Interest-over-time series (pandas Series indexed by date) for the product, or None.
+    With the local trend store enabled only the days missing from the store are downloaded.
+    `timeout` bounds the wait in seconds; the fetch itself finishes in the background.
+    """
+    return _trends_flights.do(
+        flight_key("trends", product_name), lambda: _load_trends_series(product_name, timeout), timeout=timeout
+    )
+
+def _load_trends_series(product_name: str, timeout: float = None):
+    store = get_trend_store()
+    if store is None:
+        return get_trends_service().get_interest(product_name, timeout=timeout)
+    try:
+        store.refresh([product_name], timeout=timeout)
+    except Exception as e:
+        # Serve what is already stored; only fail when there is nothing to show.
+        logger.warning("Google Trends refresh failed for %r: %s", product_name, e)
+        if store.series(product_name) is None:
+            raise
+    return store.series(product_name)
+
+async def afetch_google_trends_series(product_name: str):
+    """Async wrapper; pytrends is blocking, so the fetch runs on a worker thread."""
+    return await _trends_flights.ado(
+        flight_key("trends", product_name), lambda: asyncio.to_thread(fetch_google_trends_series, product_name)
+    )
+
 def fetch_google_trends_graph(product_name: str):
-    pytrends = TrendReq()
-    pytrends.build_payload([product_name], timeframe='today 3-m')
-    data = pytrends.interest_over_time()
-    if data.empty:
+    """Base64-encoded PNG of the product's trend, for callers that cannot draw the series."""
+    png = render_trends_png(product_name)
+    if png is None:
         return None
-
-    plt.figure(figsize=(8,3))
-    plt.plot(data.index, data[product_name], label=product_name)
-    plt.title(f'Google Trends interest for "{product_name}"')
-    plt.xlabel('Date')
-    plt.ylabel('Interest')
-    plt.legend()
-    plt.tight_layout()
-
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    plt.close()
-    buf.seek(0)
-    img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-    return img_base64
+    return base64.b64encode(png).decode('utf-8')
@@ -0,0 +1,126 @@
+"""Local product taxonomy index built from past feed and listing results.
+
+Maps normalized product names to the category and tags the LLM produced for
+them, so known products can be classified without a round trip. Lookups go
+through an inverted index of character trigrams and accept near-duplicates
+whose trigram Jaccard similarity is above `threshold` ("Blue pottery vase"
+vs "blue-pottery vases"). The in-memory index is bounded (least recently used
+entries are evicted) and every update is written through to SQLite, so the
+index survives restarts and grows incrementally.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import List, Optional, Tuple
+
+from src.common.metrics import registry
+from src.utils.helpers import slugify
+from src.utils.shared import SQLiteConnections, shared_instance
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip punctuation and sort the tokens so word order does not matter."""
+    return " ".join(sorted(set(slugify(name).split("-")) - {""}))
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TaxonomyIndex:
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 10000, threshold: float = 0.75):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._entries = OrderedDict()  # normalized name -> (category, tags)
+        self._postings = defaultdict(set)  # trigram -> normalized names
+        self._lock = threading.Lock()
+        self._db = SQLiteConnections(db_path) if db_path else None
+        if db_path:
+            self._load()
+
+    def _load(self):
+        with self._db.connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS taxonomy ("
+                "name TEXT PRIMARY KEY, category TEXT NOT NULL, tags TEXT NOT NULL, updated REAL NOT NULL)"
+            )
+            rows = conn.execute(
+                "SELECT name, category, tags FROM taxonomy ORDER BY updated DESC LIMIT ?", (self.max_entries,)
+            ).fetchall()
+        with self._lock:
+            for name, category, tags in reversed(rows):
+                self._insert(name, category, json.loads(tags))
+
+    def _insert(self, key: str, category: str, tags: List[str]):
+        if key not in self._entries:
+            for gram in trigrams(key):
+                self._postings[gram].add(key)
+        self._entries[key] = (category, tags)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            for gram in trigrams(evicted):
+                names = self._postings.get(gram)
+                if names is not None:
+                    names.discard(evicted)
+                    if not names:
+                        del self._postings[gram]
+
+    def add(self, name: str, category: str, tags: List[str]):
+        key = normalize_name(name)
+        if not key or not category:
+            return
+        tags = [tag for tag in tags if tag]
+        with self._lock:
+            self._insert(key, category, tags)
+        if self.db_path:
+            with self._db.connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO taxonomy (name, category, tags, updated) VALUES (?, ?, ?, ?)",
+                    (key, category, json.dumps(tags, ensure_ascii=False), time.time()),
+                )
+
+    def lookup(self, name: str) -> Optional[Tuple[str, List[str]]]:
+        """(category, tags) for the product or its closest known near-duplicate, else None."""
+        key = normalize_name(name)
+        if not key:
+            return None
+        with self._lock:
+            match = self._entries.get(key)
+            if match is None:
+                grams = trigrams(key)
+                overlaps = defaultdict(int)
+                for gram in grams:
+                    for candidate in self._postings.get(gram, ()):
+                        overlaps[candidate] += 1
+                best, best_score = None, self.threshold
+                for candidate, overlap in overlaps.items():
+                    score = overlap / (len(grams) + len(trigrams(candidate)) - overlap)
+                    if score >= best_score:
+                        best, best_score = candidate, score
+                if best is not None:
+                    key, match = best, self._entries[best]
+            if match is not None:
+                self._entries.move_to_end(key)
+        registry.inc("talentbridge_taxonomy_lookups_total", result="hit" if match else "miss")
+        return match
+
+    def __len__(self):
+        return len(self._entries)
+
+
+@shared_instance
+def get_taxonomy_index() -> Optional[TaxonomyIndex]:
+    """Process-wide index built from `Settings`, or None when disabled."""
+    from src.config.setting import settings
+
+    if not settings.TAXONOMY_ENABLED:
+        return None
+    return TaxonomyIndex(
+        db_path=settings.TAXONOMY_DB_PATH or None,
+        max_entries=settings.TAXONOMY_MAX_ENTRIES,
+        threshold=settings.TAXONOMY_MATCH_THRESHOLD,
+    )
@@ -0,0 +1,61 @@
+"""Fallback PNG renderer for Google Trends series.
+
+The app draws trends natively from the series; this renderer exists for
+callers that need an image. Each call builds its own `Figure` on the Agg
+canvas instead of using the global `pyplot` state, so concurrent sessions
+cannot draw into each other's plots, and rendered bytes are cached by
+(keyword, timeframe).
+"""
+import io
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.config.setting import settings
+from src.generator.trends_service import get_trends_service
+
+_MAX_RENDERED = 128
+_rendered = OrderedDict()
+_rendered_lock = threading.Lock()
+
+
+def _draw_png(series, keyword: str) -> bytes:
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(8, 3))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.plot(series.index, series.values, label=keyword)
+    ax.set_title(f'Google Trends interest for "{keyword}"')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Interest')
+    ax.legend()
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    return buf.getvalue()
+
+
+def render_trends_png(keyword: str, timeframe: str = None) -> Optional[bytes]:
+    """PNG bytes of the keyword's interest over time, or None when there is no data."""
+    timeframe = timeframe or settings.TRENDS_TIMEFRAME
+    key = (keyword, timeframe)
+    now = time.time()
+    with _rendered_lock:
+        cached = _rendered.get(key)
+        if cached and cached[0] > now:
+            _rendered.move_to_end(key)
+            return cached[1]
+
+    series = get_trends_service().get_interest(keyword, timeframe)
+    png = _draw_png(series, keyword) if series is not None else None
+
+    with _rendered_lock:
+        _rendered[key] = (now + settings.TRENDS_CACHE_TTL, png)
+        _rendered.move_to_end(key)
+        while len(_rendered) > _MAX_RENDERED:
+            _rendered.popitem(last=False)
+    return png
@@ -0,0 +1,193 @@
+"""Google Trends access shared by every session of the process.
+
+Callers never fetch on their own thread: missing keywords are queued and a
+small pool of fetch workers (one pytrends session each, `TRENDS_WORKERS`)
+takes up to five queued keywords per payload, so concurrent single-keyword
+requests are batched together instead of queuing one payload each. Callers
+wait on a future, optionally with a timeout, and concurrent requests for the
+same keyword wait on the fetch already in flight. `interest_over_time` results
+are kept in a TTL cache bounded to `TRENDS_CACHE_MAX_ENTRIES` (least recently
+used first out).
+
+Google scales every payload to its own peak, so numbers from two payloads are
+not comparable. When an anchor keyword is configured it is added to every
+payload (leaving room for four product keywords) and each series is rescaled
+so that the anchor's peak is 100, which puts all cached series on one scale.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Iterable, Optional
+
+from src.common.custom_exception import CustomException
+
+from src.common.logger import get_logger
+from src.common.metrics import registry, track
+from src.config.setting import settings
+from src.utils.shared import shared_instance
+
+logger = get_logger(__name__)
+
+MAX_KEYWORDS_PER_PAYLOAD = 5
+
+
+class TrendsService:
+    def __init__(self, timeframe: str = None, anchor: str = None, ttl_seconds: float = None,
+                 session_factory: Callable = None, workers: int = None, max_entries: int = None):
+        self.timeframe = timeframe or settings.TRENDS_TIMEFRAME
+        self.anchor = settings.TRENDS_ANCHOR if anchor is None else anchor
+        self.ttl_seconds = settings.TRENDS_CACHE_TTL if ttl_seconds is None else ttl_seconds
+        self.workers = workers or settings.TRENDS_WORKERS
+        self.max_entries = max_entries or settings.TRENDS_CACHE_MAX_ENTRIES
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._cache = OrderedDict()  # (keyword, timeframe) -> (expires_at, series)
+        self._inflight = {}          # (keyword, timeframe) -> Future, queued or being fetched
+        self._queue = OrderedDict()  # (keyword, timeframe) -> None, waiting for a fetch worker
+        self._threads = []
+
+    def _new_session(self):
+        # pytrends keeps the last payload on the session object, so every worker owns one.
+        if self._session_factory is None:
+            from pytrends.request import TrendReq
+            self._session_factory = TrendReq
+        return self._session_factory()
+
+    def get_interest(self, keyword: str, timeframe: str = None, timeout: float = None):
+        """Interest-over-time series for one keyword, or None when Google has no data."""
+        return self.get_interest_many([keyword], timeframe, timeout)[keyword]
+
+    def get_interest_many(self, keywords: Iterable[str], timeframe: str = None,
+                          timeout: float = None) -> Dict[str, Optional[object]]:
+        """Series per keyword. Raises `CustomException` when `timeout` seconds pass first; the
+        fetch itself carries on and its result is still cached for the next caller.
+        """
+        timeframe = timeframe or self.timeframe
+        keywords = list(dict.fromkeys(keywords))
+        now = time.time()
+        waiting = {}
+
+        with self._lock:
+            for keyword in keywords:
+                key = (keyword, timeframe)
+                cached = self._cache.get(key)
+                if cached and cached[0] > now:
+                    self._cache.move_to_end(key)
+                    future = Future()
+                    future.set_result(cached[1])
+                    status = "hit"
+                elif key in self._inflight:
+                    future = self._inflight[key]
+                    status = "coalesced"
+                else:
+                    future = self._inflight[key] = Future()
+                    self._queue[key] = None
+                    status = "miss"
+                registry.inc("talentbridge_trends_cache_total", status=status)
+                waiting[keyword] = future
+            if self._queue:
+                self._start_workers()
+                self._wakeup.notify_all()
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            return {
+                keyword: future.result(None if deadline is None else max(0.0, deadline - time.monotonic()))
+                for keyword, future in waiting.items()
+            }
+        except FutureTimeout:
+            raise CustomException(f"Google Trends did not answer within {timeout:.0f}s")
+
+    # --- Fetch workers -------------------------------------------------------
+
+    def _start_workers(self):
+        """Start the fetch workers on first use (caller holds the lock)."""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._worker, name=f"trends-fetch-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_batch(self):
+        """Up to one payload's worth of queued keywords sharing a timeframe (caller holds the lock)."""
+        batch_size = MAX_KEYWORDS_PER_PAYLOAD - 1 if self.anchor else MAX_KEYWORDS_PER_PAYLOAD
+        timeframe = next(iter(self._queue))[1]
+        batch = [keyword for keyword, tf in self._queue if tf == timeframe][:batch_size]
+        for keyword in batch:
+            del self._queue[(keyword, timeframe)]
+        return batch, timeframe
+
+    def _worker(self):
+        session = None
+        while True:
+            with self._wakeup:
+                while not self._queue:
+                    self._wakeup.wait()
+                batch, timeframe = self._next_batch()
+            try:
+                if session is None:
+                    session = self._new_session()
+                results = self._fetch_batch(session, batch, timeframe)
+                error = None
+            except Exception as e:
+                logger.error("Google Trends fetch failed for %s: %s", batch, e)
+                results, error = {}, e
+            with self._lock:
+                for keyword in batch:
+                    key = (keyword, timeframe)
+                    future = self._inflight.pop(key)
+                    if error is not None:
+                        future.set_exception(error)
+                        continue
+                    self._store(key, results.get(keyword))
+                    future.set_result(results.get(keyword))
+
+    def _store(self, key: tuple, series):
+        """Cache a fetched series, evicting expired and then least recently used entries (caller holds the lock)."""
+        now = time.time()
+        self._cache[key] = (now + self.ttl_seconds, series)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.max_entries:
+            for stale in [k for k, (expires_at, _) in self._cache.items() if expires_at <= now]:
+                del self._cache[stale]
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _fetch_batch(self, session, keywords: list, timeframe: str) -> dict:
+        kw_list = list(keywords)
+        if self.anchor and self.anchor not in kw_list:
+            kw_list.append(self.anchor)
+
+        with track("talentbridge_trends", "trends_fetch", keywords=len(kw_list)):
+            session.build_payload(kw_list, timeframe=timeframe)
+            data = session.interest_over_time()
+
+        if data is None or data.empty:
+            return {keyword: None for keyword in keywords}
+
+        scale = 1.0
+        if self.anchor and self.anchor in data.columns:
+            anchor_peak = float(data[self.anchor].max())
+            if anchor_peak > 0:
+                scale = 100.0 / anchor_peak
+
+        results = {}
+        for keyword in keywords:
+            if keyword not in data.columns or not data[keyword].any():
+                results[keyword] = None
+            else:
+                results[keyword] = (data[keyword] * scale).rename(keyword)
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+@shared_instance
+def get_trends_service() -> TrendsService:
+    return TrendsService()
@@ -0,0 +1,306 @@
+"""Local, incrementally refreshed store of Google Trends series.
+
+Every keyword gets one memory-mapped NumPy file holding a dense float32 array
+of daily interest since `EPOCH` (NaN where unknown), plus an entry in a small
+JSON index recording when it was last checked. A refresh only asks Google for
+the days after the last stored one (re-fetching `overlap_days` before it,
+since the most recent days are partial), and rescales the new payload so it
+matches the stored values on the overlap: every payload is scaled to its own
+peak, the overlap ratio puts the new days on the stored scale.
+
+Because all series share one day axis, many keywords can be stacked into a
+matrix and analysed together (`analyze`): momentum, least-squares slope,
+weekly seasonality and peak counts are computed with array operations for the
+whole catalog at once, without any network call. NumPy (like pandas) is
+imported on first use, so importing this module stays cheap.
+
+Several processes may share one store directory. Array file names are derived
+from the keyword and the day axis, so they agree without coordination, and
+`index.json` is re-read and merged under a file lock before every write, then
+replaced atomically.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from src.common.logger import get_logger
+from src.common.metrics import registry
+from src.utils.helpers import slugify
+from src.utils.shared import shared_instance
+
+try:
+    import fcntl
+except ImportError:  # Windows: index writes stay atomic, but concurrent writers are not merged
+    fcntl = None
+
+logger = get_logger(__name__)
+
+EPOCH = date(2004, 1, 1)  # first day Google Trends has data for
+DAYS = 1 << 14            # ~44 years of daily slots per keyword (64 KB)
+_MAX_OPEN = 256
+
+
+def day_index(day: date) -> int:
+    return (day - EPOCH).days
+
+
+def array_file_name(keyword: str) -> str:
+    """File name of the keyword's array: a readable prefix plus a hash of the keyword and the day axis."""
+    digest = hashlib.sha256(f"{keyword}\x1f{EPOCH.isoformat()}\x1f{DAYS}".encode("utf-8")).hexdigest()[:16]
+    return f"{slugify(keyword)[:40] or 'keyword'}-{digest}.npy"
+
+
+class TrendStore:
+    def __init__(self, root: str, service=None, window_days: int = 90, overlap_days: int = 7,
+                 refresh_seconds: float = 3600):
+        self.root = root
+        self.service = service
+        self.window_days = window_days
+        self.overlap_days = overlap_days
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._open = OrderedDict()  # keyword -> memmap, bounded so the catalog does not pin file handles
+        os.makedirs(root, exist_ok=True)
+        self._index_path = os.path.join(root, "index.json")
+        self._lock_path = os.path.join(root, ".lock")
+        self._index = self._read_index()
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock on the store directory, shared with other processes using it."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        """Merge our entries into the index on disk, which other processes may have changed since
+        we read it, and replace it atomically; we keep the merged index."""
+        with self._file_lock():
+            index = self._read_index()
+            for keyword, entry in self._index.items():
+                current = index.setdefault(keyword, entry)
+                current["checked"] = max(current["checked"], entry["checked"])
+            tmp = f"{self._index_path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False)
+            os.replace(tmp, self._index_path)
+        self._index = index
+
+    def _array(self, keyword: str, create: bool = False):
+        """Memory-mapped day array of the keyword, or None (caller holds the lock)."""
+        import numpy as np
+
+        array = self._open.get(keyword)
+        if array is not None:
+            self._open.move_to_end(keyword)
+            return array
+        entry = self._index.get(keyword)
+        if entry is None and not create:
+            return None
+        if entry is None:
+            entry = self._index[keyword] = {"file": array_file_name(keyword), "checked": 0}
+        path = os.path.join(self.root, entry["file"])
+        if not os.path.exists(path):
+            # Another process may be creating the same file; never truncate one that appeared meanwhile.
+            with self._file_lock():
+                if not os.path.exists(path):
+                    array = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(DAYS,))
+                    array[:] = np.nan
+                    array.flush()
+        if array is None:
+            array = np.load(path, mmap_mode="r+")
+        self._open[keyword] = array
+        while len(self._open) > _MAX_OPEN:
+            _, evicted = self._open.popitem(last=False)
+            evicted.flush()
+        return array
+
+    def keywords(self) -> List[str]:
+        with self._lock:
+            return list(self._index)
+
+    # --- Incremental refresh -------------------------------------------------
+
+    def _missing_start(self, keyword: str, today: date) -> Optional[date]:
+        """First day to fetch for the keyword, or None when it was checked recently."""
+        import numpy as np
+
+        entry = self._index.get(keyword)
+        if entry and time.time() - entry["checked"] < self.refresh_seconds:
+            return None
+        window_start = today - timedelta(days=self.window_days)
+        array = self._array(keyword)
+        if array is None:
+            return window_start
+        known = np.flatnonzero(~np.isnan(array[day_index(window_start):day_index(today) + 1]))
+        if not len(known):
+            return window_start
+        last = window_start + timedelta(days=int(known[-1]))
+        return max(window_start, last - timedelta(days=self.overlap_days))
+
+    def refresh(self, keywords: Iterable[str], today: date = None, timeout: float = None) -> Dict[str, int]:
+        """Fetch the missing days of each keyword; returns the number of days written per keyword.
+        Keywords sharing a missing range are fetched together in batched payloads; `timeout`
+        bounds the wait for each payload.
+        """
+        today = today or date.today()
+        ranges = {}
+        with self._lock:
+            for keyword in dict.fromkeys(keywords):
+                start = self._missing_start(keyword, today)
+                if start is not None:
+                    ranges.setdefault(start, []).append(keyword)
+
+        written = {}
+        for start, batch in ranges.items():
+            timeframe = f"{start.isoformat()} {today.isoformat()}"
+            registry.inc("talentbridge_trends_store_fetch_total", value=len(batch))
+            results = self.service.get_interest_many(batch, timeframe, timeout=timeout)
+            with self._lock:
+                for keyword in batch:
+                    written[keyword] = self._write(keyword, results.get(keyword))
+                    self._index[keyword]["checked"] = time.time()
+                self._save_index()
+        return written
+
+    def _write(self, keyword: str, series) -> int:
+        import numpy as np
+
+        array = self._array(keyword, create=True)
+        if series is None or not len(series):
+            return 0
+        positions = (series.index.normalize() - np.datetime64(EPOCH, "D")).days.to_numpy(dtype=np.int64)
+        values = series.to_numpy(dtype=np.float32)
+        inside = (positions >= 0) & (positions < DAYS)
+        positions, values = positions[inside], values[inside]
+
+        stored = array[positions]
+        overlap = (stored > 0) & (values > 0)
+        if overlap.sum() >= 3:
+            values = values * float(np.median(stored[overlap] / values[overlap]))
+        array[positions] = values
+        array.flush()
+        return len(positions)
+
+    # --- Reads ---------------------------------------------------------------
+
+    def series(self, keyword: str, days: int = None, today: date = None):
+        """Stored daily series of the last `days` days as a pandas Series, or None."""
+        import numpy as np
+        import pandas as pd
+
+        today = today or date.today()
+        days = days or self.window_days
+        start = today - timedelta(days=days)
+        with self._lock:
+            array = self._array(keyword)
+            if array is None:
+                return None
+            values = np.array(array[day_index(start):day_index(today) + 1])
+        index = pd.date_range(start, periods=len(values), freq="D")
+        series = pd.Series(values, index=index, name=keyword).dropna()
+        return series if series.any() else None
+
+    def matrix(self, keywords: List[str], days: int = None, today: date = None):
+        """(len(keywords), days + 1) array of the stored values on a shared day axis."""
+        import numpy as np
+
+        today = today or date.today()
+        days = days or self.window_days
+        lo, hi = day_index(today - timedelta(days=days)), day_index(today) + 1
+        out = np.full((len(keywords), hi - lo), np.nan, dtype=np.float32)
+        with self._lock:
+            for row, keyword in enumerate(keywords):
+                array = self._array(keyword)
+                if array is not None:
+                    out[row] = array[lo:hi]
+        return out
+
+    def analyze(self, keywords: List[str] = None, days: int = None, today: date = None):
+        """Trend metrics for many keywords at once, as a DataFrame indexed by keyword."""
+        keywords = list(keywords) if keywords is not None else self.keywords()
+        return analyze_matrix(self.matrix(keywords, days, today), keywords)
+
+
+def analyze_matrix(values, keywords: List[str], recent_days: int = 7, baseline_days: int = 28,
+                   threshold: float = 0.1):
+    """Vectorized trend metrics over rows of daily values (NaN = unknown).
+
+    - momentum: mean of the last `recent_days` relative to the `baseline_days` before them
+    - slope: least-squares slope (interest points per day) over the whole window
+    - seasonality: share of the variance explained by the day of the week (0..1)
+    - peaks: local maxima more than 1.5 standard deviations above the mean
+    - direction: "rising", "declining" or "steady" from momentum and slope
+    """
+    import numpy as np
+    import pandas as pd
+
+    # All-NaN rows make the nan-reductions warn; such rows are dropped from the result anyway.
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        recent = np.nanmean(values[:, -recent_days:], axis=1)
+        baseline = np.nanmean(values[:, -(recent_days + baseline_days):-recent_days], axis=1)
+        momentum = np.where(baseline > 0, recent / baseline - 1, np.nan)
+
+        known = ~np.isnan(values)
+        x = np.broadcast_to(np.arange(values.shape[1], dtype=np.float64), values.shape)
+        n = known.sum(axis=1)
+        x_mean = np.where(known, x, 0).sum(axis=1) / n
+        y_mean = np.nanmean(values, axis=1)
+        dx = np.where(known, x - x_mean[:, None], 0)
+        dy = np.where(known, values - y_mean[:, None], 0)
+        slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+
+        weeks = values.shape[1] // 7
+        by_weekday = values[:, values.shape[1] - weeks * 7:].reshape(len(values), weeks, 7)
+        seasonality = np.nanvar(np.nanmean(by_weekday, axis=1), axis=1) / np.nanvar(values, axis=1)
+
+        std = np.nanstd(values, axis=1)
+        middle = values[:, 1:-1]
+        is_peak = (middle > values[:, :-2]) & (middle >= values[:, 2:]) & (middle > (y_mean + 1.5 * std)[:, None])
+        peaks = is_peak.sum(axis=1)
+
+    direction = np.where((momentum > threshold) & (slope > 0), "rising",
+                         np.where((momentum < -threshold) & (slope < 0), "declining", "steady"))
+    frame = pd.DataFrame({
+        "momentum": momentum, "slope": slope, "seasonality": np.clip(seasonality, 0, 1),
+        "peaks": peaks, "direction": direction,
+    }, index=pd.Index(keywords, name="keyword"))
+    return frame[n >= 2 * recent_days]
+
+
+@shared_instance
+def get_trend_store() -> Optional[TrendStore]:
+    """Process-wide store built from `Settings`, or None when `TRENDS_STORE_DIR` is empty."""
+    from src.config.setting import settings
+    from src.generator.trends_service import get_trends_service
+
+    if not settings.TRENDS_STORE_DIR:
+        return None
+    return TrendStore(
+        settings.TRENDS_STORE_DIR,
+        service=get_trends_service(),
+        window_days=settings.TRENDS_WINDOW_DAYS,
+        overlap_days=settings.TRENDS_OVERLAP_DAYS,
+        refresh_seconds=settings.TRENDS_CACHE_TTL,
+    )
@@ -0,0 +1,291 @@
+"""Durable background job queue for long-running generations.
+
+Jobs are rows in a local SQLite file and are executed by a pool of worker
+threads that is sized by `Settings.JOB_WORKERS`, independently of the number
+of UI sessions. The UI submits a job, keeps only its ID (e.g. in
+`st.session_state`) and polls `get`; a rerun or a reconnecting browser simply
+resumes polling, and the result stays in the database instead of being lost
+with the script run that asked for it.
+
+Submissions are deduplicated by a hash of (kind, params): while an identical
+job is queued, running or already done, its ID is returned instead of paying
+for the generation again (pass `dedupe=False` for a fresh variant). Jobs left
+"running" by a crashed process are requeued once their lease expires. Several
+processes may share one database; claims are serialized with BEGIN IMMEDIATE.
+Tools that only read results (the Shopify export) open the store with
+`read_only=True`, which neither creates the schema nor purges old jobs.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from src.common.custom_exception import CustomException
+from src.common.logger import get_logger
+from src.common.metrics import registry
+from src.utils.shared import SQLiteConnections, shared_instance
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str
+    params: dict
+    result: Any = None
+    error: Optional[str] = None
+    created: float = 0.0
+    updated: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+
+def input_hash(kind: str, params: dict) -> str:
+    blob = json.dumps([kind, params], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class JobQueue:
+    def __init__(self, handlers: Dict[str, Callable[[dict], Any]], db_path: str, workers: int = 4,
+                 lease_seconds: float = 600, retention_seconds: float = 7 * 86400, poll_interval: float = 0.5,
+                 read_only: bool = False):
+        self.handlers = handlers
+        self.db_path = db_path
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        self.poll_interval = poll_interval
+        self._db = SQLiteConnections(db_path, timeout=30, autocommit=True, read_only=read_only)
+        self._wakeup = threading.Condition()
+        self._threads = []
+        self._stopping = False
+        if read_only:
+            if not os.path.exists(db_path):
+                raise CustomException(f"No job store at {db_path}")
+            return
+        conn = self._db.connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, input_hash TEXT NOT NULL, params TEXT NOT NULL, "
+            "status TEXT NOT NULL, result TEXT, error TEXT, created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_input_hash ON jobs (input_hash)")
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+        conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated < ?",
+            (DONE, FAILED, time.time() - self.retention_seconds),
+        )
+
+    @staticmethod
+    def _row_to_job(row) -> Job:
+        job_id, kind, params, status, result, error, created, updated = row
+        return Job(job_id, kind, status, json.loads(params),
+                   json.loads(result) if result is not None else None, error, created, updated)
+
+    # --- Producer side -------------------------------------------------------
+
+    def submit(self, kind: str, params: dict, dedupe: bool = True) -> str:
+        """Queue a job and return its ID (or the ID of an identical queued/running/done job)."""
+        if kind not in self.handlers:
+            raise CustomException(f"Unknown job kind: {kind}")
+        digest = input_hash(kind, params)
+        conn = self._db.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            statuses = (QUEUED, RUNNING, DONE) if dedupe else (QUEUED, RUNNING)
+            row = conn.execute(
+                f"SELECT id FROM jobs WHERE input_hash = ? AND status IN ({', '.join('?' * len(statuses))}) "
+                "ORDER BY created DESC LIMIT 1",
+                (digest, *statuses),
+            ).fetchone()
+            if row:
+                conn.execute("COMMIT")
+                registry.inc("talentbridge_jobs_submitted_total", kind=kind, result="deduplicated")
+                return row[0]
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            conn.execute(
+                "INSERT INTO jobs (id, kind, input_hash, params, status, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, digest, json.dumps(params, ensure_ascii=False, default=str), QUEUED, now, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        registry.inc("talentbridge_jobs_submitted_total", kind=kind, result="queued")
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._db.connect().execute(
+            "SELECT id, kind, params, status, result, error, created, updated FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def wait(self, job_id: str, timeout: float = None) -> Optional[Job]:
+        """Block until the job finishes or `timeout` passes; returns its latest state."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job.finished or (deadline is not None and time.monotonic() >= deadline):
+                return job
+            time.sleep(self.poll_interval)
+
+    def iter_results(self, kind: str, batch_size: int = 500) -> Iterator[Tuple[dict, Any]]:
+        """Yield (params, result) of every finished job of `kind`, oldest first, a page at a time."""
+        after = (0.0, "")
+        while True:
+            rows = self._db.connect().execute(
+                "SELECT id, kind, params, status, result, error, created, updated FROM jobs "
+                "WHERE kind = ? AND status = ? AND (created, id) > (?, ?) ORDER BY created, id LIMIT ?",
+                (kind, DONE, after[0], after[1], batch_size),
+            ).fetchall()
+            for row in rows:
+                job = self._row_to_job(row)
+                yield job.params, job.result
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1][6], rows[-1][0])
+
+    def depth(self) -> int:
+        return self._db.connect().execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+
+    # --- Worker side ---------------------------------------------------------
+
+    def _claim(self) -> Optional[Job]:
+        conn = self._db.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            # Requeue jobs whose worker died mid-run.
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated = ? WHERE status = ? AND updated < ?",
+                (QUEUED, now, RUNNING, now - self.lease_seconds),
+            )
+            row = conn.execute(
+                "SELECT id, kind, params, status, result, error, created, updated FROM jobs "
+                "WHERE status = ? ORDER BY created LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE jobs SET status = ?, updated = ? WHERE id = ?", (RUNNING, now, row[0]))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self._row_to_job(row) if row else None
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: str = None):
+        self._db.connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, updated = ? WHERE id = ?",
+            (status, json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+             error, time.time(), job.id),
+        )
+        registry.inc("talentbridge_jobs_finished_total", kind=job.kind, status=status)
+        registry.observe("talentbridge_job_seconds", time.time() - job.created, kind=job.kind)
+
+    def _run_one(self) -> bool:
+        job = self._claim()
+        if job is None:
+            return False
+        try:
+            result = self.handlers[job.kind](job.params)
+        except Exception as e:
+            logger.error("Job %s (%s) failed: %s", job.id, job.kind, e)
+            self._finish(job, FAILED, error=str(e))
+        else:
+            self._finish(job, DONE, result=result)
+        return True
+
+    def _worker(self):
+        while not self._stopping:
+            try:
+                if self._run_one():
+                    continue
+            except sqlite3.Error as e:
+                logger.warning("Job queue worker error: %s", e)
+            # Idle: wait for a local submit, or poll for jobs queued by other processes.
+            with self._wakeup:
+                self._wakeup.wait(self.poll_interval)
+
+    def start(self) -> "JobQueue":
+        if not self._threads:
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = None):
+        self._stopping = True
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping = False
+
+
+def assistant_handlers(assistant) -> Dict[str, Callable[[dict], Any]]:
+    """Job kinds backed by `ArtisanAssistant` (params are the keyword arguments of each call),
+    plus the catalog refresh of the local trend store.
+    """
+    from src.generator.trends_store import get_trend_store
+    from src.utils.photo import PhotoInfo
+
+    def listing(params: dict) -> dict:
+        params = dict(params)
+        if isinstance(params.get("photo"), dict):
+            params["photo"] = PhotoInfo(**params["photo"])
+        result = assistant.generate_full_listing(**params)
+        if not result.get("seo_title"):
+            raise CustomException("Listing generation failed")
+        return result
+
+    return {
+        "profile": lambda params: assistant.generate_profile_story(**params),
+        "listing": listing,
+        "feed": lambda params: list(assistant.generate_smart_feed(**params)),
+        "trends_refresh": lambda params: get_trend_store().refresh(params["keywords"]),
+    }
+
+
+def listing_params(**params) -> dict:
+    """JSON-safe `listing` job params; a `PhotoInfo` photo is stored as its fields."""
+    photo = params.get("photo")
+    if photo is not None and not isinstance(photo, str):
+        params["photo"] = asdict(photo)
+    return params
+
+
+@shared_instance
+def get_job_queue() -> JobQueue:
+    """Process-wide queue built from `Settings`, with its workers started."""
+    from src.config.setting import settings
+    from src.generator.question_generator import ArtisanAssistant
+
+    queue = JobQueue(
+        assistant_handlers(ArtisanAssistant()),
+        db_path=settings.JOB_DB_PATH,
+        workers=settings.JOB_WORKERS,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        retention_seconds=settings.JOB_RETENTION_SECONDS,
+    ).start()
+    registry.register_collector(lambda: {"talentbridge_jobs_queued": queue.depth()})
+    return queue
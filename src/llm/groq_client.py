@@ -1,42 +1,561 @@
 """Minimal Groq client wrapper.
 This is written generically so you can replace the `requests` call with a Gemmini ADK client later.
+
+Connections are pooled: the sync path keeps one keep-alive `requests.Session`
+per client and the async path one `httpx.AsyncClient` per event loop, so
+repeated generations reuse TCP+TLS connections instead of paying a new
+handshake on every call.
+
+Every request goes through the same resilience layer: retries with jittered
+exponential backoff (honoring `Retry-After`) up to `Settings.MAX_RETRIES`, a
+per-call deadline, a circuit breaker shared by all calls of the client and,
+when `hedge_after` is set, a hedged duplicate request for slow calls.
 """
+import asyncio
 import json
+import threading
+import time
 import requests
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
+from typing import Any, AsyncIterator, Iterator
 from src.common.custom_exception import CustomException as AppException
+from src.common.metrics import registry, track
+from src.config.setting import settings
+from src.llm.response_cache import get_shared_cache, make_cache_key
+from src.llm.rate_limiter import estimate_tokens, get_shared_rate_limiter
+from src.utils.shared import shared_instance
+from src.utils.singleflight import SingleFlight
+from src.llm.resilience import RETRYABLE_STATUS, CircuitBreaker, Deadline, RetryPolicy, parse_retry_after
 
 
 class GroqClient:
-    def __init__(self, api_key: str, api_url: str, model_name: str = "llama-3.1-8b-instant"):
+    def __init__(self, api_key: str, api_url: str, model_name: str = "llama-3.1-8b-instant",
+                 pool_size: int = None, timeout: float = None, cache=None,
+                 retry_policy: RetryPolicy = None, breaker: CircuitBreaker = None, hedge_after: float = None,
+                 rate_limiter=None):
         self.api_key = api_key
         self.api_url = api_url.rstrip("/")
         self.model_name = model_name
+        self.temperature = settings.TEMPERATURE
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.pool_size = pool_size or settings.LLM_POOL_SIZE
+        self.timeout = timeout or settings.REQUEST_TIMEOUT
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=settings.MAX_RETRIES,
+            base_delay=settings.RETRY_BASE_DELAY,
+            max_delay=settings.RETRY_MAX_DELAY,
+        )
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_RESET_TIMEOUT,
+        )
+        self.hedge_after = settings.HEDGE_AFTER if hedge_after is None else hedge_after
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._hedge_executor = None
+        self._async_client = None
+        self._async_loop = None
+        self._flights = SingleFlight("llm")
 
-    def generate_text(self, prompt: str, max_tokens: int = 512) -> str:
-        """Synchronous text generation call.
-        Note: Adapted for Groq OpenAI-compatible chat completions API.
-        """
-        headers = {
+    @property
+    def session(self) -> requests.Session:
+        """Shared keep-alive session, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers.update(self._headers())
+                    self._session = session
+        return self._session
+
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        # Imported lazily so sync-only callers (the Streamlit app) never load httpx.
+        import httpx
+
+        # httpx clients are bound to the loop they were first used on.
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            limits = httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+            )
+            self._async_client = httpx.AsyncClient(
+                headers=self._headers(), limits=limits, timeout=self.timeout
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    def _headers(self) -> dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+
+    def _payload(self, prompt: str, max_tokens: int, stream: bool = False) -> dict:
         payload = {
             "model": self.model_name,
             "messages": [
                 {"role": "user", "content": prompt}
             ],
             "max_tokens": max_tokens,
-            "temperature": 0.9
+            "temperature": self.temperature
         }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    @staticmethod
+    def _parse_sse_line(line: str):
+        """Return the content delta from one SSE line, None to skip it, or False on `[DONE]`."""
+        if not line or not line.startswith("data:"):
+            return None
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return False
+        try:
+            chunk = json.loads(data)
+            return chunk["choices"][0].get("delta", {}).get("content")
+        except (ValueError, KeyError, IndexError) as e:
+            raise AppException(f"Groq stream returned a malformed chunk: {e}")
+
+    @staticmethod
+    def _read_json(resp) -> dict:
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise AppException(f"Groq returned a malformed response body: {e}")
+
+    @staticmethod
+    def _extract_text(data: dict) -> str:
         try:
-            resp = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-            # Extract text content from response
             return data["choices"][0]["message"]["content"].strip()
-        except requests.RequestException as e:
-            raise AppException(f"Groq request failed: {e}")
+        except (KeyError, IndexError, TypeError, AttributeError) as e:
+            raise AppException(f"Groq returned an unexpected response: {e}")
+
+    def _cache_key(self, prompt: str, max_tokens: int):
+        if self.cache is None:
+            return None
+        return make_cache_key(self.model_name, prompt, max_tokens, self.temperature)
+
+    def has_cached(self, prompt: str, max_tokens: int = 512) -> bool:
+        """Whether a completion for this prompt is already in the response cache (not counted in its stats)."""
+        key = self._cache_key(prompt, max_tokens)
+        return key is not None and self.cache.contains(key)
+
+    # --- Resilient transport -------------------------------------------------
+
+    def _post(self, payload: dict, deadline: Deadline, stream: bool = False) -> requests.Response:
+        """POST with retries, backoff and the circuit breaker. Returns a 2xx response."""
+        attempt = 0
+        while True:
+            if deadline.expired:
+                raise AppException("Groq request failed: deadline exceeded")
+            if not self.breaker.allow():
+                raise AppException("Groq request failed: circuit open, upstream is degraded")
+
+            retry_after = None
+            error = None
+            settled = False
+            try:
+                resp = self.session.post(self.api_url, json=payload, timeout=deadline.remaining(), stream=stream)
+                if resp.status_code in RETRYABLE_STATUS:
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    error = AppException(f"Groq request failed: HTTP {resp.status_code}")
+                    resp.close()
+                else:
+                    # Any other answer, non-retryable client errors (bad key, bad payload) included,
+                    # means the upstream is up.
+                    self.breaker.record_success()
+                    settled = True
+                    try:
+                        resp.raise_for_status()
+                    except requests.HTTPError as e:
+                        resp.close()
+                        raise AppException(f"Groq request failed: {e}")
+                    return resp
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = AppException(f"Groq request failed: {e}")
+            except requests.RequestException as e:
+                raise AppException(f"Groq request failed: {e}")
+            finally:
+                if error is not None:
+                    self.breaker.record_failure()
+                elif not settled:
+                    self.breaker.release()
+
+            delay = self.retry_policy.backoff(attempt, retry_after)
+            if attempt >= self.retry_policy.max_retries or delay >= deadline.remaining():
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+    async def _apost(self, payload: dict, deadline: Deadline) -> "httpx.Response":
+        """Async counterpart of `_post` for non-streaming requests."""
+        import httpx
+
+        attempt = 0
+        while True:
+            if deadline.expired:
+                raise AppException("Groq request failed: deadline exceeded")
+            if not self.breaker.allow():
+                raise AppException("Groq request failed: circuit open, upstream is degraded")
+
+            retry_after = None
+            error = None
+            settled = False
+            try:
+                resp = await self._get_async_client().post(self.api_url, json=payload, timeout=deadline.remaining())
+                if resp.status_code in RETRYABLE_STATUS:
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    error = AppException(f"Groq request failed: HTTP {resp.status_code}")
+                else:
+                    self.breaker.record_success()
+                    settled = True
+                    resp.raise_for_status()
+                    return resp
+            except httpx.HTTPStatusError as e:
+                raise AppException(f"Groq request failed: {e}")
+            except httpx.HTTPError as e:
+                error = AppException(f"Groq request failed: {e}")
+            finally:
+                # Hedging cancels the slower request; a cancelled trial must not keep the circuit half-open.
+                if error is not None:
+                    self.breaker.record_failure()
+                elif not settled:
+                    self.breaker.release()
+
+            delay = self.retry_policy.backoff(attempt, retry_after)
+            if attempt >= self.retry_policy.max_retries or delay >= deadline.remaining():
+                raise error
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _complete(self, payload: dict, deadline: Deadline) -> dict:
+        """Run one completion, hedging it with a duplicate request if it is slow."""
+        if not self.hedge_after:
+            return self._read_json(self._post(payload, deadline))
+
+        if self._hedge_executor is None:
+            with self._session_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(
+                        max_workers=self.pool_size, thread_name_prefix="groq-hedge"
+                    )
+        call = lambda: self._read_json(self._post(payload, deadline))
+        pending = {self._hedge_executor.submit(call)}
+        done, _ = wait(pending, timeout=min(self.hedge_after, deadline.remaining()))
+        if not done:
+            pending.add(self._hedge_executor.submit(call))
+
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error or AppException("Groq request failed: deadline exceeded")
+
+    async def _acomplete(self, payload: dict, deadline: Deadline) -> dict:
+        if not self.hedge_after:
+            return self._read_json(await self._apost(payload, deadline))
+
+        pending = {asyncio.ensure_future(self._apost(payload, deadline))}
+        done, _ = await asyncio.wait(pending, timeout=min(self.hedge_after, deadline.remaining()))
+        if not done:
+            pending.add(asyncio.ensure_future(self._apost(payload, deadline)))
+
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=deadline.remaining(), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        return self._read_json(task.result())
+                    error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise error or AppException("Groq request failed: deadline exceeded")
+
+    # --- Public API ----------------------------------------------------------
+
+    def _lookup_cache(self, prompt: str, max_tokens: int, use_cache: bool, call: dict):
+        """Return (cache key, cached text or None) and record the cache status on `call`."""
+        key = self._cache_key(prompt, max_tokens)
+        if key is None:
+            call["cache"] = "disabled"
+            return None, None
+        if not use_cache:
+            call["cache"] = "bypass"
+            return key, None
+        cached = self.cache.get(key)
+        call["cache"] = "hit" if cached is not None else "miss"
+        return key, cached
+
+    def _record_usage(self, call: dict, prompt_tokens: int, completion_tokens: int):
+        call["prompt_tokens"] = prompt_tokens
+        call["completion_tokens"] = completion_tokens
+        call["cost"] = (
+            (prompt_tokens or 0) * settings.LLM_INPUT_COST_PER_MTOK
+            + (completion_tokens or 0) * settings.LLM_OUTPUT_COST_PER_MTOK
+        ) / 1_000_000
+
+    def _finish(self, data: dict, estimate: int, call: dict) -> str:
+        usage = data.get("usage") or {}
+        self._record_usage(call, usage.get("prompt_tokens"), usage.get("completion_tokens"))
+        if self.rate_limiter:
+            self.rate_limiter.settle(estimate, usage.get("total_tokens"))
+        # Extract text content from response
+        return self._extract_text(data)
+
+    def _finish_stream(self, prompt: str, text: str, estimate: int, call: dict):
+        # Streamed responses carry no `usage` block; approximate it from the text.
+        prompt_tokens, completion_tokens = estimate_tokens(prompt, 0), len(text) // 4
+        self._record_usage(call, prompt_tokens, completion_tokens)
+        if self.rate_limiter:
+            self.rate_limiter.settle(estimate, prompt_tokens + completion_tokens)
+
+    def generate_text(self, prompt: str, max_tokens: int = 512, use_cache: bool = True,
+                      timeout: float = None, feature: str = None) -> str:
+        """Synchronous text generation call.
+        Note: Adapted for Groq OpenAI-compatible chat completions API.
+        Pass `use_cache=False` to skip the response cache and get a fresh variant;
+        `timeout` is the overall deadline for the call including retries, and
+        `feature` labels the call in the metrics. Identical concurrent calls
+        (unless `use_cache=False`) share a single upstream request.
+        """
+        if not use_cache:
+            return self._generate_text(prompt, max_tokens, use_cache, timeout, feature)
+        key = make_cache_key(self.model_name, prompt, max_tokens, self.temperature)
+        return self._flights.do(key, lambda: self._generate_text(prompt, max_tokens, use_cache, timeout, feature))
+
+    def _generate_text(self, prompt: str, max_tokens: int, use_cache: bool, timeout: float, feature: str) -> str:
+        with track("talentbridge_llm", feature or "unknown", model=self.model_name) as call:
+            key, cached = self._lookup_cache(prompt, max_tokens, use_cache, call)
+            if cached is not None:
+                return cached
+
+            payload = self._payload(prompt, max_tokens)
+            deadline = Deadline(self.timeout if timeout is None else timeout)
+            estimate = estimate_tokens(prompt, max_tokens)
+            if self.rate_limiter:
+                call["queue_wait"] = self.rate_limiter.acquire(estimate, max_wait=deadline.remaining())
+            text = self._finish(self._complete(payload, deadline), estimate, call)
+
+            if key:
+                self.cache.set(key, text)
+            return text
+
+    async def agenerate_text(self, prompt: str, max_tokens: int = 512, use_cache: bool = True,
+                             timeout: float = None, feature: str = None) -> str:
+        """Asynchronous counterpart of `generate_text` on a pooled `httpx.AsyncClient`."""
+        if not use_cache:
+            return await self._agenerate_text(prompt, max_tokens, use_cache, timeout, feature)
+        key = make_cache_key(self.model_name, prompt, max_tokens, self.temperature)
+        return await self._flights.ado(
+            key, lambda: self._agenerate_text(prompt, max_tokens, use_cache, timeout, feature)
+        )
+
+    async def _agenerate_text(self, prompt: str, max_tokens: int, use_cache: bool, timeout: float,
+                              feature: str) -> str:
+        with track("talentbridge_llm", feature or "unknown", model=self.model_name) as call:
+            key, cached = self._lookup_cache(prompt, max_tokens, use_cache, call)
+            if cached is not None:
+                return cached
+
+            payload = self._payload(prompt, max_tokens)
+            deadline = Deadline(self.timeout if timeout is None else timeout)
+            estimate = estimate_tokens(prompt, max_tokens)
+            if self.rate_limiter:
+                call["queue_wait"] = await self.rate_limiter.aacquire(estimate, max_wait=deadline.remaining())
+            text = self._finish(await self._acomplete(payload, deadline), estimate, call)
+
+            if key:
+                self.cache.set(key, text)
+            return text
+
+    def stream_text(self, prompt: str, max_tokens: int = 512, use_cache: bool = True,
+                    timeout: float = None, feature: str = None) -> Iterator[str]:
+        """Yield the completion incrementally using the OpenAI-compatible `stream: true` SSE format.
+        A cached completion is yielded as a single chunk. Retries only happen before the
+        first chunk is received. Identical concurrent streams (unless `use_cache=False`)
+        share one upstream request and receive the same chunks.
+        """
+        if not use_cache:
+            yield from self._stream_text(prompt, max_tokens, use_cache, timeout, feature)
+            return
+        key = make_cache_key(self.model_name, prompt, max_tokens, self.temperature)
+        yield from self._flights.stream(
+            key, lambda: self._stream_text(prompt, max_tokens, use_cache, timeout, feature)
+        )
+
+    def _stream_text(self, prompt: str, max_tokens: int, use_cache: bool, timeout: float,
+                     feature: str) -> Iterator[str]:
+        with track("talentbridge_llm", feature or "unknown", model=self.model_name, stream=True) as call:
+            key, cached = self._lookup_cache(prompt, max_tokens, use_cache, call)
+            if cached is not None:
+                yield cached
+                return
+
+            payload = self._payload(prompt, max_tokens, stream=True)
+            deadline = Deadline(self.timeout if timeout is None else timeout)
+            estimate = estimate_tokens(prompt, max_tokens)
+            if self.rate_limiter:
+                call["queue_wait"] = self.rate_limiter.acquire(estimate, max_wait=deadline.remaining())
+            parts = []
+            try:
+                with self._post(payload, deadline, stream=True) as resp:
+                    for line in resp.iter_lines(decode_unicode=True):
+                        if deadline.expired:
+                            raise AppException("Groq request failed: deadline exceeded while streaming")
+                        delta = self._parse_sse_line(line)
+                        if delta is False:
+                            break
+                        if delta:
+                            if not parts:
+                                registry.observe("talentbridge_llm_first_token_seconds",
+                                                 deadline.elapsed(), feature=feature or "unknown")
+                            parts.append(delta)
+                            yield delta
+            except requests.RequestException as e:
+                raise AppException(f"Groq request failed: {e}")
+
+            text = "".join(parts).strip()
+            self._finish_stream(prompt, text, estimate, call)
+            if key:
+                self.cache.set(key, text)
+
+    async def astream_text(self, prompt: str, max_tokens: int = 512, use_cache: bool = True,
+                           timeout: float = None, feature: str = None) -> AsyncIterator[str]:
+        """Asynchronous counterpart of `stream_text`; identical concurrent streams on one event loop
+        are coalesced the same way.
+        """
+        if not use_cache:
+            async for chunk in self._astream_text(prompt, max_tokens, use_cache, timeout, feature):
+                yield chunk
+            return
+        key = make_cache_key(self.model_name, prompt, max_tokens, self.temperature)
+        async for chunk in self._flights.astream(
+            key, lambda: self._astream_text(prompt, max_tokens, use_cache, timeout, feature)
+        ):
+            yield chunk
+
+    async def _astream_text(self, prompt: str, max_tokens: int, use_cache: bool, timeout: float,
+                            feature: str) -> AsyncIterator[str]:
+        import httpx
+
+        with track("talentbridge_llm", feature or "unknown", model=self.model_name, stream=True) as call:
+            key, cached = self._lookup_cache(prompt, max_tokens, use_cache, call)
+            if cached is not None:
+                yield cached
+                return
+
+            payload = self._payload(prompt, max_tokens, stream=True)
+            deadline = Deadline(self.timeout if timeout is None else timeout)
+            estimate = estimate_tokens(prompt, max_tokens)
+            if self.rate_limiter:
+                call["queue_wait"] = await self.rate_limiter.aacquire(estimate, max_wait=deadline.remaining())
+            parts = []
+            attempt = 0
+            while not parts:
+                if deadline.expired:
+                    raise AppException("Groq request failed: deadline exceeded")
+                if not self.breaker.allow():
+                    raise AppException("Groq request failed: circuit open, upstream is degraded")
+                retry_after = None
+                error = None
+                settled = False
+                try:
+                    async with self._get_async_client().stream(
+                        "POST", self.api_url, json=payload, timeout=deadline.remaining()
+                    ) as resp:
+                        if resp.status_code in RETRYABLE_STATUS:
+                            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                            error = AppException(f"Groq request failed: HTTP {resp.status_code}")
+                        else:
+                            self.breaker.record_success()
+                            settled = True
+                            resp.raise_for_status()
+                            async for line in resp.aiter_lines():
+                                if deadline.expired:
+                                    raise AppException("Groq request failed: deadline exceeded while streaming")
+                                delta = self._parse_sse_line(line)
+                                if delta is False:
+                                    break
+                                if delta:
+                                    if not parts:
+                                        registry.observe("talentbridge_llm_first_token_seconds",
+                                                         deadline.elapsed(), feature=feature or "unknown")
+                                    parts.append(delta)
+                                    yield delta
+                            break
+                except httpx.HTTPStatusError as e:
+                    raise AppException(f"Groq request failed: {e}")
+                except httpx.HTTPError as e:
+                    if parts:
+                        raise AppException(f"Groq request failed: {e}")
+                    error = AppException(f"Groq request failed: {e}")
+                finally:
+                    # Cancellation or GeneratorExit before the upstream answered leaves no verdict.
+                    if error is not None:
+                        self.breaker.record_failure()
+                    elif not settled:
+                        self.breaker.release()
+
+                delay = self.retry_policy.backoff(attempt, retry_after)
+                if attempt >= self.retry_policy.max_retries or delay >= deadline.remaining():
+                    raise error
+                await asyncio.sleep(delay)
+                attempt += 1
+
+            text = "".join(parts).strip()
+            self._finish_stream(prompt, text, estimate, call)
+            if key:
+                self.cache.set(key, text)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
+
+
+@shared_instance
+def get_shared_client() -> GroqClient:
+    """Process-wide client built from `Settings`, so every session shares one connection pool.
+    When `LLM_BACKENDS` is set this is an `LLMRouter` over those backends instead.
+    """
+    if settings.LLM_BACKENDS:
+        from src.llm.router import router_from_settings
+
+        return router_from_settings(cache=get_shared_cache())
+    return GroqClient(
+        api_key=settings.GROQ_API_KEY,
+        api_url=settings.GROQ_API_URL,
+        model_name=settings.MODEL_NAME,
+        cache=get_shared_cache(),
+        rate_limiter=get_shared_rate_limiter(),
+    )
 
 
 # """Minimal Groq client wrapper.
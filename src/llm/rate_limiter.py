@@ -0,0 +1,188 @@
+"""Client-side token-bucket limiter for requests-per-minute and tokens-per-minute quotas.
+
+Callers reserve capacity up front and are told how long to wait before sending.
+Reservations are granted strictly in arrival order, so waiters are served
+fairly (FIFO) instead of racing each other into 429s. A reservation is made
+with the token *estimate*; once the response arrives `settle` corrects the
+bucket with the real `usage` numbers.
+
+The default store keeps the buckets in memory and is shared by all threads of
+the process. `SQLiteBucketStore` keeps them in a local SQLite file so several
+processes (e.g. Streamlit workers) can share one quota.
+"""
+import asyncio
+import threading
+import time
+from typing import Optional
+
+from src.common.custom_exception import CustomException as AppException
+from src.utils.shared import SQLiteConnections, shared_instance
+
+REQUESTS = "requests"
+TOKENS = "tokens"
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough upper bound of the tokens a call will use (~4 characters per token)."""
+    return len(prompt) // 4 + max_tokens
+
+
+class MemoryBucketStore:
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, needs: dict, limits: dict) -> float:
+        """Take `needs[name]` from each bucket and return the seconds until all are covered.
+        `limits[name]` is `(capacity, refill_per_second)`.
+        """
+        with self._lock:
+            now = time.time()
+            wait = 0.0
+            for name, need in needs.items():
+                capacity, rate = limits[name]
+                tokens, updated = self._buckets.get(name, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated) * rate) - need
+                self._buckets[name] = (tokens, now)
+                if tokens < 0:
+                    wait = max(wait, -tokens / rate)
+            return wait
+
+    def adjust(self, name: str, amount: float, capacity: float):
+        with self._lock:
+            if name in self._buckets:
+                tokens, updated = self._buckets[name]
+                self._buckets[name] = (min(capacity, tokens + amount), updated)
+
+    def available(self, name: str, limits: dict) -> float:
+        with self._lock:
+            capacity, rate = limits[name]
+            tokens, updated = self._buckets.get(name, (capacity, time.time()))
+            return min(capacity, tokens + (time.time() - updated) * rate)
+
+
+class SQLiteBucketStore:
+    """Bucket store shared across processes through a local SQLite file."""
+
+    def __init__(self, db_path: str, namespace: str = "default"):
+        self.db_path = db_path
+        self.namespace = namespace
+        self._db = SQLiteConnections(db_path, timeout=30, autocommit=True)
+        with self._db.connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _key(self, name: str) -> str:
+        return f"{self.namespace}:{name}"
+
+    def reserve(self, needs: dict, limits: dict) -> float:
+        conn = self._db.connect()
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent reservations serialize.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            wait = 0.0
+            for name, need in needs.items():
+                capacity, rate = limits[name]
+                row = conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE name = ?", (self._key(name),)
+                ).fetchone()
+                tokens, updated = row if row else (capacity, now)
+                tokens = min(capacity, tokens + (now - updated) * rate) - need
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                    (self._key(name), tokens, now),
+                )
+                if tokens < 0:
+                    wait = max(wait, -tokens / rate)
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def adjust(self, name: str, amount: float, capacity: float):
+        conn = self._db.connect()
+        conn.execute(
+            "UPDATE buckets SET tokens = MIN(?, tokens + ?) WHERE name = ?",
+            (capacity, amount, self._key(name)),
+        )
+
+    def available(self, name: str, limits: dict) -> float:
+        capacity, rate = limits[name]
+        row = self._db.connect().execute(
+            "SELECT tokens, updated FROM buckets WHERE name = ?", (self._key(name),)
+        ).fetchone()
+        if not row:
+            return capacity
+        return min(capacity, row[0] + (time.time() - row[1]) * rate)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0, store=None):
+        self.limits = {}
+        if requests_per_minute:
+            self.limits[REQUESTS] = (requests_per_minute, requests_per_minute / 60.0)
+        if tokens_per_minute:
+            self.limits[TOKENS] = (tokens_per_minute, tokens_per_minute / 60.0)
+        self.store = store or MemoryBucketStore()
+
+    def _reserve(self, tokens: int, max_wait: Optional[float]) -> float:
+        needs = {REQUESTS: 1, TOKENS: tokens}
+        needs = {name: need for name, need in needs.items() if name in self.limits}
+        if not needs:
+            return 0.0
+        wait = self.store.reserve(needs, self.limits)
+        if max_wait is not None and wait > max_wait:
+            self._release(needs)
+            raise AppException(f"Rate limit wait of {wait:.1f}s exceeds the request deadline")
+        return wait
+
+    def _release(self, needs: dict):
+        for name, need in needs.items():
+            self.store.adjust(name, need, self.limits[name][0])
+
+    def acquire(self, tokens: int = 0, max_wait: Optional[float] = None) -> float:
+        """Block until one request of roughly `tokens` tokens may be sent. Returns the seconds waited."""
+        wait = self._reserve(tokens, max_wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0, max_wait: Optional[float] = None) -> float:
+        wait = self._reserve(tokens, max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Correct the token bucket once the real usage of a call is known."""
+        if TOKENS in self.limits and actual_tokens is not None:
+            self.store.adjust(TOKENS, estimated_tokens - actual_tokens, self.limits[TOKENS][0])
+
+    def remaining(self) -> dict:
+        """Currently available capacity per bucket."""
+        return {name: self.store.available(name, self.limits) for name in self.limits}
+
+    def headroom(self) -> float:
+        """Fraction (0..1) of the tightest bucket that is currently available; 1.0 without limits."""
+        if not self.limits:
+            return 1.0
+        return min(self.store.available(name, self.limits) / self.limits[name][0] for name in self.limits)
+
+
+@shared_instance
+def get_shared_rate_limiter() -> Optional[RateLimiter]:
+    """Process-wide limiter built from `Settings`, or None when no quota is configured."""
+    from src.config.setting import settings
+
+    if not (settings.RATE_LIMIT_RPM or settings.RATE_LIMIT_TPM):
+        return None
+    store = SQLiteBucketStore(settings.RATE_LIMIT_DB_PATH) if settings.RATE_LIMIT_DB_PATH else None
+    return RateLimiter(
+        requests_per_minute=settings.RATE_LIMIT_RPM,
+        tokens_per_minute=settings.RATE_LIMIT_TPM,
+        store=store,
+    )
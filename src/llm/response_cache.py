@@ -0,0 +1,134 @@
+"""Two-tier cache for LLM completions.
+
+Tier 1 is an in-process LRU with a size and TTL limit. Tier 2 is an optional
+SQLite file that survives Streamlit restarts and is shared by every worker
+process pointing at the same path.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.utils.shared import SQLiteConnections, shared_instance
+
+
+def make_cache_key(model: str, prompt: str, max_tokens: int, temperature: float) -> str:
+    raw = json.dumps([model, prompt, max_tokens, temperature], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 86400, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = SQLiteConnections(db_path) if db_path else None
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "writes": 0}
+        if db_path:
+            with self._db.connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return value
+                del self._memory[key]
+
+        if self.db_path:
+            row = self._db.connect().execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] > now:
+                self._remember(key, row[0], row[1])
+                self._count("disk_hits")
+                return row[0]
+
+        self._count("misses")
+        return None
+
+    def contains(self, key: str) -> bool:
+        """Whether `key` has an unexpired entry; unlike `get`, not counted as a hit or miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[1] > now:
+                return True
+        if self.db_path:
+            return self._db.connect().execute(
+                "SELECT 1 FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone() is not None
+        return False
+
+    def set(self, key: str, value: str):
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, value, expires_at)
+        if self.db_path:
+            with self._db.connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at),
+                )
+        self._count("writes")
+
+    def _remember(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._memory[key] = (value, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def purge_expired(self) -> int:
+        """Drop expired rows from the disk tier. Returns the number removed."""
+        if not self.db_path:
+            return 0
+        with self._db.connect() as conn:
+            cur = conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            return cur.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            with self._db.connect() as conn:
+                conn.execute("DELETE FROM responses")
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self.stats, size=len(self._memory))
+
+
+@shared_instance
+def get_shared_cache() -> Optional[ResponseCache]:
+    """Process-wide cache built from `Settings`, or None when caching is disabled."""
+    from src.common.metrics import registry
+    from src.config.setting import settings
+
+    if not settings.CACHE_ENABLED:
+        return None
+    cache = ResponseCache(
+        max_entries=settings.CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.CACHE_TTL_SECONDS,
+        db_path=settings.CACHE_DB_PATH or None,
+    )
+    registry.register_collector(
+        lambda: {f"talentbridge_response_cache_{name}": value for name, value in cache.get_stats().items()}
+    )
+    return cache
@@ -0,0 +1,290 @@
+"""Route LLM calls across a pool of (endpoint, key, model) backends.
+
+One API key caps throughput at that key's quota, so the router holds several
+`GroqClient`s, each with its own key, rate limiter and circuit breaker, and
+picks one per call. Backends are ranked by their smoothed (EWMA) latency,
+scaled up by the calls already in flight on them and by how little of their
+rate-limit quota is left; a backend that has never been measured ranks first
+so it gets sampled. A failing backend is skipped and the call fails over to
+the next one within the same overall deadline; streams only fail over before
+the first chunk. `routes` maps a feature (e.g. "feed") to the backends it
+should prefer, so cheap templates can go to a smaller model while the other
+backends stay available as a fallback.
+
+The router exposes the same calls as `GroqClient` and can be used in its place.
+Configure it with `Settings.LLM_BACKENDS`, a JSON list such as::
+
+    [{"name": "main", "key_env": "GROQ_API_KEY", "model": "llama-3.3-70b-versatile", "rpm": 30},
+     {"name": "small", "key_env": "GROQ_API_KEY_2", "model": "llama-3.1-8b-instant", "rpm": 30}]
+
+and `Settings.LLM_ROUTES`, e.g. `{"feed": ["small"]}`. Missing `url`/`model`
+fall back to `GROQ_API_URL`/`MODEL_NAME`; prefer `key_env` over an inline `key`.
+"""
+import json
+import os
+import random
+import threading
+import time
+from typing import AsyncIterator, Iterator, List
+
+from src.common.custom_exception import CustomException as AppException
+from src.common.logger import get_logger
+from src.common.metrics import registry
+from src.config.setting import settings
+from src.llm.groq_client import GroqClient
+from src.llm.rate_limiter import RateLimiter, SQLiteBucketStore
+from src.llm.resilience import Deadline, RetryPolicy
+
+logger = get_logger(__name__)
+
+
+class Backend:
+    def __init__(self, name: str, client: GroqClient, alpha: float = 0.3):
+        self.name = name
+        self.client = client
+        self.alpha = alpha
+        self.latency = None
+        self.inflight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return not self.client.breaker.is_open()
+
+    def score(self) -> float:
+        headroom = self.client.rate_limiter.headroom() if self.client.rate_limiter else 1.0
+        return (self.latency or 0.0) * (1 + self.inflight) / max(headroom, 0.05)
+
+    def begin(self):
+        with self._lock:
+            self.inflight += 1
+
+    def end(self, latency: float = None):
+        with self._lock:
+            self.inflight -= 1
+            if latency is not None:
+                self.latency = latency if self.latency is None else (
+                    self.alpha * latency + (1 - self.alpha) * self.latency
+                )
+
+
+class LLMRouter:
+    def __init__(self, backends: List[Backend], routes: dict = None, timeout: float = None):
+        if not backends:
+            raise AppException("LLM router needs at least one backend")
+        names = {backend.name for backend in backends}
+        unknown = {name for preferred in (routes or {}).values() for name in preferred} - names
+        if unknown:
+            raise AppException(f"LLM_ROUTES references unknown backends: {', '.join(sorted(unknown))}")
+        self.backends = backends
+        self.routes = routes or {}
+        self.timeout = timeout or settings.REQUEST_TIMEOUT
+
+    @classmethod
+    def from_config(cls, specs: list, routes: dict = None, cache=None) -> "LLMRouter":
+        """Build the router from `LLM_BACKENDS`-style dicts (see the module docstring)."""
+        retries = settings.MAX_RETRIES if len(specs) == 1 else 1
+        backends = []
+        for i, spec in enumerate(specs):
+            name = spec.get("name") or f"backend{i}"
+            rpm, tpm = spec.get("rpm", 0), spec.get("tpm", 0)
+            limiter = None
+            if rpm or tpm:
+                store = SQLiteBucketStore(settings.RATE_LIMIT_DB_PATH, namespace=name) if settings.RATE_LIMIT_DB_PATH else None
+                limiter = RateLimiter(requests_per_minute=rpm, tokens_per_minute=tpm, store=store)
+            client = GroqClient(
+                api_key=os.getenv(spec["key_env"]) if spec.get("key_env") else spec.get("key", settings.GROQ_API_KEY),
+                api_url=spec.get("url", settings.GROQ_API_URL),
+                model_name=spec.get("model", settings.MODEL_NAME),
+                cache=cache,
+                retry_policy=RetryPolicy(
+                    max_retries=spec.get("max_retries", retries),
+                    base_delay=settings.RETRY_BASE_DELAY,
+                    max_delay=settings.RETRY_MAX_DELAY,
+                ),
+                rate_limiter=limiter,
+            )
+            backends.append(Backend(name, client))
+        return cls(backends, routes)
+
+    def _candidates(self, feature: str) -> List[Backend]:
+        """Backends in the order to try them: routed ones first, then by score; open circuits last."""
+        preferred = set(self.routes.get(feature) or ())
+        return sorted(self.backends, key=lambda b: (
+            not b.available, bool(preferred) and b.name not in preferred, b.score(), random.random()
+        ))
+
+    def _cached(self, candidates: List[Backend], prompt: str, max_tokens: int, use_cache: bool):
+        """First backend whose model already has this completion cached; looks each model up once."""
+        if not use_cache:
+            return None
+        models = set()
+        for backend in candidates:
+            if backend.client.model_name in models:
+                continue
+            models.add(backend.client.model_name)
+            if backend.client.has_cached(prompt, max_tokens):
+                return backend
+        return None
+
+    def _failed(self, backend: Backend, feature: str, error: Exception):
+        logger.warning("LLM backend %s failed for %s, failing over: %s", backend.name, feature or "unknown", error)
+        registry.inc("talentbridge_llm_failover_total", backend=backend.name, feature=feature or "unknown")
+
+    def generate_text(self, prompt: str, max_tokens: int = 512, use_cache: bool = True,
+                      timeout: float = None, feature: str = None) -> str:
+        candidates = self._candidates(feature)
+        cached = self._cached(candidates, prompt, max_tokens, use_cache)
+        if cached is not None:
+            return cached.client.generate_text(prompt, max_tokens, use_cache, timeout, feature)
+
+        deadline = Deadline(self.timeout if timeout is None else timeout)
+        error = None
+        for backend in candidates:
+            if deadline.expired:
+                break
+            backend.begin()
+            started, latency = time.monotonic(), None
+            try:
+                text = backend.client.generate_text(prompt, max_tokens, use_cache, deadline.remaining(), feature)
+                latency = time.monotonic() - started
+                return text
+            except AppException as e:
+                error = e
+                self._failed(backend, feature, e)
+            finally:
+                backend.end(latency)
+        raise error or AppException("LLM request failed: deadline exceeded")
+
+    async def agenerate_text(self, prompt: str, max_tokens: int = 512, use_cache: bool = True,
+                             timeout: float = None, feature: str = None) -> str:
+        candidates = self._candidates(feature)
+        cached = self._cached(candidates, prompt, max_tokens, use_cache)
+        if cached is not None:
+            return await cached.client.agenerate_text(prompt, max_tokens, use_cache, timeout, feature)
+
+        deadline = Deadline(self.timeout if timeout is None else timeout)
+        error = None
+        for backend in candidates:
+            if deadline.expired:
+                break
+            backend.begin()
+            started, latency = time.monotonic(), None
+            try:
+                text = await backend.client.agenerate_text(prompt, max_tokens, use_cache, deadline.remaining(), feature)
+                latency = time.monotonic() - started
+                return text
+            except AppException as e:
+                error = e
+                self._failed(backend, feature, e)
+            finally:
+                backend.end(latency)
+        raise error or AppException("LLM request failed: deadline exceeded")
+
+    def stream_text(self, prompt: str, max_tokens: int = 512, use_cache: bool = True,
+                    timeout: float = None, feature: str = None) -> Iterator[str]:
+        """Stream from the best backend; latency is measured to the first chunk."""
+        candidates = self._candidates(feature)
+        cached = self._cached(candidates, prompt, max_tokens, use_cache)
+        if cached is not None:
+            yield from cached.client.stream_text(prompt, max_tokens, use_cache, timeout, feature)
+            return
+
+        deadline = Deadline(self.timeout if timeout is None else timeout)
+        error = None
+        for backend in candidates:
+            if deadline.expired:
+                break
+            backend.begin()
+            started, first_chunk = time.monotonic(), None
+            try:
+                for chunk in backend.client.stream_text(prompt, max_tokens, use_cache, deadline.remaining(), feature):
+                    if first_chunk is None:
+                        first_chunk = time.monotonic() - started
+                    yield chunk
+                return
+            except AppException as e:
+                if first_chunk is not None:
+                    raise
+                error = e
+                self._failed(backend, feature, e)
+            finally:
+                backend.end(first_chunk)
+        raise error or AppException("LLM request failed: deadline exceeded")
+
+    async def astream_text(self, prompt: str, max_tokens: int = 512, use_cache: bool = True,
+                           timeout: float = None, feature: str = None) -> AsyncIterator[str]:
+        candidates = self._candidates(feature)
+        cached = self._cached(candidates, prompt, max_tokens, use_cache)
+        if cached is not None:
+            async for chunk in cached.client.astream_text(prompt, max_tokens, use_cache, timeout, feature):
+                yield chunk
+            return
+
+        deadline = Deadline(self.timeout if timeout is None else timeout)
+        error = None
+        for backend in candidates:
+            if deadline.expired:
+                break
+            backend.begin()
+            started, first_chunk = time.monotonic(), None
+            try:
+                async for chunk in backend.client.astream_text(
+                    prompt, max_tokens, use_cache, deadline.remaining(), feature
+                ):
+                    if first_chunk is None:
+                        first_chunk = time.monotonic() - started
+                    yield chunk
+                return
+            except AppException as e:
+                if first_chunk is not None:
+                    raise
+                error = e
+                self._failed(backend, feature, e)
+            finally:
+                backend.end(first_chunk)
+        raise error or AppException("LLM request failed: deadline exceeded")
+
+    def stats(self) -> dict:
+        """Per-backend latency (EWMA seconds), in-flight calls, quota headroom and circuit state."""
+        return {
+            backend.name: {
+                "model": backend.client.model_name,
+                "latency": backend.latency,
+                "inflight": backend.inflight,
+                "headroom": backend.client.rate_limiter.headroom() if backend.client.rate_limiter else 1.0,
+                "circuit": backend.client.breaker.state,
+            }
+            for backend in self.backends
+        }
+
+    def close(self):
+        for backend in self.backends:
+            backend.client.close()
+
+    async def aclose(self):
+        for backend in self.backends:
+            await backend.client.aclose()
+
+
+def router_from_settings(cache=None) -> LLMRouter:
+    """Router for `Settings.LLM_BACKENDS`, with its backend stats exported as metrics gauges."""
+    try:
+        specs = json.loads(settings.LLM_BACKENDS)
+        routes = json.loads(settings.LLM_ROUTES) if settings.LLM_ROUTES else {}
+    except json.JSONDecodeError as e:
+        raise AppException(f"Invalid LLM_BACKENDS/LLM_ROUTES JSON: {e}")
+    router = LLMRouter.from_config(specs, routes, cache=cache)
+
+    def gauges():
+        stats = router.stats()
+        return {
+            "talentbridge_llm_backend_latency_seconds": [
+                ({"backend": name}, s["latency"] or 0.0) for name, s in stats.items()
+            ],
+            "talentbridge_llm_backend_inflight": [({"backend": name}, s["inflight"]) for name, s in stats.items()],
+            "talentbridge_llm_backend_headroom": [({"backend": name}, s["headroom"]) for name, s in stats.items()],
+        }
+
+    registry.register_collector(gauges)
+    return router
@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from datetime import datetime
 from typing import List, Optional
 
 
@@ -34,3 +35,28 @@ class ListingInputSchema(BaseModel):
     photo: Optional[str] = None  # filename, URL, or base64 string
     price: Optional[str] = None
     cost: Optional[str] = None
+
+
+class ProfileStorySchema(BaseModel):
+    story: str
+
+
+class ArtisanStorySchema(ProfileSchema):
+    """One story of a packed (multi-artisan) profile completion."""
+    story: str = Field(min_length=40)
+
+
+class FeedResultSchema(BaseModel):
+    category: str
+    tags: List[str]
+    trend_report: str
+
+
+class TrendPointSchema(BaseModel):
+    date: datetime
+    value: float
+
+
+class TrendSeriesSchema(BaseModel):
+    product_name: str
+    points: List[TrendPointSchema]
@@ -14,6 +14,24 @@ PROFILE_TEMPLATE = (
     "- it's for social media buissness account creation for ex- instagram, facebook.\n"
 )
 
+# Several artisans in one request (bulk onboarding); same guidelines as PROFILE_TEMPLATE.
+PACKED_PROFILE_TEMPLATE = (
+    "You are a creative storyteller for local artisans. "
+    "Generate a compelling digital story for EACH artisan listed below:\n"
+    "{artisans}\n\n"
+    "Guidelines for every story:\n"
+    "- Write in a friendly, inspiring tone suitable for social media.\n"
+    "- Keep it concise (less then 150 words).\n"
+    "- Highlight tradition, culture, and uniqueness of the craft.\n"
+    "- Make it engaging so buyers feel emotionally connected.\n"
+    "- it's for social media buissness account creation for ex- instagram, facebook.\n\n"
+    "Output ONLY a JSON array with one object per artisan, in the same order, "
+    "each with the keys \"id\", \"name\" and \"story\". "
+    "Example: [{{\"id\": 1, \"name\": \"...\", \"story\": \"...\"}}]\n"
+)
+
+PACKED_PROFILE_ITEM = "{id}. Name: {name} | Location: {location} | Craft type: {craft_type}"
+
 LISTING_TEMPLATE = (
     "You are an expert e-commerce copywriter and marketplace analyst. "
     "Using the product details below, generate a complete product listing in valid JSON. "
@@ -43,6 +61,38 @@ LISTING_TEMPLATE = (
     "- Ensure fields are never empty: if unknown, use an empty string \"\" or empty array [].\n"
 )
 
+# Field guide shared by the listing repair prompt (mirrors LISTING_TEMPLATE).
+LISTING_FIELD_GUIDE = {
+    "seo_title": "An SEO-optimized product title (≤70 characters, keyword-rich, compelling).",
+    "description": "An engaging, persuasive, SEO-optimized description (120–200 words).",
+    "category": "Best-fit e-commerce category (e.g., Home Decor, Jewelry, Apparel or more).",
+    "profit": "JSON object with 'profit_margin' (percentage) and 'profit_amount' (numeric, same currency as price).",
+    "market_price": "Estimated competitive price range for similar products, as a string.",
+    "metafields": "JSON object compatible with Shopify (keys like 'material', 'care_instructions', 'origin').",
+    "product_type": "Recommended product type (specific but not too narrow).",
+    "tags": "Array of 5–10 relevant keywords/tags (do not return as a string).",
+}
+
+LISTING_REPAIR_TEMPLATE = (
+    "You are an expert e-commerce copywriter and marketplace analyst. "
+    "Complete the missing fields of a product listing.\n\n"
+
+    "Product details:\n"
+    "- Title: {title}\n"
+    "- Description: {description}\n"
+    "- Price: {price}\n"
+    "- Cost per item: {cost}\n"
+    "- Photo info: {photo}\n\n"
+
+    "Return a JSON object with ONLY these keys:\n"
+    "{fields}\n\n"
+
+    "⚠️ Rules:\n"
+    "- Output must be valid JSON ONLY.\n"
+    "- Use double quotes for all keys and string values.\n"
+    "- No markdown, no comments, no explanations.\n"
+)
+
 FEED_TEMPLATE = (
     "You are an AI marketplace analyst. For the given product name, suggest where it fits best online.\n\n"
     "Product Name: {product_name}\n\n"
@@ -52,7 +102,43 @@ FEED_TEMPLATE = (
     "3. Trend Insights (1–2 sentences on current trends, platforms, or regions where it’s popular)\n"
 )
 
-# Mini templates for future extension (not currently used)
+FEED_INSIGHTS_TEMPLATE = (
+    "You are an AI marketplace analyst.\n\n"
+    "Product Name: {product_name}\n"
+    "Category: {category}\n\n"
+    "Write the Trend Insights only: 1–2 sentences on current trends, platforms, or regions where it’s popular.\n"
+    "Output the sentences only, no heading or extra text.\n"
+)
+
+# Sub-prompts for the parallel ("fanout") listing mode, used together with
+# SEO_TITLE_TEMPLATE and DESCRIPTION_TEMPLATE below.
+
+LISTING_CLASSIFY_TEMPLATE = (
+    "You are a marketplace analyst. Classify this product for an online store.\n\n"
+    "Product details:\n"
+    "- Title: {title}\n"
+    "- Description: {description}\n"
+    "- Photo info: {photo}\n\n"
+    "Return JSON only with keys:\n"
+    "- category: Best-fit e-commerce category (e.g., Home Decor, Jewelry, Apparel or more).\n"
+    "- product_type: Recommended product type (specific but not too narrow).\n"
+    "- tags: Array of 5–10 relevant keywords/tags.\n"
+    "No markdown, no explanations.\n"
+)
+
+LISTING_METAFIELDS_TEMPLATE = (
+    "You are a Shopify catalog specialist. For the product below, return JSON only with keys:\n"
+    "- metafields: JSON object compatible with Shopify (keys like 'material', 'care_instructions', 'origin').\n"
+    "- market_price: Estimated competitive price range for similar products, as a string.\n\n"
+    "Product details:\n"
+    "- Title: {title}\n"
+    "- Description: {description}\n"
+    "- Price: {price}\n"
+    "- Photo info: {photo}\n\n"
+    "No markdown, no explanations.\n"
+)
+
+# Mini templates, used by the parallel listing mode
 
 SEO_TITLE_TEMPLATE = (
     "You are an SEO expert. Generate a short, compelling, keyword-rich title "
@@ -70,6 +156,7 @@ DESCRIPTION_TEMPLATE = (
     "You are an e-commerce copywriter. Write a persuasive, SEO-friendly product description.\n\n"
     "Details:\n"
     "- Title: {title}\n"
+    "- Artisan's description: {description}\n"
     "- Photo info: {photo}\n\n"
     "Guidelines:\n"
     "- Length: 100–150 words.\n"
@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 import re
 
 def slugify(text: str) -> str:
@@ -7,3 +10,42 @@ def slugify(text: str) -> str:
 
 def safe_text(text: str) -> str:
     return re.sub(r"[\"\'<>]", " ", text).strip()
+
+def parse_price(value):
+    """Extract a number from user input such as "₹1,200" or "12.5 USD"; None if there is none."""
+    if value is None:
+        return None
+    match = re.search(r"-?\d+(?:\.\d+)?", str(value).replace(",", ""))
+    return float(match.group()) if match else None
+
+def compute_profit(price, cost) -> dict:
+    """Profit margin (% of price) and amount, formatted like the listing `profit` field."""
+    price_value, cost_value = parse_price(price), parse_price(cost)
+    if price_value is None or cost_value is None or price_value == 0:
+        return {}
+    amount = price_value - cost_value
+    return {
+        "profit_margin": f"{amount / price_value * 100:.2f}",
+        "profit_amount": f"{amount:.2f}",
+    }
+
+LISTING_FIELDS = ("title", "description", "photo", "price", "cost")
+
+def read_listing_rows(data: bytes, filename: str) -> list:
+    """Parse an uploaded CSV or JSONL product file into listing input dicts.
+    Unknown columns are ignored and blank cells become None.
+    """
+    text = data.decode("utf-8-sig")
+    if filename.lower().endswith((".jsonl", ".ndjson")):
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        records = list(csv.DictReader(io.StringIO(text)))
+
+    rows = []
+    for record in records:
+        normalized = {str(k).strip().lower(): v for k, v in record.items() if k}
+        rows.append({
+            field: (str(normalized[field]).strip() or None) if normalized.get(field) is not None else None
+            for field in LISTING_FIELDS
+        })
+    return rows
@@ -0,0 +1,225 @@
+"""Uploaded product photo pipeline.
+
+Uploads are decoded straight to a small thumbnail (JPEG draft mode lets the
+decoder skip most of the full-resolution pixels) on a small shared worker
+pool, so decoding stays off the request thread and the number of images held
+in memory at once is bounded process-wide, whatever the number of sessions.
+Oversized uploads and decompression bombs are rejected before decoding.
+
+Each photo gets a 64-bit difference hash (dHash) and a compact text
+description (orientation, dominant colours, brightness) that goes into the
+listing prompt in place of the bare filename. `PhotoStore` keeps generated
+listings keyed by that hash: a re-upload of the same or a near-duplicate
+photo (small Hamming distance, e.g. re-encoded or resized) with the same
+title is answered from the store instead of a new generation.
+"""
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from src.common.custom_exception import CustomException
+from src.common.metrics import registry
+from src.utils.helpers import slugify
+from src.utils.shared import SQLiteConnections, shared_instance
+
+# Reference palette for naming dominant colours in the prompt.
+PALETTE = {
+    "black": (20, 20, 20), "charcoal grey": (70, 70, 70), "grey": (128, 128, 128), "silver": (192, 192, 192),
+    "white": (245, 245, 245), "cream": (240, 228, 200), "beige": (210, 190, 150), "brown": (120, 75, 40),
+    "terracotta": (190, 90, 50), "red": (200, 30, 40), "maroon": (110, 20, 30), "orange": (235, 130, 30),
+    "gold": (210, 170, 50), "yellow": (240, 220, 60), "olive": (110, 110, 40), "green": (50, 140, 60),
+    "teal": (30, 130, 130), "turquoise": (60, 200, 200), "blue": (40, 80, 190), "indigo": (50, 40, 120),
+    "purple": (120, 60, 150), "pink": (230, 140, 170),
+}
+
+
+@dataclass
+class PhotoInfo:
+    filename: str
+    phash: int
+    width: int
+    height: int
+    features: str
+
+    @property
+    def hash_hex(self) -> str:
+        return f"{self.phash:016x}"
+
+    def __str__(self) -> str:
+        # Used as the "Photo info" of the listing prompts.
+        return f"{self.features} (file: {self.filename})" if self.filename else self.features
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def dhash(image) -> int:
+    """64-bit difference hash: brightness gradients of a 9x8 grayscale thumbnail."""
+    from PIL import Image
+
+    small = image.convert("L").resize((9, 8), Image.BILINEAR)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] < pixels[row * 9 + col + 1])
+    return value
+
+
+def _colour_name(rgb) -> str:
+    return min(PALETTE, key=lambda name: sum((a - b) ** 2 for a, b in zip(PALETTE[name], rgb)))
+
+
+def describe(image) -> str:
+    """Compact, prompt-friendly features of a thumbnail."""
+    from PIL import ImageStat
+
+    width, height = image.size
+    ratio = width / height
+    shape = "square" if 0.9 <= ratio <= 1.1 else ("landscape" if ratio > 1 else "portrait")
+
+    colours = []
+    quantized = image.quantize(colors=4)
+    palette = quantized.getpalette()
+    total = width * height
+    for count, index in sorted(quantized.getcolors(), reverse=True):
+        name = _colour_name(palette[index * 3:index * 3 + 3])
+        if count / total >= 0.1 and name not in colours:
+            colours.append(name)
+
+    brightness = ImageStat.Stat(image.convert("L")).mean[0]
+    tone = "bright" if brightness > 170 else ("dark" if brightness < 85 else "medium-lit")
+    return f"{shape} product photo, dominant colours: {', '.join(colours[:3]) or 'mixed'}; {tone}"
+
+
+def check_photo_size(size: int, max_bytes: int = None):
+    """Reject an upload by its declared size, before its bytes are read."""
+    if max_bytes is None:
+        from src.config.setting import settings
+
+        max_bytes = settings.PHOTO_MAX_BYTES
+    if size > max_bytes:
+        raise CustomException(f"Photo is larger than {max_bytes // (1024 * 1024)} MB")
+
+
+def analyze_photo(data: bytes, filename: str = "", max_side: int = 512, max_bytes: int = 10 * 1024 * 1024,
+                  max_pixels: int = 50_000_000) -> PhotoInfo:
+    """Decode, downscale, hash and describe one uploaded photo (runs on the calling thread)."""
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    check_photo_size(len(data), max_bytes)
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width * image.height > max_pixels:
+                raise CustomException("Photo resolution is too large")
+            image.draft("RGB", (max_side, max_side))
+            image = ImageOps.exif_transpose(image).convert("RGB")
+            image.thumbnail((max_side, max_side))
+    except (UnidentifiedImageError, OSError) as e:
+        raise CustomException("Could not read the uploaded photo", e)
+    info = PhotoInfo(filename, dhash(image), image.width, image.height, describe(image))
+    image.close()
+    return info
+
+
+@shared_instance
+def _get_executor() -> ThreadPoolExecutor:
+    from src.config.setting import settings
+
+    return ThreadPoolExecutor(max_workers=settings.PHOTO_WORKERS, thread_name_prefix="photo")
+
+
+def submit_photo(data: bytes, filename: str = "") -> Future:
+    """Start `analyze_photo` on the shared photo worker pool, sized by `Settings.PHOTO_WORKERS`."""
+    from src.config.setting import settings
+
+    return _get_executor().submit(
+        analyze_photo, data, filename, settings.PHOTO_MAX_SIDE, settings.PHOTO_MAX_BYTES, settings.PHOTO_MAX_PIXELS
+    )
+
+
+def process_photo(data: bytes, filename: str = "", timeout: float = 30) -> PhotoInfo:
+    """`submit_photo` and wait for the result."""
+    return submit_photo(data, filename).result(timeout=timeout)
+
+
+class PhotoStore:
+    """Listings keyed by (photo hash, title), with near-duplicate photo matching."""
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 5000, max_distance: int = 6):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._entries = OrderedDict()  # (phash, title key) -> listing
+        self._lock = threading.Lock()
+        self._db = SQLiteConnections(db_path) if db_path else None
+        if db_path:
+            self._load()
+
+    def _load(self):
+        with self._db.connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS photo_listings ("
+                "phash TEXT NOT NULL, title TEXT NOT NULL, listing TEXT NOT NULL, updated REAL NOT NULL, "
+                "PRIMARY KEY (phash, title))"
+            )
+            rows = conn.execute(
+                "SELECT phash, title, listing FROM photo_listings ORDER BY updated DESC LIMIT ?", (self.max_entries,)
+            ).fetchall()
+        with self._lock:
+            for phash, title, listing in reversed(rows):
+                self._insert((int(phash, 16), title), json.loads(listing))
+
+    def _insert(self, key: tuple, listing: dict):
+        self._entries[key] = listing
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def add(self, photo: PhotoInfo, title: str, listing: dict):
+        key = (photo.phash, slugify(title or ""))
+        with self._lock:
+            self._insert(key, listing)
+        if self.db_path:
+            with self._db.connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO photo_listings (phash, title, listing, updated) VALUES (?, ?, ?, ?)",
+                    (photo.hash_hex, key[1], json.dumps(listing, ensure_ascii=False), time.time()),
+                )
+
+    def lookup(self, photo: PhotoInfo, title: str) -> Optional[dict]:
+        """Stored listing for this photo (or its closest near-duplicate) and title, else None."""
+        title_key = slugify(title or "")
+        with self._lock:
+            key = (photo.phash, title_key)
+            match = self._entries.get(key)
+            if match is None:
+                best = self.max_distance + 1
+                for (phash, stored_title), listing in self._entries.items():
+                    if stored_title == title_key and hamming(phash, photo.phash) < best:
+                        key, match, best = (phash, stored_title), listing, hamming(phash, photo.phash)
+            if match is not None:
+                self._entries.move_to_end(key)
+        registry.inc("talentbridge_photo_lookups_total", result="hit" if match else "miss")
+        return dict(match) if match is not None else None
+
+    def __len__(self):
+        return len(self._entries)
+
+
+@shared_instance
+def get_photo_store() -> PhotoStore:
+    """Process-wide store built from `Settings`."""
+    from src.config.setting import settings
+
+    return PhotoStore(
+        db_path=settings.PHOTO_DB_PATH or None,
+        max_entries=settings.PHOTO_MAX_ENTRIES,
+        max_distance=settings.PHOTO_MATCH_DISTANCE,
+    )
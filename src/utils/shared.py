@@ -0,0 +1,74 @@
+"""Process-wide and per-thread resources.
+
+`shared_instance` turns a builder function into the process-wide getter used
+by every `get_*()` in the app: the object is built on first use, under a lock,
+and the same instance is returned afterwards. A builder that returns None
+(feature disabled in `Settings`) is simply asked again on the next call.
+
+`SQLiteConnections` hands each thread its own connection to one database file
+(sqlite3 connections must not be shared across threads), opened in WAL mode so
+readers do not block the writer, or opened read-only for tools that only
+inspect a database another process owns.
+"""
+import functools
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+
+class SharedInstance:
+    def __init__(self, build: Callable[[], Any]):
+        self._build = build
+        self._instance = None
+        self._lock = threading.Lock()
+        functools.update_wrapper(self, build)
+
+    def __call__(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._build()
+                instance = self._instance
+        return instance
+
+    def set(self, instance):
+        """Replace the shared instance (e.g. with a stubbed one in benchmarks); None rebuilds it on next use."""
+        with self._lock:
+            self._instance = instance
+
+
+def shared_instance(build: Callable[[], Any]) -> SharedInstance:
+    """Decorator: build the returned object once per process, on first call."""
+    return SharedInstance(build)
+
+
+class SQLiteConnections:
+    """One WAL-mode connection per thread to `db_path`; the parent directory is created if needed.
+    With `read_only` the existing file is opened with `mode=ro` instead and nothing is created.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 10, autocommit: bool = False, read_only: bool = False):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.read_only = read_only
+        # Autocommit connections leave transactions to explicit BEGIN IMMEDIATE ... COMMIT.
+        self.isolation_level = None if autocommit else ""
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory and not read_only:
+            os.makedirs(directory, exist_ok=True)
+
+    def connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.read_only:
+                uri = f"{Path(self.db_path).absolute().as_uri()}?mode=ro"
+                conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, isolation_level=self.isolation_level)
+            else:
+                conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=self.isolation_level)
+                conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
@@ -0,0 +1,260 @@
+"""Stream generated listings into Shopify product CSV or JSONL files.
+
+Listings are read from any iterable (listing dicts, `FullListingSchema`s,
+`(input params, listing)` pairs, a JSONL file or the job store) and written
+one row at a time, so memory use stays flat however large the catalog is.
+Output can be split into numbered files by row count and size (Shopify's
+CSV import accepts files up to 15 MB).
+
+- CSV follows Shopify's product import template. Metafields get one
+  `Name (product.metafields.custom.<key>)` column per key in `metafield_keys`;
+  the column set must be fixed before the first row is written, so other keys
+  are only kept in the JSONL output.
+- JSONL has one `{"input": ProductSetInput}` object per line, ready for a
+  `productSet` bulk mutation, with every metafield typed.
+
+Products are exported as drafts. Handles are the slugified title plus a short
+hash of the listing input, so re-exports of the same input update the same
+product while products with equal titles do not collide.
+
+Usage::
+
+    python -m src.utils.shopify_export --from-jobs --format csv --out exports/
+    python -m src.utils.shopify_export --input listings.jsonl --format jsonl > products.jsonl
+"""
+import argparse
+import csv
+import hashlib
+import html
+import io
+import json
+import os
+import sys
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.helpers import parse_price, slugify
+
+DEFAULT_METAFIELD_KEYS = ("material", "care_instructions", "origin")
+CSV_COLUMNS = [
+    "Handle", "Title", "Body (HTML)", "Vendor", "Type", "Tags", "Published", "Option1 Name", "Option1 Value",
+    "Variant Price", "Cost per item", "SEO Title", "SEO Description", "Status",
+]
+
+
+def to_record(item) -> Tuple[dict, dict]:
+    """Normalize an export source item to (input params, listing dict)."""
+    if isinstance(item, tuple):
+        params, listing = item
+    elif hasattr(item, "model_dump"):
+        params, listing = {}, item.model_dump()
+    elif "listing" in item:
+        params, listing = item.get("input") or {}, item["listing"]
+    else:
+        # A flat listing dict may carry its own title/price/cost.
+        params, listing = item, item
+    return dict(params or {}), dict(listing or {})
+
+
+def parse_metafields(value) -> dict:
+    if isinstance(value, dict):
+        return value
+    try:
+        parsed = json.loads(value or "{}")
+    except (TypeError, ValueError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def metafield_key(name: str) -> str:
+    return slugify(str(name)).replace("-", "_")[:64]
+
+
+def typed_metafield(key: str, value) -> dict:
+    """Shopify metafield input with a type inferred from the JSON value."""
+    if isinstance(value, bool):
+        kind, value = "boolean", "true" if value else "false"
+    elif isinstance(value, int):
+        kind, value = "number_integer", str(value)
+    elif isinstance(value, float):
+        kind, value = "number_decimal", str(value)
+    elif isinstance(value, (dict, list)):
+        kind, value = "json", json.dumps(value, ensure_ascii=False)
+    else:
+        value = str(value)
+        kind = "multi_line_text_field" if "\n" in value else "single_line_text_field"
+    return {"namespace": "custom", "key": metafield_key(key), "type": kind, "value": value}
+
+
+def _handle(params: dict, listing: dict) -> str:
+    title = params.get("title") or listing.get("seo_title") or "product"
+    digest = hashlib.sha1(json.dumps([params.get("title"), params.get("description"), listing.get("seo_title")],
+                                     ensure_ascii=False).encode("utf-8")).hexdigest()
+    return f"{slugify(title)[:80] or 'product'}-{digest[:6]}"
+
+
+def _body_html(description: str) -> str:
+    paragraphs = [p.strip() for p in (description or "").split("\n\n") if p.strip()]
+    return "".join(f"<p>{html.escape(p).replace(chr(10), '<br>')}</p>" for p in paragraphs)
+
+
+def _price(params: dict, listing: dict) -> Optional[str]:
+    value = parse_price(params.get("price")) or parse_price(listing.get("market_price"))
+    return f"{value:.2f}" if value is not None else None
+
+
+def _seo_description(description: str) -> str:
+    text = " ".join((description or "").split())
+    return text if len(text) <= 320 else text[:317].rsplit(" ", 1)[0] + "..."
+
+
+def shopify_product(params: dict, listing: dict, vendor: str = "") -> dict:
+    """ProductSetInput for one listing."""
+    metafields = [typed_metafield(key, value) for key, value in parse_metafields(listing.get("metafields")).items()
+                  if metafield_key(key)]
+    if listing.get("category"):
+        metafields.append(typed_metafield("marketplace_category", listing["category"]))
+    variant = {"optionValues": [{"optionName": "Title", "name": "Default Title"}]}
+    price = _price(params, listing)
+    if price is not None:
+        variant["price"] = price
+    cost = parse_price(params.get("cost"))
+    if cost is not None:
+        variant["inventoryItem"] = {"cost": f"{cost:.2f}"}
+    product = {
+        "handle": _handle(params, listing),
+        "title": listing.get("seo_title") or params.get("title") or "",
+        "descriptionHtml": _body_html(listing.get("description")),
+        "productType": listing.get("product_type") or "",
+        "tags": [tag for tag in listing.get("tags") or [] if tag],
+        "status": "DRAFT",
+        "seo": {"title": listing.get("seo_title") or "", "description": _seo_description(listing.get("description"))},
+        "metafields": metafields,
+        "productOptions": [{"name": "Title", "values": [{"name": "Default Title"}]}],
+        "variants": [variant],
+    }
+    if vendor:
+        product["vendor"] = vendor
+    return product
+
+
+def csv_columns(metafield_keys: Iterable[str]) -> List[str]:
+    return CSV_COLUMNS + [
+        f"{key.replace('_', ' ').title()} (product.metafields.custom.{metafield_key(key)})" for key in metafield_keys
+    ]
+
+
+def csv_row(params: dict, listing: dict, metafield_keys: Iterable[str], vendor: str = "") -> list:
+    product = shopify_product(params, listing, vendor)
+    variant = product["variants"][0]
+    values = {field["key"]: field["value"] for field in product["metafields"]}
+    return [
+        product["handle"], product["title"], product["descriptionHtml"], vendor, product["productType"],
+        ", ".join(product["tags"]), "FALSE", "Title", "Default Title", variant.get("price", ""),
+        variant.get("inventoryItem", {}).get("cost", ""), product["seo"]["title"], product["seo"]["description"],
+        "draft",
+    ] + [values.get(metafield_key(key), "") for key in metafield_keys]
+
+
+def iter_csv(items: Iterable, metafield_keys: Iterable[str] = DEFAULT_METAFIELD_KEYS, vendor: str = "",
+             header: bool = True) -> Iterator[str]:
+    """Yield the CSV text line by line (header first)."""
+    metafield_keys = list(metafield_keys)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    if header:
+        writer.writerow(csv_columns(metafield_keys))
+        yield flush()
+    for item in items:
+        writer.writerow(csv_row(*to_record(item), metafield_keys, vendor))
+        yield flush()
+
+
+def iter_jsonl(items: Iterable, vendor: str = "") -> Iterator[str]:
+    """Yield one `{"input": ProductSetInput}` JSON line per listing."""
+    for item in items:
+        yield json.dumps({"input": shopify_product(*to_record(item), vendor)}, ensure_ascii=False) + "\n"
+
+
+def write_chunks(items: Iterable, directory: str, fmt: str = "csv", prefix: str = "products",
+                 rows_per_file: int = 5000, max_bytes: int = 15 * 1024 * 1024,
+                 metafield_keys: Iterable[str] = DEFAULT_METAFIELD_KEYS, vendor: str = "") -> Iterator[str]:
+    """Write numbered files of at most `rows_per_file` rows / `max_bytes` bytes; yields each finished path."""
+    os.makedirs(directory, exist_ok=True)
+    metafield_keys = list(metafield_keys)
+    header = "".join(iter_csv([], metafield_keys)) if fmt == "csv" else ""
+    lines = iter_csv(items, metafield_keys, vendor, header=False) if fmt == "csv" else iter_jsonl(items, vendor)
+
+    part, out, path, rows, size = 0, None, None, 0, 0
+    try:
+        for line in lines:
+            encoded = len(line.encode("utf-8"))
+            if out is not None and (rows >= rows_per_file or size + encoded > max_bytes):
+                out.close()
+                out = None
+                yield path
+            if out is None:
+                part += 1
+                path = os.path.join(directory, f"{prefix}-{part:04d}.{fmt}")
+                out = open(path, "w", encoding="utf-8", newline="")
+                out.write(header)
+                rows, size = 0, len(header.encode("utf-8"))
+            out.write(line)
+            rows += 1
+            size += encoded
+    finally:
+        if out is not None:
+            out.close()
+    if out is not None:
+        yield path
+
+
+def read_jsonl(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="JSONL file of listings")
+    source.add_argument("--from-jobs", action="store_true", help="export every finished listing job")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    parser.add_argument("--out", help="output directory for chunked files (default: stdout)")
+    parser.add_argument("--prefix", default="products")
+    parser.add_argument("--rows-per-file", type=int, default=5000)
+    parser.add_argument("--max-mb", type=float, default=15)
+    parser.add_argument("--metafield-keys", default=",".join(DEFAULT_METAFIELD_KEYS),
+                        help="comma-separated metafield keys given their own CSV column")
+    parser.add_argument("--vendor", default="")
+    args = parser.parse_args(argv)
+
+    if args.from_jobs:
+        from src.config.setting import settings
+        from src.jobs.queue import JobQueue
+
+        # Read-only use of the job store: opened with mode=ro, no handlers, no workers started.
+        items = JobQueue({}, db_path=settings.JOB_DB_PATH, read_only=True).iter_results("listing")
+    else:
+        items = read_jsonl(args.input)
+    keys = [key.strip() for key in args.metafield_keys.split(",") if key.strip()]
+
+    if args.out:
+        for path in write_chunks(items, args.out, args.format, args.prefix, args.rows_per_file,
+                                 int(args.max_mb * 1024 * 1024), keys, args.vendor):
+            print(path, file=sys.stderr)
+    else:
+        lines = iter_csv(items, keys, args.vendor) if args.format == "csv" else iter_jsonl(items, args.vendor)
+        sys.stdout.writelines(lines)
+
+
+if __name__ == "__main__":
+    main()
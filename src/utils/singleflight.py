@@ -0,0 +1,219 @@
+"""Single-flight coalescing: concurrent calls with the same key share one execution.
+
+The first caller runs the function; callers arriving while it is in flight
+wait and receive the same result (or exception). Works for threads (`do`), for
+asyncio tasks on the same event loop (`ado`) and for streamed results
+(`stream`, `astream`), where every caller receives every chunk of one shared
+iteration.
+"""
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import AsyncIterator, Awaitable, Callable, Iterator
+
+from src.common.metrics import registry
+
+
+def flight_key(namespace: str, *parts) -> str:
+    """Key free-text request parts so inputs differing only in case or whitespace share a flight.
+    The text is hashed rather than slugified, so non-Latin product names keep distinct keys.
+    """
+    text = "\x1f".join(" ".join(str(part).casefold().split()) for part in parts)
+    return f"{namespace}:{hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]}"
+
+
+class _SharedStream:
+    def __init__(self, source: Iterator):
+        self.source = source
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.driving = False  # a consumer is inside next(source)
+        self.consumers = 0
+        self.cond = threading.Condition()
+
+
+class _SharedAsyncStream:
+    def __init__(self, source: AsyncIterator):
+        self.source = source
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.consumers = 0
+        self.cond = asyncio.Condition()
+        self.task = None
+
+
+class SingleFlight:
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._calls = {}
+        self._async_calls = {}
+        self._streams = {}
+        self._async_streams = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable, timeout: float = None):
+        """Run `fn` or wait for the identical call in flight; a follower waits at most `timeout`
+        seconds (then `TimeoutError`), the leader is bounded only by `fn` itself.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        registry.inc("talentbridge_singleflight_total", group=self.name, role="leader" if leader else "follower")
+        if not leader:
+            return future.result(timeout)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable]):
+        loop = asyncio.get_running_loop()
+        task = self._async_calls.get((loop, key))
+        leader = task is None
+        if leader:
+            task = self._async_calls[(loop, key)] = loop.create_task(fn())
+            task.add_done_callback(lambda _: self._async_calls.pop((loop, key), None))
+        registry.inc("talentbridge_singleflight_total", group=self.name, role="leader" if leader else "follower")
+        # Shield so one waiter being cancelled does not cancel the shared call for the others.
+        return await asyncio.shield(task)
+
+    def stream(self, key: str, fn: Callable[[], Iterator]) -> Iterator:
+        """Iterate `fn()` once for all concurrent callers with the same key.
+
+        Every caller receives every chunk from the start, at its own pace. Whichever
+        caller needs a chunk not received yet pulls it from the source, so the stream
+        goes on when the first caller stops early; the source is closed once no caller
+        is left.
+        """
+        with self._lock:
+            shared = self._streams.get(key)
+            leader = shared is None
+            if leader:
+                shared = self._streams[key] = _SharedStream(iter(fn()))
+            shared.consumers += 1
+        registry.inc("talentbridge_singleflight_total", group=self.name, role="leader" if leader else "follower")
+        return self._consume(key, shared)
+
+    def _consume(self, key: str, shared: _SharedStream) -> Iterator:
+        index = 0
+        try:
+            while True:
+                drive = False
+                with shared.cond:
+                    while index >= len(shared.chunks) and not shared.done and shared.driving:
+                        shared.cond.wait()
+                    if index < len(shared.chunks):
+                        chunk = shared.chunks[index]
+                        index += 1
+                    elif shared.done:
+                        if shared.error is not None:
+                            raise shared.error
+                        return
+                    else:
+                        shared.driving = drive = True
+                if drive:
+                    self._pull(key, shared)
+                else:
+                    yield chunk
+        finally:
+            with self._lock:
+                shared.consumers -= 1
+                abandoned = shared.consumers == 0 and not shared.done
+                if abandoned and self._streams.get(key) is shared:
+                    del self._streams[key]
+            if abandoned and hasattr(shared.source, "close"):
+                shared.source.close()
+
+    def _pull(self, key: str, shared: _SharedStream):
+        """Fetch the next chunk for every consumer (called by the consumer that set `driving`)."""
+        error = None
+        try:
+            chunk = next(shared.source)
+        except StopIteration:
+            finished = True
+        except BaseException as e:
+            finished, error = True, e
+        else:
+            finished = False
+        if finished:
+            with self._lock:
+                if self._streams.get(key) is shared:
+                    del self._streams[key]
+        with shared.cond:
+            if finished:
+                shared.done, shared.error = True, error
+            else:
+                shared.chunks.append(chunk)
+            shared.driving = False
+            shared.cond.notify_all()
+
+    def astream(self, key: str, fn: Callable[[], AsyncIterator]) -> AsyncIterator:
+        """Async counterpart of `stream` for tasks on the same event loop.
+
+        The source is iterated by a task of its own rather than by one of the callers,
+        so a caller being cancelled does not cancel the stream for the others; that
+        task is cancelled once no caller is left.
+        """
+        loop = asyncio.get_running_loop()
+        shared = self._async_streams.get((loop, key))
+        leader = shared is None
+        if leader:
+            shared = self._async_streams[(loop, key)] = _SharedAsyncStream(fn())
+            shared.task = loop.create_task(self._apump((loop, key), shared))
+        shared.consumers += 1
+        registry.inc("talentbridge_singleflight_total", group=self.name, role="leader" if leader else "follower")
+        return self._aconsume((loop, key), shared)
+
+    async def _aconsume(self, flight: tuple, shared: _SharedAsyncStream) -> AsyncIterator:
+        index = 0
+        try:
+            while True:
+                async with shared.cond:
+                    await shared.cond.wait_for(lambda: index < len(shared.chunks) or shared.done)
+                    if index < len(shared.chunks):
+                        chunk = shared.chunks[index]
+                        index += 1
+                    elif shared.error is not None:
+                        raise shared.error
+                    else:
+                        return
+                yield chunk
+        finally:
+            shared.consumers -= 1
+            if shared.consumers == 0 and not shared.done:
+                if self._async_streams.get(flight) is shared:
+                    del self._async_streams[flight]
+                shared.task.cancel()
+
+    async def _apump(self, flight: tuple, shared: _SharedAsyncStream):
+        error = None
+        try:
+            async for chunk in shared.source:
+                async with shared.cond:
+                    shared.chunks.append(chunk)
+                    shared.cond.notify_all()
+        except asyncio.CancelledError:
+            pass  # abandoned by every caller
+        except Exception as e:
+            error = e
+        finally:
+            if self._async_streams.get(flight) is shared:
+                del self._async_streams[flight]
+            if hasattr(shared.source, "aclose"):
+                await shared.source.aclose()
+            async with shared.cond:
+                shared.done, shared.error = True, error
+                shared.cond.notify_all()
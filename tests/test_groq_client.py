@@ -0,0 +1,295 @@
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.mock_llm_server import MockConfig, MockLLMServer
+from src.common.custom_exception import CustomException
+from src.common.metrics import registry
+from src.llm.groq_client import GroqClient
+from src.llm.resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+from src.llm.response_cache import ResponseCache
+
+
+class ScriptedConfig(MockConfig):
+    """Mock server config whose next requests can be scripted: each request takes the next of
+    `latencies` (then `latency_ms`), and the next `failures` requests are answered with HTTP 503.
+    """
+
+    def __init__(self, **kwargs):
+        self.latencies = []
+        self.failures = 0
+        super().__init__(**kwargs)
+
+    @property
+    def latency_ms(self):
+        return self.latencies.pop(0) if self.latencies else self._latency_ms
+
+    @latency_ms.setter
+    def latency_ms(self, value):
+        self._latency_ms = value
+
+    @property
+    def error_rate(self):
+        if self.failures:
+            self.failures -= 1
+            return 1.0
+        return self._error_rate
+
+    @error_rate.setter
+    def error_rate(self, value):
+        self._error_rate = value
+
+
+@pytest.fixture
+def server():
+    server = MockLLMServer(ScriptedConfig(latency_ms=20, latency_sigma=0, tokens_per_second=0))
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_client(server):
+    clients = []
+
+    def make(timeout=5.0, max_retries=0, breaker=None, hedge_after=0, **kwargs):
+        clients.append(GroqClient(
+            api_key="test", api_url=server.url, timeout=timeout,
+            retry_policy=RetryPolicy(max_retries=max_retries, base_delay=0.01, max_delay=0.01),
+            breaker=breaker or CircuitBreaker(failure_threshold=100, reset_timeout=60),
+            hedge_after=hedge_after, **kwargs,
+        ))
+        return clients[-1]
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def timed(fn, *args, **kwargs):
+    started = time.monotonic()
+    try:
+        return fn(*args, **kwargs), time.monotonic() - started
+    except CustomException as e:
+        return e, time.monotonic() - started
+
+
+def test_session_is_pooled_and_reused(server, make_client):
+    client = make_client(pool_size=3)
+
+    for _ in range(5):
+        client.generate_text("story", use_cache=False)
+
+    assert client.session is client.session
+    assert client.session.headers["Authorization"] == "Bearer test"
+    adapter = client.session.get_adapter(server.url)
+    assert adapter._pool_maxsize == 3
+    pools = adapter.poolmanager.pools
+    assert len(pools) == 1
+    assert pools[next(iter(pools.keys()))].num_connections == 1
+
+
+def test_async_client_is_reused_within_a_loop(make_client):
+    client = make_client()
+
+    async def clients():
+        await client.agenerate_text("story", use_cache=False)
+        first = client._async_client
+        await client.agenerate_text("story", use_cache=False)
+        second = client._async_client
+        await client.aclose()
+        return first, second
+
+    first, second = asyncio.run(clients())
+
+    assert first is not None and first is second
+
+
+def test_cached_completion_skips_the_request(server, make_client):
+    cache = ResponseCache()
+    client = make_client(cache=cache)
+    text = client.generate_text("story")
+
+    server.config.error_rate = 1.0
+    assert client.generate_text("story") == text
+    assert asyncio.run(client.agenerate_text("story")) == text
+    assert "".join(client.stream_text("story")) == text
+    assert isinstance(timed(client.generate_text, "story", use_cache=False)[0], CustomException)
+    assert cache.get_stats()["hits"] == 3
+
+
+def test_retry_after_is_parsed_from_seconds_and_dates():
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert RetryPolicy(base_delay=0.01, max_delay=0.01).backoff(0, retry_after=2.0) == 2.0
+
+
+def test_retries_wait_for_retry_after_then_succeed(server, make_client):
+    server.config.failures, server.config.retry_after = 2, 0.2
+    client = make_client(max_retries=3)
+
+    text, elapsed = timed(client.generate_text, "Tell the artisan's story", use_cache=False)
+
+    assert text.startswith("Rooted in generations of craft")
+    assert elapsed >= 0.4
+
+
+def test_gives_up_after_max_retries(server, make_client):
+    server.config.error_rate, server.config.retry_after = 1.0, 0.05
+    client = make_client(max_retries=2)
+
+    error, elapsed = timed(client.generate_text, "story", use_cache=False)
+
+    assert isinstance(error, CustomException) and "HTTP 503" in str(error)
+    assert elapsed >= 0.1
+
+
+def test_retry_after_beyond_the_deadline_fails_without_sleeping(server, make_client):
+    server.config.error_rate, server.config.retry_after = 1.0, 5
+    client = make_client(timeout=1.0, max_retries=3)
+
+    error, elapsed = timed(client.generate_text, "story", use_cache=False)
+
+    assert isinstance(error, CustomException) and "HTTP 503" in str(error)
+    assert elapsed < 0.5
+
+
+def test_slow_upstream_runs_out_the_deadline(server, make_client):
+    server.config.latency_ms = 2000
+    client = make_client(timeout=0.3, max_retries=3)
+
+    error, elapsed = timed(client.generate_text, "story", use_cache=False)
+
+    assert isinstance(error, CustomException)
+    assert elapsed < 1.0
+
+
+def test_breaker_opens_then_half_opens_and_closes(server, make_client):
+    server.config.error_rate = 1.0
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.3)
+    client = make_client(breaker=breaker)
+
+    for _ in range(2):
+        assert isinstance(timed(client.generate_text, "story", use_cache=False)[0], CustomException)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    server.config.latency_ms = 500
+    error, elapsed = timed(client.generate_text, "story", use_cache=False)
+    assert "circuit open" in str(error)
+    assert elapsed < 0.2
+
+    time.sleep(0.3)
+    server.config.error_rate, server.config.latency_ms = 0.0, 20
+    text, _ = timed(client.generate_text, "story", use_cache=False)
+    assert text.startswith("Rooted")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_half_open_trial_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.05)
+
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.is_open()
+
+
+def test_release_frees_the_half_open_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.05)
+
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_cancelled_half_open_trial_is_released(server, make_client):
+    server.config.latency_ms = 2000
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    client = make_client(breaker=breaker)
+    breaker.record_failure()
+    time.sleep(0.05)
+
+    async def cancel_trial():
+        task = asyncio.ensure_future(client.agenerate_text("story", use_cache=False))
+        await asyncio.sleep(0.1)
+        assert not breaker.allow()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await client.aclose()
+
+    asyncio.run(cancel_trial())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_hedged_request_wins_over_a_slow_one(server, make_client):
+    server.config.latencies = [1500]
+    client = make_client(hedge_after=0.15)
+
+    text, elapsed = timed(client.generate_text, "story", use_cache=False)
+
+    assert text.startswith("Rooted")
+    assert elapsed < 1.0
+
+
+def test_async_hedge_cancels_the_slow_request(server, make_client):
+    server.config.latencies = [1500]
+    client = make_client(hedge_after=0.15)
+
+    async def hedged():
+        attempts = []
+        apost = client._apost
+        client._apost = lambda *args: attempts.append(asyncio.ensure_future(apost(*args))) or attempts[-1]
+        text = await client.agenerate_text("story", use_cache=False)
+        await asyncio.wait(attempts, timeout=0.5)
+        await client.aclose()
+        return text, attempts
+
+    (text, attempts), elapsed = timed(asyncio.run, hedged())
+
+    assert text.startswith("Rooted")
+    assert len(attempts) == 2
+    assert sorted(task.cancelled() for task in attempts) == [False, True]
+    assert elapsed < 1.0
+
+
+def test_identical_async_streams_share_one_request(server, make_client):
+    server.config.latency_ms = 200
+    client = make_client()
+    followers = lambda: registry.get_counter("talentbridge_singleflight_total", group="llm", role="follower")
+    before = followers()
+
+    async def stream(use_cache):
+        return "".join([chunk async for chunk in client.astream_text("story", use_cache=use_cache)])
+
+    async def main():
+        shared = await asyncio.gather(stream(True), stream(True))
+        fresh = await asyncio.gather(stream(False), stream(False))
+        await client.aclose()
+        return shared, fresh
+
+    shared, fresh = asyncio.run(main())
+
+    assert shared[0] == shared[1] and shared[0].startswith("Rooted")
+    assert fresh[0] == fresh[1] == shared[0]
+    assert followers() == before + 1
+
+
+def test_zero_timeout_is_not_replaced_by_the_default(server, make_client):
+    server.config.latency_ms = 500
+    client = make_client(timeout=30)
+
+    error, elapsed = timed(client.generate_text, "story", use_cache=False, timeout=0)
+
+    assert "deadline exceeded" in str(error)
+    assert elapsed < 0.1
@@ -0,0 +1,158 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.common.custom_exception import CustomException
+from src.jobs.queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+
+
+class Handler:
+    """Job handler counting its runs; blocks while `gate` is cleared."""
+
+    def __init__(self):
+        self.error = None
+        self.runs = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, params):
+        self.runs.append(params)
+        self.gate.wait(5)
+        if self.error:
+            raise self.error
+        return {"echo": params}
+
+
+@pytest.fixture
+def handler():
+    return Handler()
+
+
+@pytest.fixture
+def make_queue(tmp_path, handler):
+    queues = []
+
+    def make(**kwargs):
+        kwargs.setdefault("poll_interval", 0.02)
+        queues.append(JobQueue({"echo": handler}, db_path=str(tmp_path / "jobs.sqlite3"), workers=2, **kwargs))
+        return queues[-1]
+
+    yield make
+    for queue in queues:
+        queue.stop(timeout=5)
+
+
+def test_job_runs_and_keeps_its_result(make_queue, handler):
+    queue = make_queue().start()
+
+    job = queue.wait(queue.submit("echo", {"title": "vase"}), timeout=5)
+
+    assert job.status == DONE
+    assert job.result == {"echo": {"title": "vase"}}
+    assert handler.runs == [{"title": "vase"}]
+
+
+def test_unknown_kind_is_rejected(make_queue):
+    with pytest.raises(CustomException):
+        make_queue().submit("missing", {})
+
+
+def test_identical_submissions_are_deduplicated(make_queue, handler):
+    queue = make_queue()
+
+    queued = queue.submit("echo", {"title": "vase", "price": "100"})
+    assert queue.submit("echo", {"price": "100", "title": "vase"}) == queued
+    assert queue.submit("echo", {"title": "bowl", "price": "100"}) != queued
+
+    queue.start()
+    queue.wait(queued, timeout=5)
+    assert queue.submit("echo", {"title": "vase", "price": "100"}) == queued
+    assert handler.runs.count({"title": "vase", "price": "100"}) == 1
+
+
+def test_fresh_submission_bypasses_finished_jobs(make_queue, handler):
+    queue = make_queue().start()
+    first = queue.submit("echo", {"title": "vase"})
+    queue.wait(first, timeout=5)
+
+    fresh = queue.submit("echo", {"title": "vase"}, dedupe=False)
+
+    assert fresh != first
+    assert queue.wait(fresh, timeout=5).status == DONE
+    assert len(handler.runs) == 2
+
+
+def test_fresh_submission_joins_an_identical_job_in_flight(make_queue, handler):
+    handler.gate.clear()
+    queue = make_queue().start()
+    running = queue.submit("echo", {"title": "vase"})
+    while queue.get(running).status != RUNNING:
+        time.sleep(0.01)
+
+    assert queue.submit("echo", {"title": "vase"}, dedupe=False) == running
+    handler.gate.set()
+
+
+def test_failed_jobs_are_retried_on_resubmit(make_queue, handler):
+    handler.error = ValueError("upstream down")
+    queue = make_queue()
+    failed = queue.submit("echo", {"title": "vase"})
+    queue._run_one()
+
+    job = queue.get(failed)
+    assert job.status == FAILED and job.error == "upstream down"
+    assert queue.submit("echo", {"title": "vase"}) != failed
+
+
+def test_job_of_a_dead_worker_is_requeued_after_its_lease(make_queue, handler):
+    crashed = make_queue(lease_seconds=0.2)
+    job_id = crashed.submit("echo", {"title": "vase"})
+    assert crashed._claim().id == job_id  # claimed, then the worker "dies"
+
+    queue = make_queue(lease_seconds=0.2)
+    assert queue._claim() is None
+    assert queue.get(job_id).status == RUNNING
+
+    time.sleep(0.25)
+    queue.start()
+    assert queue.wait(job_id, timeout=5).status == DONE
+    assert len(handler.runs) == 1
+
+
+def test_finished_jobs_are_purged_after_retention(make_queue):
+    queue = make_queue(retention_seconds=0.2)
+    finished = queue.submit("echo", {"title": "vase"})
+    queue._run_one()
+    pending = queue.submit("echo", {"title": "bowl"})
+
+    make_queue(retention_seconds=0.2)
+    assert queue.get(finished).status == DONE
+
+    time.sleep(0.25)
+    make_queue(retention_seconds=0.2)
+    assert queue.get(finished) is None
+    assert queue.get(pending).status == QUEUED
+    assert queue.depth() == 1
+
+
+def test_read_only_store_lists_results_without_purging_or_writing(make_queue, tmp_path):
+    queue = make_queue()
+    finished = queue.submit("echo", {"title": "vase"})
+    queue._run_one()
+    db_path = str(tmp_path / "jobs.sqlite3")
+
+    reader = JobQueue({}, db_path=db_path, retention_seconds=0, read_only=True)
+
+    assert list(reader.iter_results("echo")) == [({"title": "vase"}, {"echo": {"title": "vase"}})]
+    assert queue.get(finished).status == DONE
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        reader._db.connect().execute("DELETE FROM jobs")
+
+
+def test_read_only_store_must_exist(tmp_path):
+    with pytest.raises(CustomException):
+        JobQueue({}, db_path=str(tmp_path / "missing" / "jobs.sqlite3"), read_only=True)
+
+    assert not (tmp_path / "missing").exists()
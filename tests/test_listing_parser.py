@@ -0,0 +1,125 @@
+import json
+
+from src.generator.listing_parser import (
+    EMPTY_LISTING,
+    LISTING_FIELDS,
+    extract_json_array,
+    extract_json_object,
+    get_parse_stats,
+    merge_repair,
+    parse_listing,
+)
+
+LISTING = {
+    "seo_title": "Handmade Terracotta Vase",
+    "description": "A hand-thrown vase.",
+    "category": "Home Decor",
+    "profit": {"profit_margin": "40", "profit_amount": "400"},
+    "market_price": "900-1400",
+    "metafields": "{\"material\": \"terracotta\"}",
+    "product_type": "Vase",
+    "tags": ["handmade", "terracotta"],
+}
+
+
+def test_object_is_extracted_from_a_code_fence_with_prose():
+    text = f"Here is your listing:\n```json\n{json.dumps(LISTING)}\n```\nLet me know if you need changes."
+
+    assert extract_json_object(text) == LISTING
+
+
+def test_trailing_commas_are_removed():
+    text = '{"seo_title": "Vase", "tags": ["clay", "vase",], "profit": {"profit_margin": "40",},}'
+
+    assert extract_json_object(text) == {"seo_title": "Vase", "tags": ["clay", "vase"],
+                                         "profit": {"profit_margin": "40"}}
+
+
+def test_braces_inside_strings_do_not_end_the_object():
+    text = '{"description": "Shaped like a } and a {", "category": "Home Decor"} trailing {"other": 1}'
+
+    assert extract_json_object(text) == {"description": "Shaped like a } and a {", "category": "Home Decor"}
+
+
+def test_truncated_object_keeps_its_complete_fields():
+    text = json.dumps(LISTING)
+    truncated = text[:text.index('"product_type"') + len('"product_type": "Va')]
+
+    assert extract_json_object(truncated) == {field: LISTING[field] for field in LISTING_FIELDS[:6]}
+
+
+def test_truncated_array_keeps_its_complete_elements():
+    text = '[{"id": 1, "story": "First."}, {"story": "Sec'
+
+    assert extract_json_array(text) == [{"id": 1, "story": "First."}]
+
+
+def test_text_without_json_gives_none():
+    assert extract_json_object("Sorry, I cannot help with that.") is None
+    assert extract_json_object("") is None
+    assert extract_json_array('{"not": "an array"}') is None
+
+
+def test_complete_listing_parses_with_nothing_invalid():
+    valid, invalid = parse_listing(f"```json\n{json.dumps(LISTING)}\n```")
+
+    assert (valid, invalid) == (LISTING, [])
+
+
+def test_fields_are_coerced_to_the_schema_types():
+    listing = dict(LISTING, tags="handmade, terracotta", metafields={"material": "terracotta"},
+                   market_price=900, profit='{"profit_margin": "40"}')
+
+    valid, invalid = parse_listing(json.dumps(listing))
+
+    assert invalid == []
+    assert valid["tags"] == ["handmade", "terracotta"]
+    assert valid["metafields"] == '{"material": "terracotta"}'
+    assert valid["market_price"] == "900"
+    assert valid["profit"] == {"profit_margin": "40"}
+
+
+def test_truncated_listing_reports_the_missing_fields():
+    text = json.dumps(LISTING)
+    valid, invalid = parse_listing(text[:text.index('"metafields"')])
+
+    assert invalid == ["metafields", "product_type", "tags"]
+    assert valid == {field: LISTING[field] for field in LISTING_FIELDS[:5]}
+
+
+def test_unparseable_output_marks_every_field_invalid():
+    before = get_parse_stats()
+
+    valid, invalid = parse_listing("no json here")
+
+    assert valid == {}
+    assert invalid == sorted(LISTING_FIELDS)
+    after = get_parse_stats()
+    assert after["parsed"] == before["parsed"] + 1
+    assert after["parse_failures"] == before["parse_failures"] + 1
+
+
+def test_repair_fills_only_the_invalid_fields():
+    valid = {field: LISTING[field] for field in LISTING_FIELDS[:5]}
+    repair = json.dumps({"metafields": "{}", "product_type": "Vase", "tags": ["clay"], "seo_title": "Ignored"})
+
+    merged, still_invalid = merge_repair(valid, ["metafields", "product_type", "tags"], repair)
+
+    assert still_invalid == []
+    assert merged == dict(valid, metafields="{}", product_type="Vase", tags=["clay"])
+
+
+def test_partial_repair_defaults_the_fields_still_missing():
+    before = get_parse_stats()
+    valid = {field: LISTING[field] for field in LISTING_FIELDS[:5]}
+
+    merged, still_invalid = merge_repair(valid, ["metafields", "product_type", "tags"],
+                                         '```json\n{"product_type": "Vase", "tags": {"bad": 1},')
+
+    assert still_invalid == ["metafields", "tags"]
+    assert merged["product_type"] == "Vase"
+    assert merged["metafields"] == EMPTY_LISTING["metafields"]
+    assert merged["tags"] == EMPTY_LISTING["tags"]
+    after = get_parse_stats()
+    assert after["repairs_attempted"] == before["repairs_attempted"] + 1
+    assert after["repairs_succeeded"] == before["repairs_succeeded"]
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from src.generator.question_generator import ArtisanAssistant
+from src.generator.taxonomy_index import TaxonomyIndex
+from src.utils.photo import PhotoStore
+
+
+class ScriptedLLM:
+    """Stub LLM answering each feature with a fixed completion and recording the calls."""
+
+    def __init__(self, **answers):
+        self.answers = answers
+        self.features = []
+
+    def generate_text(self, prompt, max_tokens=512, use_cache=True, timeout=None, feature=None):
+        self.features.append(feature)
+        return self.answers.get(feature, "")
+
+
+@pytest.fixture
+def taxonomy():
+    return TaxonomyIndex()
+
+
+def make_assistant(llm, taxonomy):
+    return ArtisanAssistant(llm=llm, taxonomy=taxonomy, photos=PhotoStore())
+
+
+def test_feed_without_tags_is_not_remembered(taxonomy):
+    llm = ScriptedLLM(feed="Category: Home Decor\n\nTags: vase, pottery\nRising before Diwali.")
+    assistant = make_assistant(llm, taxonomy)
+
+    assistant.generate_smart_feed("blue pottery vase", fresh=False)
+    assistant.generate_smart_feed("blue pottery vase ", fresh=False)
+
+    assert taxonomy.lookup("blue pottery vase") is None
+    assert llm.features == ["feed", "feed"]
+
+
+def test_feed_labels_and_markdown_are_stripped_before_storing(taxonomy):
+    llm = ScriptedLLM(feed="**Category:** Home Decor\n**Tags:** vase, *clay*, 1. handmade\nRising.")
+    category, tags, report = make_assistant(llm, taxonomy).generate_smart_feed("terracotta vase")
+
+    assert taxonomy.lookup("terracotta vase") == ("Home Decor", ["vase", "clay", "handmade"])
+    assert tags == ["**Tags:** vase", "*clay*", "1. handmade"]
+    assert report == "Rising."
+
+
+def test_known_taxonomy_skips_the_tag_prompt(taxonomy):
+    taxonomy.add("jute basket", "Home Decor", ["jute", "basket"])
+    llm = ScriptedLLM(feed_insights="Demand is steady.")
+
+    category, tags, report = make_assistant(llm, taxonomy).generate_smart_feed("jute basket")
+
+    assert (category, tags, report) == ("Home Decor", ["jute", "basket"], "Demand is steady.")
+    assert llm.features == ["feed_insights"]
+
+
+def test_entry_without_tags_is_ignored(taxonomy):
+    taxonomy.add("brass lamp", "Lighting", [])
+    llm = ScriptedLLM(feed="Lighting\nbrass, lamp\nSteady.")
+
+    make_assistant(llm, taxonomy).generate_smart_feed("brass lamp")
+
+    assert llm.features == ["feed"]
+    assert taxonomy.lookup("brass lamp") == ("Lighting", ["brass", "lamp"])
+
+
+def test_listing_with_unrepaired_tags_is_not_remembered(taxonomy):
+    listing = {
+        "seo_title": "Blue Vase", "description": "A vase.", "category": "Home Decor", "product_type": "Vase",
+        "tags": {"not": "a list"}, "metafields": "{}", "market_price": "900", "profit": {},
+    }
+    llm = ScriptedLLM(listing=json.dumps(listing), listing_repair="still not JSON")
+
+    result = make_assistant(llm, taxonomy).generate_full_listing(title="blue vase", price="1000", cost="600",
+                                                                 mode="single")
+
+    assert llm.features == ["listing", "listing_repair"]
+    assert result["category"] == "Home Decor"
+    assert taxonomy.lookup("blue vase") is None
@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from src.llm.response_cache import ResponseCache, make_cache_key
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache" / "llm_cache.sqlite3")
+
+
+def test_key_covers_every_request_parameter():
+    key = make_cache_key("llama-3.1-8b-instant", "Describe a vase", 512, 0.7)
+
+    assert key == make_cache_key("llama-3.1-8b-instant", "Describe a vase", 512, 0.7)
+    assert len({
+        key,
+        make_cache_key("llama-3.3-70b-versatile", "Describe a vase", 512, 0.7),
+        make_cache_key("llama-3.1-8b-instant", "Describe a bowl", 512, 0.7),
+        make_cache_key("llama-3.1-8b-instant", "Describe a vase", 256, 0.7),
+        make_cache_key("llama-3.1-8b-instant", "Describe a vase", 512, 0.2),
+    }) == 5
+
+
+def test_memory_hit_and_miss():
+    cache = ResponseCache()
+    cache.set("key", "story")
+
+    assert cache.get("key") == "story"
+    assert cache.get("other") is None
+    assert cache.get_stats() == {"hits": 1, "disk_hits": 0, "misses": 1, "evictions": 0, "writes": 1, "size": 1}
+
+
+def test_memory_entries_expire():
+    cache = ResponseCache(ttl_seconds=0.05)
+    cache.set("key", "story")
+    time.sleep(0.06)
+
+    assert not cache.contains("key")
+    assert cache.get("key") is None
+    assert cache.get_stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_contains_does_not_count_as_a_hit_or_miss():
+    cache = ResponseCache()
+    cache.set("key", "story")
+
+    assert cache.contains("key") and not cache.contains("other")
+    assert cache.get_stats()["hits"] == cache.get_stats()["misses"] == 0
+
+
+def test_disk_tier_is_shared_and_fills_the_memory_tier(db_path):
+    ResponseCache(db_path=db_path).set("key", "story")
+    restarted = ResponseCache(db_path=db_path)
+
+    assert restarted.contains("key")
+    assert restarted.get("key") == "story"
+    assert restarted.get("key") == "story"
+    stats = restarted.get_stats()
+    assert (stats["disk_hits"], stats["hits"], stats["size"]) == (1, 1, 1)
+
+
+def test_disk_entries_expire_and_are_purged(db_path):
+    cache = ResponseCache(ttl_seconds=0.05, db_path=db_path)
+    cache.set("old", "story")
+    time.sleep(0.06)
+    ResponseCache(ttl_seconds=60, db_path=db_path).set("new", "story")
+    restarted = ResponseCache(db_path=db_path)
+
+    assert restarted.get("old") is None
+    assert restarted.purge_expired() == 1
+    assert restarted.get("new") == "story"
+
+
+def test_clear_empties_both_tiers(db_path):
+    cache = ResponseCache(db_path=db_path)
+    cache.set("key", "story")
+    cache.clear()
+
+    assert cache.get("key") is None
+    assert ResponseCache(db_path=db_path).get("key") is None
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from benchmarks.mock_llm_server import MockConfig, MockLLMServer
+from src.common.metrics import registry
+from src.config.setting import settings
+from src.llm.router import Backend, LLMRouter, router_from_settings
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def start(latency_ms=20, error_rate=0.0):
+        server = MockLLMServer(MockConfig(latency_ms=latency_ms, latency_sigma=0, tokens_per_second=0,
+                                          error_rate=error_rate))
+        servers.append(server)
+        return server.start()
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def backend_spec(name, url):
+    return {"name": name, "key": "test", "url": url, "model": f"model-{name}", "max_retries": 0}
+
+
+@pytest.fixture
+def make_router():
+    routers = []
+
+    def make(specs, routes=None):
+        routers.append(LLMRouter.from_config(specs, routes))
+        return routers[-1]
+
+    yield make
+    for router in routers:
+        router.close()
+
+
+def gauge(name, backend):
+    return next(g["value"] for g in registry.snapshot()["gauges"]
+                if g["name"] == name and g["labels"] == {"backend": backend})
+
+
+def test_failing_backend_fails_over_to_the_next(start_server, make_router):
+    router = make_router([backend_spec("down", start_server(error_rate=1.0)), backend_spec("up", start_server())],
+                         routes={"feed": ["down"]})
+    before = registry.get_counter("talentbridge_llm_failover_total", backend="down", feature="feed")
+
+    text = router.generate_text("story", use_cache=False, feature="feed")
+
+    assert text.startswith("Rooted")
+    assert registry.get_counter("talentbridge_llm_failover_total", backend="down", feature="feed") == before + 1
+    stats = router.stats()
+    assert stats["down"]["latency"] is None and stats["up"]["latency"] is not None
+    assert stats["down"]["inflight"] == stats["up"]["inflight"] == 0
+
+
+def test_async_failover(start_server, make_router):
+    router = make_router([backend_spec("down", start_server(error_rate=1.0)), backend_spec("up", start_server())],
+                         routes={"feed": ["down"]})
+
+    async def generate():
+        try:
+            return await router.agenerate_text("story", use_cache=False, feature="feed")
+        finally:
+            await router.aclose()
+
+    text = asyncio.run(generate())
+
+    assert text.startswith("Rooted")
+    assert router.stats()["up"]["latency"] is not None
+
+
+def test_stream_fails_over_before_the_first_chunk(start_server, make_router):
+    router = make_router([backend_spec("down", start_server(error_rate=1.0)), backend_spec("up", start_server())],
+                         routes={"feed": ["down"]})
+
+    text = "".join(router.stream_text("story", use_cache=False, feature="feed"))
+
+    assert text.startswith("Rooted")
+
+
+def test_all_backends_failing_raises_the_last_error(start_server, make_router):
+    router = make_router([backend_spec("a", start_server(error_rate=1.0)),
+                          backend_spec("b", start_server(error_rate=1.0))])
+
+    with pytest.raises(Exception, match="HTTP 503"):
+        router.generate_text("story", use_cache=False)
+
+
+def test_traffic_moves_to_the_faster_backend(start_server, make_router):
+    router = make_router([backend_spec("slow", start_server(latency_ms=300)),
+                          backend_spec("fast", start_server(latency_ms=10))])
+
+    # Unmeasured backends rank first, so the first two calls sample both.
+    router.generate_text("story", use_cache=False)
+    router.generate_text("story", use_cache=False)
+    slow_latency = router.stats()["slow"]["latency"]
+    assert slow_latency >= 0.3 > router.stats()["fast"]["latency"]
+
+    for _ in range(5):
+        router.generate_text("story", use_cache=False)
+
+    assert router.stats()["slow"]["latency"] == slow_latency
+    assert [backend.name for backend in router._candidates(None)] == ["fast", "slow"]
+
+
+def test_ewma_smooths_latency():
+    backend = Backend("main", client=None, alpha=0.5)
+    for latency in (1.0, 3.0):
+        backend.begin()
+        backend.end(latency)
+    backend.begin()
+    backend.end()
+
+    assert backend.latency == 2.0
+    assert backend.inflight == 0
+
+
+def test_router_from_settings_exports_backend_gauges(start_server, monkeypatch):
+    specs = [backend_spec("gauge-main", start_server(latency_ms=300))]
+    monkeypatch.setattr(settings, "LLM_BACKENDS", json.dumps(specs))
+    monkeypatch.setattr(settings, "LLM_ROUTES", "")
+    router = router_from_settings()
+
+    call = threading.Thread(target=router.generate_text, args=("story",), kwargs={"use_cache": False})
+    call.start()
+    time.sleep(0.1)
+    assert gauge("talentbridge_llm_backend_inflight", "gauge-main") == 1
+    call.join()
+    router.close()
+
+    assert gauge("talentbridge_llm_backend_inflight", "gauge-main") == 0
+    assert gauge("talentbridge_llm_backend_latency_seconds", "gauge-main") >= 0.3
+    assert gauge("talentbridge_llm_backend_headroom", "gauge-main") == 1.0
+
+
+def test_zero_timeout_is_not_replaced_by_the_default(start_server, make_router):
+    router = make_router([backend_spec("main", start_server(latency_ms=500))])
+
+    started = time.monotonic()
+    with pytest.raises(Exception, match="deadline exceeded"):
+        router.generate_text("story", use_cache=False, timeout=0)
+    assert time.monotonic() - started < 0.1
@@ -0,0 +1,249 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.utils.singleflight import SingleFlight, flight_key
+
+
+class Source:
+    """Counts how often the wrapped work actually runs."""
+
+    def __init__(self, result="done", delay=0.1, error=None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.closed = False
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return f"{self.result} {self.calls}"
+
+    async def acall(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return f"{self.result} {self.calls}"
+
+    def chunks(self, count=5, fail_at=None):
+        self.calls += 1
+        try:
+            for i in range(count):
+                time.sleep(self.delay)
+                if i == fail_at:
+                    raise self.error
+                yield f"chunk{i}"
+        finally:
+            self.closed = True
+
+    async def achunks(self, count=5, fail_at=None):
+        self.calls += 1
+        try:
+            for i in range(count):
+                await asyncio.sleep(self.delay)
+                if i == fail_at:
+                    raise self.error
+                yield f"chunk{i}"
+        finally:
+            self.closed = True
+
+
+def run_concurrently(fn, count):
+    results = [None] * count
+
+    def run(i):
+        try:
+            results[i] = fn()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_flight_key_ignores_case_and_whitespace_but_not_script():
+    assert flight_key("feed", "Blue  Pottery Vase ") == flight_key("feed", "blue pottery vase")
+    assert flight_key("feed", "मिट्टी का बर्तन") != flight_key("feed", "பானை")
+    assert flight_key("feed", "vase") != flight_key("trends", "vase")
+
+
+def test_concurrent_threads_share_one_call():
+    flights, source = SingleFlight("test"), Source()
+
+    results = run_concurrently(lambda: flights.do("key", source), 8)
+
+    assert source.calls == 1
+    assert results == ["done 1"] * 8
+
+
+def test_later_calls_run_again():
+    flights, source = SingleFlight("test"), Source(delay=0)
+
+    assert flights.do("key", source) == "done 1"
+    assert flights.do("key", source) == "done 2"
+
+
+def test_error_reaches_every_waiting_thread():
+    flights, source = SingleFlight("test"), Source(error=ValueError("upstream down"))
+
+    results = run_concurrently(lambda: flights.do("key", source), 5)
+
+    assert source.calls == 1
+    assert all(isinstance(result, ValueError) and str(result) == "upstream down" for result in results)
+
+
+def test_follower_timeout():
+    flights, source = SingleFlight("test"), Source(delay=0.5)
+    leader = threading.Thread(target=flights.do, args=("key", source))
+    leader.start()
+    time.sleep(0.05)
+
+    with pytest.raises(TimeoutError):
+        flights.do("key", source, timeout=0.05)
+    leader.join()
+
+
+def test_tasks_share_one_call_and_its_error():
+    flights = SingleFlight("test")
+    ok, failing = Source(), Source(error=ValueError("upstream down"))
+
+    async def main():
+        results = await asyncio.gather(*(flights.ado("ok", ok.acall) for _ in range(5)))
+        errors = await asyncio.gather(*(flights.ado("bad", failing.acall) for _ in range(5)),
+                                      return_exceptions=True)
+        return results, errors
+
+    results, errors = asyncio.run(main())
+
+    assert ok.calls == failing.calls == 1
+    assert results == ["done 1"] * 5
+    assert all(isinstance(error, ValueError) for error in errors)
+
+
+def test_cancelled_task_does_not_cancel_the_shared_call():
+    flights, source = SingleFlight("test"), Source(delay=0.2)
+
+    async def main():
+        first = asyncio.ensure_future(flights.ado("key", source.acall))
+        second = asyncio.ensure_future(flights.ado("key", source.acall))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "done 1"
+    assert source.calls == 1
+
+
+def test_stream_is_replayed_to_a_late_caller():
+    flights, source = SingleFlight("test"), Source(delay=0.05)
+    first = flights.stream("key", source.chunks)
+    seen = [next(first), next(first)]
+
+    late = list(flights.stream("key", source.chunks))
+    seen += list(first)
+
+    assert source.calls == 1
+    assert late == seen == [f"chunk{i}" for i in range(5)]
+
+
+def test_stream_goes_on_when_the_first_caller_stops():
+    flights, source = SingleFlight("test"), Source(delay=0.01)
+    first, second = flights.stream("key", source.chunks), flights.stream("key", source.chunks)
+
+    assert next(first) == "chunk0"
+    first.close()
+
+    assert list(second) == [f"chunk{i}" for i in range(5)]
+    assert source.calls == 1
+
+
+def test_abandoned_stream_is_closed():
+    flights, source = SingleFlight("test"), Source(delay=0)
+    stream = flights.stream("key", source.chunks)
+
+    assert next(stream) == "chunk0"
+    stream.close()
+
+    assert source.closed
+    assert list(flights.stream("key", source.chunks)) == [f"chunk{i}" for i in range(5)]
+    assert source.calls == 2
+
+
+def test_stream_error_reaches_every_caller():
+    flights, source = SingleFlight("test"), Source(delay=0.02, error=ValueError("cut off"))
+
+    results = run_concurrently(lambda: list(flights.stream("key", lambda: source.chunks(fail_at=2))), 4)
+
+    assert source.calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_async_streams_share_one_iteration():
+    flights, source = SingleFlight("test"), Source(delay=0.02)
+
+    async def collect(delay):
+        await asyncio.sleep(delay)
+        return [chunk async for chunk in flights.astream("key", source.achunks)]
+
+    async def main():
+        return await asyncio.gather(collect(0), collect(0.05))
+
+    first, late = asyncio.run(main())
+
+    assert source.calls == 1
+    assert first == late == [f"chunk{i}" for i in range(5)]
+
+
+def test_cancelled_async_caller_does_not_stop_the_stream():
+    flights, source = SingleFlight("test"), Source(delay=0.02)
+
+    async def collect():
+        return [chunk async for chunk in flights.astream("key", source.achunks)]
+
+    async def main():
+        first, second = asyncio.ensure_future(collect()), asyncio.ensure_future(collect())
+        await asyncio.sleep(0.05)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == [f"chunk{i}" for i in range(5)]
+    assert source.calls == 1
+
+
+def test_abandoned_async_stream_is_closed():
+    flights, source = SingleFlight("test"), Source(delay=0.02)
+
+    async def main():
+        stream = flights.astream("key", source.achunks)
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        return first
+
+    assert asyncio.run(main()) == "chunk0"
+    assert source.closed
+
+
+def test_async_stream_error_reaches_every_caller():
+    flights, source = SingleFlight("test"), Source(delay=0.02, error=ValueError("cut off"))
+
+    async def collect():
+        return [chunk async for chunk in flights.astream("key", lambda: source.achunks(fail_at=2))]
+
+    async def main():
+        return await asyncio.gather(collect(), collect(), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert source.calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
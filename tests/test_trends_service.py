@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.stub_trends import StubTrendReq
+from src.common.custom_exception import CustomException
+from src.generator.trends_service import MAX_KEYWORDS_PER_PAYLOAD, TrendsService
+
+
+class CountingTrendReq(StubTrendReq):
+    """Stub pytrends session recording every payload it is asked to fetch."""
+
+    payloads = []
+
+    def interest_over_time(self):
+        CountingTrendReq.payloads.append(list(self._keywords))
+        return super().interest_over_time()
+
+
+@pytest.fixture(autouse=True)
+def reset_payloads():
+    CountingTrendReq.payloads = []
+
+
+def make_service(latency_ms=50, **kwargs):
+    kwargs.setdefault("anchor", "")
+    return TrendsService(timeframe="today 1-m", ttl_seconds=60,
+                         session_factory=lambda: CountingTrendReq(latency_ms), **kwargs)
+
+
+def run_concurrently(fn, args):
+    results = {}
+    threads = [threading.Thread(target=lambda a=a: results.__setitem__(a, fn(a))) for a in args]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_single_keyword_callers_are_batched():
+    service = make_service(workers=1)
+    keywords = [f"handmade item {i}" for i in range(12)]
+
+    results = run_concurrently(service.get_interest, keywords)
+
+    assert all(results[keyword] is not None for keyword in keywords)
+    assert sorted(k for payload in CountingTrendReq.payloads for k in payload) == sorted(keywords)
+    assert all(len(payload) <= MAX_KEYWORDS_PER_PAYLOAD for payload in CountingTrendReq.payloads)
+    assert len(CountingTrendReq.payloads) < len(keywords)
+
+
+def test_anchor_is_added_to_every_payload_and_scaled_to_100():
+    service = make_service(anchor="handmade")
+
+    results = service.get_interest_many([f"basket {i}" for i in range(6)])
+
+    assert all("handmade" in payload and len(payload) <= MAX_KEYWORDS_PER_PAYLOAD
+               for payload in CountingTrendReq.payloads)
+    assert "handmade" not in results
+    assert all(series is not None for series in results.values())
+
+
+def test_identical_requests_share_one_fetch_and_then_hit_the_cache():
+    service = make_service()
+
+    results = run_concurrently(lambda _: service.get_interest("blue pottery"), range(5))
+    again = service.get_interest("blue pottery")
+
+    assert CountingTrendReq.payloads == [["blue pottery"]]
+    assert all(series.equals(again) for series in results.values())
+
+
+def test_cache_is_bounded_least_recently_used_first():
+    service = make_service(latency_ms=0, max_entries=3)
+    for keyword in ["a", "b", "c"]:
+        service.get_interest(keyword)
+    service.get_interest("a")  # refresh "a"
+    service.get_interest("d")  # evicts "b"
+
+    assert len(service) == 3
+    fetched = len(CountingTrendReq.payloads)
+    service.get_interest("a")
+    assert len(CountingTrendReq.payloads) == fetched
+    service.get_interest("b")
+    assert len(CountingTrendReq.payloads) == fetched + 1
+
+
+def test_timeout_releases_the_caller_and_keeps_the_result():
+    service = make_service(latency_ms=300)
+
+    started = time.monotonic()
+    with pytest.raises(CustomException):
+        service.get_interest("kantha quilt", timeout=0.05)
+    assert time.monotonic() - started < 0.25
+
+    time.sleep(0.4)
+    assert service.get_interest("kantha quilt") is not None
+    assert len(CountingTrendReq.payloads) == 1
+
+
+def test_fetch_errors_reach_every_waiter():
+    class FailingTrendReq(StubTrendReq):
+        def interest_over_time(self):
+            raise RuntimeError("429 Too Many Requests")
+
+    service = TrendsService(anchor="", session_factory=lambda: FailingTrendReq(0))
+
+    with pytest.raises(RuntimeError):
+        service.get_interest("brass lamp")
+    # Failures are not cached: the next call tries again.
+    with pytest.raises(RuntimeError):
+        service.get_interest("brass lamp")
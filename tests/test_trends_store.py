@@ -0,0 +1,71 @@
+import json
+import os
+from datetime import date
+
+import numpy as np
+import pytest
+
+from benchmarks.stub_trends import StubTrendReq
+from src.generator.trends_service import TrendsService
+from src.generator.trends_store import TrendStore, array_file_name, day_index
+
+TODAY = date(2026, 3, 31)
+
+
+@pytest.fixture
+def service():
+    return TrendsService(timeframe="today 3-m", ttl_seconds=60, anchor="",
+                         session_factory=lambda: StubTrendReq(latency_ms=0))
+
+
+@pytest.fixture
+def make_store(tmp_path, service):
+    """A store on the shared directory, standing in for one process."""
+    return lambda: TrendStore(str(tmp_path / "trends"), service=service, window_days=60)
+
+
+def test_file_names_depend_only_on_the_keyword():
+    assert array_file_name("blue pottery") == array_file_name("blue pottery")
+    assert array_file_name("blue pottery") != array_file_name("Blue Pottery")
+    assert array_file_name("मिट्टी का दीया") != array_file_name("பானை")
+    assert array_file_name("பானை").endswith(".npy")
+
+
+def test_processes_sharing_a_directory_keep_each_others_keywords(make_store, tmp_path):
+    first, second = make_store(), make_store()
+
+    first.refresh(["jute basket"], today=TODAY)
+    second.refresh(["brass lamp"], today=TODAY)
+
+    with open(tmp_path / "trends" / "index.json", encoding="utf-8") as f:
+        index = json.load(f)
+    assert sorted(index) == ["brass lamp", "jute basket"]
+    assert index["jute basket"]["file"] != index["brass lamp"]["file"]
+    assert sorted(os.listdir(tmp_path / "trends")) == sorted(
+        [".lock", "index.json", index["jute basket"]["file"], index["brass lamp"]["file"]]
+    )
+
+    reader = make_store()
+    assert reader.series("jute basket", today=TODAY) is not None
+    assert reader.series("brass lamp", today=TODAY) is not None
+
+
+def test_existing_array_is_not_truncated_by_another_process(make_store):
+    first, second = make_store(), make_store()
+    first.refresh(["jute basket"], today=TODAY)
+
+    with second._lock:
+        array = second._array("jute basket", create=True)
+
+    assert not np.isnan(array[day_index(TODAY)])
+
+
+def test_latest_check_time_wins_when_merging(make_store):
+    first, second = make_store(), make_store()
+    first.refresh(["jute basket"], today=TODAY)
+    checked = first._index["jute basket"]["checked"]
+
+    second._index["jute basket"] = {"file": array_file_name("jute basket"), "checked": 0}
+    second._save_index()
+
+    assert make_store()._index["jute basket"]["checked"] == checked